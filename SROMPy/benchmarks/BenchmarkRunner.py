@@ -0,0 +1,264 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for running the SROMPy benchmarks & recording their timings as JSON.
+"""
+
+import datetime
+import itertools
+import json
+import os
+import platform
+import re
+import timeit
+
+import numpy as np
+import scipy
+
+from SROMPy.benchmarks.OptimizeBenchmarks import ObjectiveBenchmarks, \
+    OptimizeBenchmarks
+from SROMPy.benchmarks.PostprocessBenchmarks import PostprocessBenchmarks
+from SROMPy.benchmarks.SurrogateBenchmarks import SurrogateBenchmarks
+from SROMPy.benchmarks.TargetBenchmarks import AnalyticTargetBenchmarks, \
+    TargetBenchmarks
+
+
+class BenchmarkRunner(object):
+    """
+    Runs benchmark classes & collects their timings. Benchmark classes follow
+    the airspeed velocity (asv) conventions, so the same classes can also be
+    run with asv: a class lists its parameter values in params (list of lists)
+    & their names in param_names, is prepared by setup(*params) & each of its
+    time_* methods is timed for every combination of the parameter values.
+
+    :param benchmark_classes: benchmark classes to run. Defaults to all
+        SROMPy benchmarks (see BENCHMARK_CLASSES).
+    :type benchmark_classes: list of classes
+    :param num_repeats: number of times each benchmark is timed.
+    :type num_repeats: int
+    :param quick: only run the first (smallest) parameter combination of
+        each benchmark class, e.g. as a smoke test.
+    :type quick: bool
+    """
+
+    BENCHMARK_CLASSES = [TargetBenchmarks,
+                         AnalyticTargetBenchmarks,
+                         ObjectiveBenchmarks,
+                         OptimizeBenchmarks,
+                         SurrogateBenchmarks,
+                         PostprocessBenchmarks]
+
+    def __init__(self, benchmark_classes=None, num_repeats=5, quick=False):
+
+        if not isinstance(num_repeats, int):
+            raise TypeError("num_repeats must be a positive int.")
+
+        if num_repeats <= 0:
+            raise ValueError("num_repeats must be a positive int.")
+
+        if benchmark_classes is None:
+            benchmark_classes = self.BENCHMARK_CLASSES
+
+        self._benchmark_classes = list(benchmark_classes)
+        self._num_repeats = num_repeats
+        self._quick = quick
+
+    def run(self, pattern=None, verbose=True):
+        """
+        Runs the benchmarks & returns a list with a result dictionary for
+        each benchmark & parameter combination, with keys:
+
+        name - benchmark name, "<class name>.<time_* method name>"
+        params - dictionary of parameter names & values
+        times - timings of each repeat in seconds
+        min, median, mean - statistics of the timings in seconds
+
+        :param pattern: regular expression; only benchmarks whose name
+            matches (re.search) are run.
+        :type pattern: string
+        :param verbose: print each result as it is measured.
+        :type verbose: bool
+        """
+
+        results = []
+
+        for benchmark_class in self._benchmark_classes:
+
+            method_names = [name for name in sorted(dir(benchmark_class))
+                            if name.startswith("time_")]
+            method_names = [name for name in method_names
+                            if pattern is None or
+                            re.search(pattern, benchmark_class.__name__ +
+                                      "." + name)]
+            if not method_names:
+                continue
+
+            for params in self.__get_param_combinations(benchmark_class):
+
+                benchmark = benchmark_class()
+                if hasattr(benchmark, "setup"):
+                    benchmark.setup(*params)
+
+                for method_name in method_names:
+
+                    result = self.__time_benchmark(benchmark, method_name,
+                                                   params)
+                    results.append(result)
+
+                    if verbose:
+                        print("%-55s %-40s %12.6f s" %
+                              (result["name"],
+                               ", ".join("%s=%s" % item for item in
+                                         result["params"].items()),
+                               result["min"]))
+
+                if hasattr(benchmark, "teardown"):
+                    benchmark.teardown(*params)
+
+        return results
+
+    @staticmethod
+    def get_metadata():
+        """
+        Returns dictionary describing the machine & software versions the
+        benchmarks are run with.
+        """
+
+        return {"timestamp": datetime.datetime.now().isoformat(),
+                "python_version": platform.python_version(),
+                "numpy_version": np.__version__,
+                "scipy_version": scipy.__version__,
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count()}
+
+    def save(self, results, file_name):
+        """
+        Writes the results of run() & the metadata to a JSON file.
+
+        :param results: benchmark results returned by run().
+        :type results: list of dictionaries
+        :param file_name: name of the JSON file to write.
+        :type file_name: string
+        """
+
+        output = {"metadata": self.get_metadata(),
+                  "num_repeats": self._num_repeats,
+                  "results": results}
+
+        with open(file_name, "w") as output_file:
+            json.dump(output, output_file, indent=2)
+
+    @staticmethod
+    def compare(baseline_file_name, results, threshold=1.2):
+        """
+        Compares results against the results saved in a baseline JSON file
+        (e.g. from the previous release). Returns a list with a dictionary for
+        each benchmark & parameter combination found in both, with keys name,
+        params, baseline (baseline min. time), min (current min. time), ratio
+        (current / baseline) & regression (whether ratio > threshold).
+
+        :param baseline_file_name: JSON file written by save().
+        :type baseline_file_name: string
+        :param results: benchmark results returned by run().
+        :type results: list of dictionaries
+        :param threshold: ratio of current to baseline time above which a
+            benchmark is flagged as a regression.
+        :type threshold: float
+        """
+
+        with open(baseline_file_name, "r") as baseline_file:
+            baseline_results = json.load(baseline_file)["results"]
+
+        baseline_times = {}
+        for result in baseline_results:
+            key = (result["name"], json.dumps(result["params"],
+                                              sort_keys=True))
+            baseline_times[key] = result["min"]
+
+        comparisons = []
+        for result in results:
+
+            key = (result["name"], json.dumps(result["params"],
+                                              sort_keys=True))
+            if key not in baseline_times:
+                continue
+
+            ratio = result["min"] / baseline_times[key]
+            comparisons.append({"name": result["name"],
+                                "params": result["params"],
+                                "baseline": baseline_times[key],
+                                "min": result["min"],
+                                "ratio": ratio,
+                                "regression": ratio > threshold})
+
+        return comparisons
+
+    def __get_param_combinations(self, benchmark_class):
+        """
+        Returns list of the parameter value tuples to run benchmark_class
+        with.
+        """
+
+        params = getattr(benchmark_class, "params", [])
+        if not params:
+            return [()]
+
+        # A single list of values is a single parameter (as in asv).
+        if not isinstance(params[0], (list, tuple)):
+            params = [params]
+
+        combinations = list(itertools.product(*params))
+
+        if self._quick:
+            return combinations[:1]
+
+        return combinations
+
+    def __time_benchmark(self, benchmark, method_name, params):
+        """
+        Times one benchmark method of an (already setup) benchmark object.
+        """
+
+        method = getattr(benchmark, method_name)
+        times = timeit.repeat(lambda: method(*params), number=1,
+                              repeat=self._num_repeats)
+
+        param_names = getattr(benchmark, "param_names",
+                              ["param%d" % (i + 1)
+                               for i in range(len(params))])
+
+        return {"name": type(benchmark).__name__ + "." + method_name,
+                "params": dict(zip(param_names,
+                                   [self.__to_json_value(param)
+                                    for param in params])),
+                "times": times,
+                "min": min(times),
+                "median": float(np.median(times)),
+                "mean": float(np.mean(times))}
+
+    @staticmethod
+    def __to_json_value(value):
+
+        if isinstance(value, np.generic):
+            return value.item()
+
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            return value
+
+        return repr(value)
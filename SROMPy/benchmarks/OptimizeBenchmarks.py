@@ -0,0 +1,89 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Benchmarks for the SROM objective function, its gradient & SROM.optimize.
+"""
+
+import numpy as np
+
+from SROMPy.optimize import Gradient, ObjectiveFunction
+from SROMPy.srom import SROM
+from SROMPy.target import SampleRandomVector
+
+
+class ObjectiveBenchmarks(object):
+    """
+    Evaluation of the SSE objective function & its (joint) gradient for a
+    range of SROM sizes & dimensions.
+    """
+
+    params = [[10, 50, 200], [1, 5]]
+    param_names = ["srom_size", "dim"]
+
+    def setup(self, srom_size, dim):
+
+        np.random.seed(0)
+        target = SampleRandomVector(np.random.rand(2000, dim))
+
+        self.samples = np.random.rand(srom_size, dim)
+        self.probabilities = np.ones(srom_size) / float(srom_size)
+
+        srom = SROM(srom_size, dim)
+        self.objective_function = ObjectiveFunction(srom, target,
+                                                    error="SSE")
+        self.gradient = Gradient(srom, target, error="SSE", scale=0.1,
+                                 joint_opt=True)
+
+    def time_objective_evaluate(self, srom_size, dim):
+        self.objective_function.evaluate(self.samples, self.probabilities)
+
+    def time_gradient_evaluate(self, srom_size, dim):
+        self.gradient.evaluate(self.samples, self.probabilities)
+
+
+class OptimizeBenchmarks(object):
+    """
+    End to end SROM.optimize runs (sequential with scipy & the QP solver, and
+    joint) for a range of SROM sizes & dimensions.
+    """
+
+    params = [[10, 20], [1, 3]]
+    param_names = ["srom_size", "dim"]
+
+    def setup(self, srom_size, dim):
+
+        np.random.seed(0)
+        self.target = SampleRandomVector(np.random.rand(2000, dim))
+
+    def time_optimize_sequential(self, srom_size, dim):
+
+        np.random.seed(1)
+        SROM(srom_size, dim).optimize(self.target, num_test_samples=10,
+                                      verbose=False)
+
+    def time_optimize_sequential_qp(self, srom_size, dim):
+
+        np.random.seed(1)
+        SROM(srom_size, dim).optimize(self.target, num_test_samples=10,
+                                      method="qp", verbose=False)
+
+    def time_optimize_joint(self, srom_size, dim):
+
+        np.random.seed(1)
+        SROM(srom_size, dim).optimize(self.target, num_test_samples=2,
+                                      joint_opt=True, scale=0.1,
+                                      options={"maxiter": 20}, verbose=False)
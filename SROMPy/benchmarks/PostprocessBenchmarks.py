@@ -0,0 +1,55 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Benchmarks for the Postprocessor SROM vs target comparisons.
+"""
+
+import numpy as np
+
+from SROMPy.postprocess import Postprocessor
+from SROMPy.srom import SROM
+from SROMPy.target import SampleRandomVector
+
+
+class PostprocessBenchmarks(object):
+    """
+    Evaluation of the SROM & target CDFs on the Postprocessor comparison
+    grids (without plotting) for a range of SROM sizes & dimensions.
+    """
+
+    params = [[20, 200], [1, 5]]
+    param_names = ["srom_size", "dim"]
+
+    def setup(self, srom_size, dim):
+
+        np.random.seed(0)
+        self.target = SampleRandomVector(np.random.rand(10000, dim))
+
+        self.srom = SROM(srom_size, dim)
+        self.srom.set_params(np.random.rand(srom_size, dim),
+                             np.ones(srom_size) / float(srom_size))
+
+        self.postprocessor = Postprocessor(self.srom, self.target)
+
+    def time_compare_cdf_values(self, srom_size, dim):
+
+        x_grids = self.postprocessor.generate_cdf_grids(1000)
+        self.srom.compute_cdf(x_grids)
+        self.target.compute_cdf(x_grids)
+
+    def time_compute_moment_error(self, srom_size, dim):
+        self.postprocessor.compute_moment_error(4)
@@ -0,0 +1,54 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Benchmarks for propagating input samples through SROM surrogates.
+"""
+
+import numpy as np
+
+from SROMPy.srom import SROM, SROMSurrogate
+
+
+class SurrogateBenchmarks(object):
+    """
+    Piecewise constant & linear SROMSurrogate sampling for a range of SROM
+    sizes & numbers of input samples (3 dimensional inputs).
+    """
+
+    params = [[20, 200], [10000, 1000000]]
+    param_names = ["srom_size", "num_input_samples"]
+
+    def setup(self, srom_size, num_input_samples):
+
+        np.random.seed(0)
+        input_srom = SROM(srom_size, 3)
+        input_srom.set_params(np.random.rand(srom_size, 3),
+                              np.ones(srom_size) / float(srom_size))
+
+        output_samples = np.sum(input_srom.samples, axis=1, keepdims=True)
+        output_gradients = np.ones((srom_size, 3))
+
+        self.constant_surrogate = SROMSurrogate(input_srom, output_samples)
+        self.linear_surrogate = SROMSurrogate(input_srom, output_samples,
+                                              output_gradients)
+        self.input_samples = np.random.rand(num_input_samples, 3)
+
+    def time_sample_piecewise_constant(self, srom_size, num_input_samples):
+        self.constant_surrogate.sample(self.input_samples)
+
+    def time_sample_piecewise_linear(self, srom_size, num_input_samples):
+        self.linear_surrogate.sample(self.input_samples)
@@ -0,0 +1,74 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Benchmarks for constructing & sampling the SROMPy target random vectors.
+"""
+
+import numpy as np
+
+from SROMPy.target import AnalyticRandomVector, BetaRandomVariable, \
+    DiscreteRandomVector, GammaRandomVariable, SampleRandomVector
+
+
+class TargetBenchmarks(object):
+    """
+    Construction of the sample-based target random vectors for a range of
+    sample set sizes & dimensions.
+    """
+
+    params = [[1000, 100000], [1, 5]]
+    param_names = ["num_samples", "dim"]
+
+    def setup(self, num_samples, dim):
+
+        np.random.seed(0)
+        self.samples = np.random.gamma(2., 1., (num_samples, dim))
+        self.probabilities = np.ones(num_samples) / float(num_samples)
+
+    def time_sample_random_vector(self, num_samples, dim):
+        SampleRandomVector(self.samples)
+
+    def time_discrete_random_vector(self, num_samples, dim):
+        DiscreteRandomVector(self.samples, self.probabilities)
+
+
+class AnalyticTargetBenchmarks(object):
+    """
+    Construction (correlation calibration) & sampling of the translation
+    random vector with gamma & beta components.
+    """
+
+    params = [[2, 5]]
+    param_names = ["dim"]
+
+    def setup(self, dim):
+
+        self.components = [GammaRandomVariable(2., 0., 1.) if i % 2 == 0
+                           else BetaRandomVariable(2., 5.)
+                           for i in range(dim)]
+        self.correlation_matrix = 0.7 * np.eye(dim) + 0.3
+
+        self.random_vector = AnalyticRandomVector(self.components,
+                                                  self.correlation_matrix,
+                                                  cache=False)
+
+    def time_analytic_random_vector(self, dim):
+        AnalyticRandomVector(self.components, self.correlation_matrix,
+                             cache=False)
+
+    def time_draw_random_sample(self, dim):
+        self.random_vector.draw_random_sample(10000, rng=0)
@@ -0,0 +1,22 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+name = "benchmarks"
+from .TargetBenchmarks import AnalyticTargetBenchmarks, TargetBenchmarks
+from .OptimizeBenchmarks import ObjectiveBenchmarks, OptimizeBenchmarks
+from .SurrogateBenchmarks import SurrogateBenchmarks
+from .PostprocessBenchmarks import PostprocessBenchmarks
+from .BenchmarkRunner import BenchmarkRunner
@@ -0,0 +1,72 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Runs the SROMPy benchmarks from the command line, e.g.
+
+python -m SROMPy.benchmarks --output results.json --repeat 5 --filter Target
+"""
+
+import argparse
+
+from SROMPy.benchmarks import BenchmarkRunner
+
+
+def main(args=None):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m SROMPy.benchmarks",
+        description="Time SROM construction, evaluation & propagation.")
+    parser.add_argument("-o", "--output", default=None,
+                        help="JSON file to write the results to")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="number of timings per benchmark (default 5)")
+    parser.add_argument("-f", "--filter", default=None,
+                        help="only run benchmarks whose name matches this "
+                             "regular expression")
+    parser.add_argument("--quick", action="store_true",
+                        help="only run the smallest parameter combination")
+    parser.add_argument("-c", "--compare", default=None,
+                        help="JSON file of baseline results to compare to")
+    parser.add_argument("-t", "--threshold", type=float, default=1.2,
+                        help="slowdown ratio vs the baseline reported as a "
+                             "regression (default 1.2)")
+    arguments = parser.parse_args(args)
+
+    runner = BenchmarkRunner(num_repeats=arguments.repeat,
+                             quick=arguments.quick)
+    results = runner.run(pattern=arguments.filter)
+
+    if arguments.output is not None:
+        runner.save(results, arguments.output)
+
+    if arguments.compare is not None:
+
+        comparisons = BenchmarkRunner.compare(arguments.compare, results,
+                                              arguments.threshold)
+
+        print("\nComparison to %s:" % arguments.compare)
+        for comparison in comparisons:
+            print("%-55s %-40s %8.2fx%s" %
+                  (comparison["name"],
+                   ", ".join("%s=%s" % item for item in
+                             comparison["params"].items()),
+                   comparison["ratio"],
+                   "  REGRESSION" if comparison["regression"] else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Class for generating the candidate SROM sample sets tried by the sequential
+optimization.
+"""
+
+import warnings
+
+import numpy as np
+from scipy.cluster.vq import kmeans2
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
+
+from SROMPy.target import AnalyticRandomVector
+from SROMPy.target import RandomVariable
+
+
+class CandidateGenerator(object):
+    """
+    Generates candidate SROM sample sets (srom_size x dim) of a target random
+    quantity for the optimization restarts. Methods:
+
+    'random' - random draws from the target (target.draw_random_sample).
+    'sobol', 'halton' - scrambled quasi-random points.
+    'lhs' - Latin hypercube (stratified) points.
+    'kmeans' - k-means centroids of a random pool of target samples.
+    'kmedoids' - the target samples nearest to the k-means centroids (an
+        approximation of k-medoids that keeps the sample set on the target's
+        samples).
+
+    Cluster centers concentrate in the bulk of the distribution, so the
+    k-means methods suit SROMs of larger size; the quasi-random & Latin
+    hypercube designs also cover the tails.
+
+    Points of the quasi-random & Latin hypercube designs are mapped to the
+    target with the inverse CDF (random variables) or the translation model
+    (AnalyticRandomVector). For sample-based targets (or any other target)
+    they are mapped to the distinct target samples nearest to them in
+    marginal rank (empirical CDF) space, using the target's samples or a
+    pool of pool_size draws.
+
+    Candidates are drawn with the numpy Generator passed to draw (the
+    Optimizer passes each CPU/worker's seeded generator), or with a generator
+    seeded from numpy's global random state if none is given.
+
+    inputs:
+        -target: target random quantity (random variable or vector).
+            Sample-based targets need at least srom_size samples.
+        -srom_size: int, # samples per candidate sample set.
+        -dim: int, dimension of the target.
+        -method: str, one of METHODS.
+        -pool_size: int, # target samples the k-means methods cluster per
+            candidate & max. # samples used for the rank space mapping.
+            Defaults to max(1000, 20 * srom_size).
+    """
+
+    METHODS = ("random", "sobol", "halton", "lhs", "kmeans", "kmedoids")
+
+    def __init__(self, target, srom_size, dim, method="random",
+                 pool_size=None):
+
+        if not isinstance(method, str) or method.lower() not in self.METHODS:
+            raise ValueError("method must be one of %s" % (self.METHODS,))
+
+        if pool_size is None:
+            pool_size = max(1000, 20 * srom_size)
+
+        if not isinstance(pool_size, int) or pool_size < srom_size:
+            raise ValueError("pool_size must be an int >= srom_size.")
+
+        self._target = target
+        self._srom_size = srom_size
+        self._dim = dim
+        self._method = method.lower()
+
+        # Sample-based targets can't provide more samples than they have.
+        num_samples = getattr(target, "num_samples", None)
+        if num_samples is not None:
+            if num_samples < srom_size:
+                raise ValueError("target must have at least srom_size "
+                                 "samples.")
+            pool_size = min(pool_size, num_samples)
+        self._pool_size = pool_size
+
+        # KD-tree of reference samples in rank space (built when needed).
+        self._rank_samples = None
+        self._rank_tree = None
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def srom_size(self):
+        return self._srom_size
+
+    def draw(self, num_candidates=None, rng=None):
+        """
+        Returns a candidate sample set (srom_size x dim), or an array of
+        num_candidates candidate sample sets
+        (num_candidates x srom_size x dim) if num_candidates is given.
+        rng is the numpy Generator (or seed) to draw with.
+        """
+
+        if rng is None:
+            rng = np.random.randint(2 ** 31 - 1)
+        rng = np.random.default_rng(rng)
+
+        if num_candidates is None:
+            return self.__draw_candidate(rng)
+
+        return np.array([self.__draw_candidate(rng)
+                         for _ in range(num_candidates)])
+
+    def __draw_candidate(self, rng):
+        """
+        Returns a single candidate sample set (srom_size x dim).
+        """
+
+        if self._method == "random":
+            samples = self._target.draw_random_sample(self._srom_size,
+                                                      rng=rng)
+            return np.reshape(samples, (self._srom_size, self._dim))
+
+        if self._method in ("kmeans", "kmedoids"):
+            return self.__draw_cluster_centers(rng)
+
+        return self.__map_uniform_points(self.__draw_uniform_points(rng), rng)
+
+    def __draw_uniform_points(self, rng):
+        """
+        Returns srom_size quasi-random or Latin hypercube points in the open
+        unit hypercube.
+        """
+
+        if self._method == "sobol":
+            # Sobol points are balanced for powers of 2, so use the first
+            # srom_size points of the next power of 2.
+            sampler = qmc.Sobol(d=self._dim, seed=rng)
+            exponent = int(np.ceil(np.log2(self._srom_size)))
+            points = sampler.random_base2(exponent)[:self._srom_size]
+        elif self._method == "halton":
+            points = qmc.Halton(d=self._dim, seed=rng).random(self._srom_size)
+        else:
+            points = qmc.LatinHypercube(d=self._dim, seed=rng).random(
+                self._srom_size)
+
+        # Keep the points off the boundary, where inverse CDFs are infinite.
+        epsilon = 0.5 / (self._srom_size * 1024.)
+        return np.clip(points, epsilon, 1. - epsilon)
+
+    def __map_uniform_points(self, points, rng):
+        """
+        Maps points in the unit hypercube (srom_size x dim) to samples of the
+        target.
+        """
+
+        if isinstance(self._target, AnalyticRandomVector):
+            return self._target.transform_uniform_sample(points)
+
+        if isinstance(self._target, RandomVariable):
+            return np.reshape(self._target.compute_inv_cdf(points[:, 0]),
+                              (self._srom_size, self._dim))
+
+        if self._rank_tree is None:
+            self.__build_rank_tree(rng)
+
+        indices = self.__query_distinct(self._rank_tree, points)
+
+        return self._rank_samples[indices]
+
+    def __build_rank_tree(self, rng):
+        """
+        Builds a KD-tree of (up to pool_size) target samples transformed to
+        marginal ranks in [0, 1].
+        """
+
+        if hasattr(self._target, "samples") and \
+                self._target.num_samples <= self._pool_size:
+            samples = np.array(self._target.samples, dtype=float)
+        else:
+            samples = self.__draw_pool(rng)
+
+        ranks = np.argsort(np.argsort(samples, axis=0), axis=0)
+        ranks = (ranks + 0.5) / samples.shape[0]
+
+        self._rank_samples = samples
+        self._rank_tree = cKDTree(ranks)
+
+    def __draw_cluster_centers(self, rng):
+        """
+        Returns the k-means centroids (or nearest pool samples for k-medoids)
+        of a random pool of target samples.
+        """
+
+        pool = self.__draw_pool(rng)
+
+        # Empty clusters keep their initial (k-means++) centroid.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            centroids, _ = kmeans2(pool, self._srom_size, minit="++",
+                                   seed=rng)
+
+        if self._method == "kmeans":
+            return centroids
+
+        return pool[self.__query_distinct(cKDTree(pool), centroids)]
+
+    def __draw_pool(self, rng):
+        """
+        Returns pool_size random target samples (pool_size x dim).
+        """
+
+        pool = self._target.draw_random_sample(self._pool_size, rng=rng)
+
+        return np.reshape(np.array(pool, dtype=float),
+                          (self._pool_size, self._dim))
+
+    def __query_distinct(self, tree, points):
+        """
+        Returns indices of distinct tree points nearest to each of the points
+        (each point takes its nearest tree point not taken by a previous
+        point).
+        """
+
+        _, neighbors = tree.query(points, k=self._srom_size)
+        neighbors = np.reshape(neighbors, (self._srom_size, -1))
+
+        indices = []
+        taken = set()
+        for point_neighbors in neighbors:
+            for index in point_neighbors:
+                if index not in taken:
+                    break
+            taken.add(index)
+            indices.append(index)
+
+        return np.array(indices)
@@ -14,6 +14,10 @@
 # under the License.
 
 import numpy as np
+from scipy.special import erf
+
+from SROMPy.optimize.SROMStatistics import SROMStatistics
+from SROMPy.optimize.TargetStatistics import TargetStatistics
 
 
 class Gradient:
@@ -24,7 +28,8 @@ class Gradient:
     """
 
     def __init__(self, srom, target_random_variable, obj_weights=None,
-                 error='mean', max_moment=5, cdf_grid_pts=100, scale=None, joint_opt=False):
+                 error='mean', max_moment=5, cdf_grid_pts=100, scale=None, joint_opt=False,
+                 target_statistics=None, cdf_chunk_size=None):
         """
         Initialize SROM obj fun gradient. Pass in SROM & target random vector
         objects that have been previously initialized. 
@@ -39,11 +44,20 @@ class Gradient:
                 CDFs, and correlation matrix in that order. 
             -max_moment - int, max order to evaluate moment errors up to
             -cdf_grid_pts - int, # pts to evaluate CDF errors on
+            -target_statistics - optional TargetStatistics object with the
+                precomputed target statistics (and CDF grid), e.g. to share
+                those of the ObjectiveFunction. Computed on a grid generated
+                from the target's range if not provided.
+            -cdf_chunk_size - int, max # of CDF grid pts to evaluate the CDF
+                gradient kernels (of size grid pts x SROM size x dim) on at
+                once, to bound memory use for large grids/SROMs. All grid pts
+                are evaluated at once by default.
         """
 
         # NOTE - gradients won't make sense for MAX error metric
 
-        self.__check_init_parameters(obj_weights, error, scale)
+        self.__check_init_parameters(obj_weights, error, scale,
+                                     cdf_chunk_size)
         # Error checking/handling should have already been done by obj fun prior
         self.srom = srom
         self._target = target_random_variable
@@ -52,14 +66,23 @@ class Gradient:
         # Scale for error function when using SSE for smooth derivative
         self._scale = scale
         self._joint_opt = joint_opt
-
-        # Generate grids for evaluating CDFs based on target RV's range
-        self._generate_cdf_grids(cdf_grid_pts)
+        self._cdf_chunk_size = cdf_chunk_size
 
         self._metric = error.upper()
 
         self._max_moment = max_moment
 
+        # Generate grids for evaluating CDFs based on target RV's range &
+        # precompute target statistics, unless they are shared.
+        if target_statistics is not None:
+            self._target_statistics = target_statistics
+            self._x_grid = target_statistics.x_grid
+        else:
+            self._generate_cdf_grids(cdf_grid_pts)
+            self._target_statistics = TargetStatistics(target_random_variable,
+                                                       self._x_grid,
+                                                       max_moment)
+
     def evaluate(self, samples, probabilities):
         """
         Evaluates gradient (for probability only)
@@ -69,11 +92,24 @@ class Gradient:
         # SROM defined by the current values of samples/probabilities for stats
         self.srom.set_params(samples, probabilities)
 
+        return self.compute_gradient(samples, probabilities)
+
+    def compute_gradient(self, samples, probabilities, statistics=None):
+        """
+        Computes gradient for the current SROM parameters (samples must
+        already be set on the SROM). Optionally uses previously computed
+        statistics (SROMStatistics object) shared with the objective function.
+        """
+
+        if statistics is None:
+            statistics = SROMStatistics(self.srom, self._target_statistics)
+
         if self._joint_opt:
             result = np.hstack(
-                (self._gradient_wrt_samples(samples, probabilities), self._gradient_wrt_probabilities(samples)))
+                (self._gradient_wrt_samples(samples, probabilities, statistics),
+                 self._gradient_wrt_probabilities(samples, statistics)))
         else:
-            result = self._gradient_wrt_probabilities(samples)
+            result = self._gradient_wrt_probabilities(samples, statistics)
 
         return result
 
@@ -98,7 +134,7 @@ class Gradient:
                 samples[i] = np.clip(x, bounds[i][0] + 1e-2, bounds[i][1] - 1e-2)
         return samples.reshape(self.srom.size, self.srom.dim)
 
-    def _gradient_wrt_samples(self, samples, probabilities):
+    def _gradient_wrt_samples(self, samples, probabilities, statistics):
         """
         Returns gradient vector w/ derivative of obj function w.r.t. SROM
         samples (m x d array)
@@ -109,19 +145,19 @@ class Gradient:
 
         # d_e1/d_x:
         if self._weights[0] > 0:
-            cdf_grad = self._cdf_wrt_samples(samples, probabilities)
+            cdf_grad = self._cdf_wrt_samples(samples, probabilities, statistics)
         else:
             cdf_grad = np.zeros((srom_size, srom_dim))
 
         # d_e2/d_x
         if self._weights[1] > 0:
-            moment_grad = self._moment_wrt_samples(samples, probabilities)
+            moment_grad = self._moment_wrt_samples(samples, probabilities, statistics)
         else:
             moment_grad = np.zeros((srom_size, srom_dim))
 
         # d_e3/d_x
         if self._weights[2] > 0:
-            corr_grad = self._corr_wrt_samples(samples, probabilities)
+            corr_grad = self._corr_wrt_samples(samples, probabilities, statistics)
         else:
             corr_grad = np.zeros((srom_size, srom_dim))
 
@@ -137,37 +173,34 @@ class Gradient:
     #     result = (srom_cdf - target_cdf) * np.exp(-1 / (2 * sig ** 2) * (x - x_srom) ** 2)
     #     return result
 
-    def _cdf_wrt_samples(self, samples, probabilities):
+    def _cdf_wrt_samples(self, samples, probabilities, statistics):
 
         if samples.ndim > 1:
             (size, dim) = samples.shape
         else:
             (size, dim) = (samples.size, 1)
+        samples = samples.reshape((size, dim))
 
-        grad = np.zeros((size, dim))
-
-        # Compute relative diffs btwn srom/target CDFs.
-        # Do a compute on the generated grid to get interpolants
-        srom_cdfs = self.srom.compute_cdf(self._x_grid)
-        target_cdfs = self._target.compute_cdf(self._x_grid)
-
-        # Check for 0 cdf values to prevent divide by zero.
-        i_nonzero = np.where(target_cdfs[:, 0] > 0)[0]
-        srom_cdfs = srom_cdfs[i_nonzero, :]
-        target_cdfs = target_cdfs[i_nonzero, :]
+        # Compute relative diffs btwn srom/target CDFs (at pts where the
+        # target CDF is nonzero).
+        srom_cdfs, target_cdfs, x_grid = statistics.get_cdfs()
         diffs = (srom_cdfs - target_cdfs) / target_cdfs ** 2.0
 
+        # Gaussian kernels centered on each SROM sample, evaluated over
+        # (chunks of) the grid as (grid pts x m x d) arrays.
+        grad = np.zeros((size, dim))
+        for chunk in self.__cdf_grid_chunks(x_grid.shape[0]):
+            kernels = np.exp((-1 / (2 * self._scale ** 2)) *
+                             (x_grid[chunk, np.newaxis, :] -
+                              samples[np.newaxis, :, :]) ** 2)
+            grad += np.einsum('gj,gkj->kj', diffs[chunk], kernels)
+
         const = np.sqrt(2 * np.pi * self._scale ** 2)
-        for j in range(dim):
-            for srom_ind in range(size):
-                x_srom = samples[srom_ind, j]
-                grad[srom_ind, j] = np.sum(diffs[i_nonzero, j] * np.exp((-1 / (2 * self._scale ** 2)) *
-                                                                        (self._x_grid[i_nonzero, j] - x_srom) ** 2))
-                grad[srom_ind, j] *= (probabilities[srom_ind] / const)
+        grad *= probabilities.reshape((size, 1)) / const
 
         return grad
 
-    def _moment_wrt_samples(self, samples, probabilities):
+    def _moment_wrt_samples(self, samples, probabilities, statistics):
 
         if samples.ndim > 1:
             (size, dim) = samples.shape
@@ -175,17 +208,7 @@ class Gradient:
             (size, dim) = (samples.size, 1)
 
         # Compute relative diffs between srom/target moments.
-        srom_moments = self.srom.compute_moments(self._max_moment)
-
-        # Reshape target moments to 2D if returned as 1D for scalar RV:
-        target_moments = self._target.compute_moments(self._max_moment)
-        if len(target_moments.shape) == 1:
-            target_moments = target_moments.reshape((self._max_moment, 1))
-
-        # Prevent divide by zero
-        zero_indices = np.where(np.abs(target_moments) < 1e-12)[0]
-        target_moments[zero_indices] = 1.0
-
+        srom_moments, target_moments = statistics.get_moments()
         diffs = (srom_moments - target_moments) / target_moments ** 2.0
 
         # Compute gradient in obscure-looking but fast/vectorized way.
@@ -199,7 +222,7 @@ class Gradient:
 
         return grad
 
-    def _corr_wrt_samples(self, samples, probabilities):
+    def _corr_wrt_samples(self, samples, probabilities, statistics):
 
         """
         Gradient of corr. error term with respect to samples (for srom_ind)
@@ -212,29 +235,15 @@ class Gradient:
             return np.zeros((size, dim))
 
         # Compute relative diffs between SROM/target correlation matrices.
-        srom_corr = self.srom.compute_corr_mat()
-        target_corr = self._target.compute_correlation_matrix()
+        srom_corr, target_corr = statistics.get_correlations()
         diffs = (srom_corr - target_corr) / target_corr ** 2.0
 
-        grad = np.zeros((size, dim))
-
-        def delta(idx_i, idx_j):
-            return 0 if idx_i != idx_j else 1
-
-        for srom_ind in range(size):
-            sample_k = samples[srom_ind, :]
-            prob_k = probabilities[srom_ind]
-
-            for i in range(dim):
-                grad_sum = 0.0
-                for j in range(dim):
-                    grad_sum += diffs[i, j] * prob_k * (delta(j, j) * sample_k[j] + delta(j, i) * sample_k[i])
-
-                grad[srom_ind, i] = grad_sum
+        # d/dx_k of sum_ij diffs_ij * p_k * x_ki * x_kj is p_k*(D + D^T) x_k.
+        grad = probabilities[:, np.newaxis] * samples.dot(diffs + diffs.T)
 
         return grad
 
-    def _gradient_wrt_probabilities(self, samples):
+    def _gradient_wrt_probabilities(self, samples, statistics):
         """
         Returns gradient vector w/ derivative of obj function w.r.t. SROM
         probabilities (m x 1 array)
@@ -244,19 +253,19 @@ class Gradient:
 
         # d_e1/d_p:
         if self._weights[0] > 0:
-            cdf_grad = self._cdf_wrt_prob(samples)
+            cdf_grad = self._cdf_wrt_prob(samples, statistics)
         else:
             cdf_grad = np.zeros(srom_size)
 
         # d_e2/d_p
         if self._weights[1] > 0:
-            moment_grad = self._moment_wrt_prob(samples)
+            moment_grad = self._moment_wrt_prob(samples, statistics)
         else:
             moment_grad = np.zeros(srom_size)
 
         # d_e3/d_p
         if self._weights[2] > 0:
-            corr_grad = self._corr_wrt_prob(samples)
+            corr_grad = self._corr_wrt_prob(samples, statistics)
         else:
             corr_grad = np.zeros(srom_size)
 
@@ -266,7 +275,7 @@ class Gradient:
 
         return grad
 
-    def _cdf_wrt_prob(self, samples):
+    def _cdf_wrt_prob(self, samples, statistics):
         """
         Gradient of CDF error term with respect to probability (for srom_ind)
         
@@ -276,35 +285,28 @@ class Gradient:
 
         (size, dim) = samples.shape
 
-        # Compute relative diffs btwn srom/target CDFs.
-        srom_cdfs = self.srom.compute_cdf(self._x_grid)
-        target_cdfs = self._target.compute_cdf(self._x_grid)
-
-        # Check for 0 cdf values to prevent divide by zero.
-        i_nonzero = np.where(target_cdfs[:, 0] > 0)[0]
-        srom_cdfs = srom_cdfs[i_nonzero, :]
-        target_cdfs = target_cdfs[i_nonzero, :]
+        # Compute relative diffs btwn srom/target CDFs (at pts where the
+        # target CDF is nonzero).
+        srom_cdfs, target_cdfs, x_grid = statistics.get_cdfs()
         diffs = (srom_cdfs - target_cdfs) / target_cdfs ** 2.0
 
+        # Derivative of the SROM CDF w.r.t. each probability, evaluated over
+        # (chunks of) the grid as (grid pts x m x d) arrays.
+        sigma = self.srom.scale
         grad = np.zeros(size)
-
-        for srom_ind in range(size):
-
-            samples_k = samples[srom_ind, :]
-            grad_i = 0
-
-            for i in range(dim):
-                grid_i = self._x_grid[i_nonzero, i]
-
-                # Implement indicator function in vectorized way:
-                indices = grid_i >= samples_k[i]
-                grad_i += np.sum(diffs[indices, i])
-
-            grad[srom_ind] = grad_i
+        for chunk in self.__cdf_grid_chunks(x_grid.shape[0]):
+            if sigma is None:
+                kernels = x_grid[chunk, np.newaxis, :] >= \
+                    samples[np.newaxis, :, :]
+            else:
+                kernels = 0.5 * (1.0 + erf((x_grid[chunk, np.newaxis, :] -
+                                            samples[np.newaxis, :, :]) /
+                                           (np.sqrt(2) * sigma)))
+            grad += np.einsum('gj,gkj->k', diffs[chunk], kernels)
 
         return grad
 
-    def _moment_wrt_prob(self, samples):
+    def _moment_wrt_prob(self, samples, statistics):
         """
         Gradient of moment error term with respect to probability (for srom_ind)
         """
@@ -312,17 +314,7 @@ class Gradient:
         (size, dim) = samples.shape
 
         # Compute relative diffs between srom/target moments.
-        srom_moments = self.srom.compute_moments(self._max_moment)
-
-        # Reshape target moments to 2D if returned as 1D for scalar RV:
-        target_moments = self._target.compute_moments(self._max_moment)
-        if len(target_moments.shape) == 1:
-            target_moments = target_moments.reshape((self._max_moment, 1))
-
-        # Prevent divide by zero
-        zero_indices = np.where(np.abs(target_moments) < 1e-12)[0]
-        target_moments[zero_indices] = 1.0
-
+        srom_moments, target_moments = statistics.get_moments()
         diffs = (srom_moments - target_moments) / target_moments ** 2.0
 
         # Compute gradient in obscure-looking but fast/vectorized way.
@@ -336,7 +328,7 @@ class Gradient:
 
         return grad
 
-    def _corr_wrt_prob(self, samples):
+    def _corr_wrt_prob(self, samples, statistics):
         """
         Gradient of corr. error term with respect to probability (for srom_ind)
         """
@@ -348,21 +340,11 @@ class Gradient:
             return np.zeros(size)
 
         # Compute relative diffs between SROM/target correlation matrices.
-        srom_corr = self.srom.compute_corr_mat()
-        target_corr = self._target.compute_correlation_matrix()
+        srom_corr, target_corr = statistics.get_correlations()
         diffs = (srom_corr - target_corr) / target_corr ** 2.0
 
-        grad = np.zeros(size)
-
-        for srom_ind in range(size):
-            sample_k = samples[srom_ind, :]
-            grad_sum = 0.0
-
-            for i in range(dim):
-                for j in range(dim):
-                    grad_sum += diffs[i, j] * sample_k[i] * sample_k[j]
-
-            grad[srom_ind] = grad_sum
+        # x_k^T D x_k for each SROM sample k.
+        grad = np.einsum('ki,ij,kj->k', samples, diffs, samples)
 
         return grad
 
@@ -381,7 +363,19 @@ class Gradient:
                                cdf_grid_pts)
             self._x_grid[:, i] = grid
 
-    def __check_init_parameters(self, obj_weights, error, scale):
+    def __cdf_grid_chunks(self, num_grid_pts):
+        """
+        Returns list of slices splitting the CDF grid pts into chunks of at
+        most cdf_chunk_size pts.
+        """
+
+        chunk_size = self._cdf_chunk_size or max(num_grid_pts, 1)
+
+        return [slice(start, start + chunk_size)
+                for start in range(0, num_grid_pts, chunk_size)]
+
+    def __check_init_parameters(self, obj_weights, error, scale,
+                                cdf_chunk_size):
 
         if obj_weights is not None:
             if len(obj_weights) != 3:
@@ -398,3 +392,9 @@ class Gradient:
                 scale = float(scale)
             if not isinstance(scale, float):
                 raise TypeError("Smooth CDF scale must be numeric.")
+
+        if cdf_chunk_size is not None:
+            if not isinstance(cdf_chunk_size, int):
+                raise TypeError("cdf_chunk_size must be a positive int.")
+            if cdf_chunk_size <= 0:
+                raise ValueError("cdf_chunk_size must be a positive int.")
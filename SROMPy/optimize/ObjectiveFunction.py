@@ -15,6 +15,8 @@
 
 import numpy as np
 
+from SROMPy.optimize.SROMStatistics import SROMStatistics
+from SROMPy.optimize.TargetStatistics import TargetStatistics
 from SROMPy.target import RandomVector
 from SROMPy.target.RandomEntity import RandomEntity
 
@@ -70,6 +72,23 @@ class ObjectiveFunction:
 
         self._max_moment = max_moment
 
+        # Target statistics never change during optimization, so compute
+        # them once up front.
+        self._target_statistics = TargetStatistics(target, self._x_grid,
+                                                   max_moment)
+
+    @property
+    def x_grid(self):
+        return self._target_statistics.x_grid
+
+    @property
+    def target_statistics(self):
+        return self._target_statistics
+
+    @property
+    def weights(self):
+        return self._weights
+
     def get_moment_error(self, samples, probabilities):
         """
         Returns moment error for given samples & probabilities
@@ -100,22 +119,56 @@ class ObjectiveFunction:
         probabilities. Calculates errrors in statistics between SROM/target
         """
 
+        self.set_srom_params(samples, probabilities)
+
+        return self.compute_error()
+
+    def set_srom_params(self, samples, probabilities):
+        """
+        Sets the SROM parameters to the specified samples & probabilities
+        after enforcing the parameter bounds on the samples. Returns the
+        (bounded) samples array of size (SROM size x dim).
+        """
+
         samples = self.check_bounds(samples.flatten(), self.get_param_bounds(joint_opt=self._joint_opt))
-        error = 0.0
- 
+
         # SROM is by the current values of samples/probabilities for stats.
         self._srom.set_params(samples, probabilities)
 
+        return samples
+
+    def compute_statistics(self, report=None):
+        """
+        Returns SROMStatistics object for the current SROM parameters that
+        can be shared with the gradient evaluation at the same parameters.
+        Optionally times the statistics computations in an
+        OptimizationReport.
+        """
+
+        return SROMStatistics(self._srom, self._target_statistics, report)
+
+    def compute_error(self, statistics=None):
+        """
+        Calculates weighted sum of errors in statistics between SROM/target
+        for the current SROM parameters. Optionally uses previously computed
+        statistics (SROMStatistics object).
+        """
+
+        if statistics is None:
+            statistics = self.compute_statistics()
+
+        error = 0.0
+
         if self._weights[0] > 0.0:
-            cdf_error = self.compute_cdf_error()
+            cdf_error = self.compute_cdf_error(statistics)
             error += cdf_error * self._weights[0]
 
         if self._weights[1] > 0.0:
-            moment_error = self.compute_moment_error()
+            moment_error = self.compute_moment_error(statistics)
             error += moment_error * self._weights[1]
 
         if self._weights[2] > 0.0:
-            corr_error = self.compute_correlation_error()
+            corr_error = self.compute_correlation_error(statistics)
             error += corr_error * self._weights[2]
 
         return error
@@ -141,21 +194,15 @@ class ObjectiveFunction:
                 samples[i] = np.clip(x, bounds[i][0] + 1e-2, bounds[i][1] - 1e-2)
         return samples.reshape(self._srom.size, self._srom.dim)
 
-    def compute_moment_error(self):
+    def compute_moment_error(self, statistics=None):
         """
         Calculate error in moments between SROM & target
         """
-        
-        srom_moments = self._srom.compute_moments(self._max_moment)
-        target_moments = self._target.compute_moments(self._max_moment)
 
-        # Reshape to 2D if returned as 1D for scalar RV.
-        if len(target_moments.shape) == 1:
-            target_moments = target_moments.reshape((self._max_moment, 1))
+        if statistics is None:
+            statistics = self.compute_statistics()
 
-        # Prevent divide by zero.
-        zero_indices = np.where(np.abs(target_moments) <= 1e-12)[0]
-        target_moments[zero_indices] = 1.0
+        srom_moments, target_moments = statistics.get_moments()
 
         # Squared relative difference:
         if self._metric == "SSE":
@@ -174,18 +221,15 @@ class ObjectiveFunction:
 
         return error
 
-    def compute_cdf_error(self):
+    def compute_cdf_error(self, statistics=None):
         """
         Calculate error in CDFs between SROM & target at pts in x_grid
         """
 
-        srom_cdfs = self._srom.compute_cdf(self._x_grid)
-        target_cdfs = self._target.compute_cdf(self._x_grid)
+        if statistics is None:
+            statistics = self.compute_statistics()
 
-        # Check for 0 cdf values to prevent divide by zero.
-        nonzero_indices = np.where(target_cdfs[:, 0] > 0)[0]
-        srom_cdfs = srom_cdfs[nonzero_indices, :]
-        target_cdfs = target_cdfs[nonzero_indices, :]
+        srom_cdfs, target_cdfs, _ = statistics.get_cdfs()
 
         if self._metric == "SSE":
             squared_diffs = (srom_cdfs - target_cdfs)**2.0
@@ -202,7 +246,7 @@ class ObjectiveFunction:
 
         return error
 
-    def compute_correlation_error(self):
+    def compute_correlation_error(self, statistics=None):
         """
         Calculate error in correlation matrix between SROM & target
         """ 
@@ -211,8 +255,10 @@ class ObjectiveFunction:
         if self._target.dim == 1:
             return 0.0
 
-        srom_corr = self._srom.compute_corr_mat()
-        target_corr = self._target.compute_correlation_matrix()
+        if statistics is None:
+            statistics = self.compute_statistics()
+
+        srom_corr, target_corr = statistics.get_correlations()
 
         if self._metric == "SSE":
             squared_diffs = (srom_corr - target_corr)**2.0
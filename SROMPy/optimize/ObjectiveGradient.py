@@ -0,0 +1,190 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for evaluating the SROM objective function & its gradient together for
+scipy optimization.
+"""
+
+import contextlib
+
+import numpy as np
+
+
+class ObjectiveGradient(object):
+    """
+    Fused evaluation of the SROM objective function and its gradient. The
+    SROM parameters are set and the SROM/target statistics are computed once
+    per design point and shared by both. The objective, gradient, and
+    statistics at the most recently evaluated design point are cached so
+    repeated calls at the same point cost nothing.
+
+    Use evaluate() with scipy.optimize.minimize(..., jac=True), or pass
+    objective() & gradient() as fun & jac so the gradient is only computed at
+    the points where the optimizer asks for it (e.g., not during SLSQP line
+    searches) while still sharing the statistics with the objective.
+
+    Design variables x are unpacked into samples & probabilities for two
+    cases:
+
+    1) joint optimization over samples & probabilities (samples=None)
+    2) sequential optimization -> optimize probabilities for fixed samples
+
+    :param objective_function: SROM objective function
+    :type objective_function: SROMPy ObjectiveFunction object
+    :param gradient: SROM objective function gradient. If None, only the
+        objective is available (e.g., for the MAX/MEAN error metrics).
+    :type gradient: SROMPy Gradient object
+    :param samples: fixed SROM samples for sequential optimization, None for
+        joint optimization.
+    :type samples: 2d Numpy array, size - (SROM size) x (dim)
+    :param srom_size: SROM size
+    :type srom_size: int
+    :param dim: SROM dimension
+    :type dim: int
+    :param joint_opt: flag for joint optimization over samples & probabilities
+    :type joint_opt: bool
+    :param report: optional report to count & time the objective, gradient &
+        statistics evaluations in. Objective & gradient times include the
+        (lazily computed) SROM statistics they need.
+    :type report: SROMPy OptimizationReport object
+    """
+
+    def __init__(self, objective_function, gradient, samples, srom_size, dim,
+                 joint_opt, report=None):
+
+        self._objective_function = objective_function
+        self._gradient = gradient
+        self._samples = samples
+        self._srom_size = srom_size
+        self._dim = dim
+        self._joint_opt = joint_opt
+        self._report = report
+
+        # Design point, statistics, objective value, and gradient of the last
+        # evaluation.
+        self._last_x = None
+        self._last_statistics = None
+        self._last_objective = None
+        self._last_gradient = None
+
+    def evaluate(self, x):
+        """
+        Returns tuple (objective value, gradient) at design variables x. For
+        use with scipy.optimize.minimize(..., jac=True).
+        """
+
+        return self.objective(x), self.gradient(x)
+
+    def objective(self, x):
+        """
+        Returns objective value at design variables x.
+        """
+
+        if self._report is not None:
+            self._report.num_objective_evaluations += 1
+
+        if not self._is_cached(x):
+            self._set_design_point(x)
+
+        if self._last_objective is None:
+            with self._timer("objective"):
+                self._last_objective = \
+                    self._objective_function.compute_error(
+                        self._last_statistics)
+
+        return self._last_objective
+
+    def gradient(self, x):
+        """
+        Returns gradient of the objective at design variables x. Reuses the
+        SROM/target statistics computed for the objective at the same point.
+        """
+
+        if self._gradient is None:
+            raise ValueError("Gradient not available for this objective")
+
+        if self._report is not None:
+            self._report.num_gradient_evaluations += 1
+
+        if not self._is_cached(x):
+            self._set_design_point(x)
+
+        if self._last_gradient is None:
+
+            # Make sure the SROM still holds the parameters for this point.
+            samples, probabilities = self._unpack(x)
+            samples = self._objective_function.set_srom_params(samples,
+                                                               probabilities)
+            with self._timer("gradient"):
+                self._last_gradient = \
+                    self._gradient.compute_gradient(samples, probabilities,
+                                                    self._last_statistics)
+
+        return np.copy(self._last_gradient)
+
+    def _set_design_point(self, x):
+        """
+        Sets the SROM parameters for design variables x and resets the cache
+        with a new (lazily computed) set of SROM/target statistics.
+        """
+
+        samples, probabilities = self._unpack(x)
+        self._objective_function.set_srom_params(samples, probabilities)
+
+        self._last_x = np.array(x, copy=True)
+
+        if self._report is not None:
+            self._report.num_statistics_evaluations += 1
+
+        self._last_statistics = \
+            self._objective_function.compute_statistics(self._report)
+        self._last_objective = None
+        self._last_gradient = None
+
+    def _unpack(self, x):
+        """
+        Unpacks design variables x into samples & probabilities.
+        """
+
+        if self._joint_opt:
+            probabilities = x[self._srom_size * self._dim:]
+            samples = x[:self._srom_size * self._dim]
+            samples = samples.reshape(self._srom_size, self._dim)
+        else:
+            # Unpacking simple with samples are fixed:
+            probabilities = x
+            samples = self._samples
+
+        return samples, probabilities
+
+    def _timer(self, phase):
+        """
+        Returns context manager timing its body as phase in the report (if
+        any).
+        """
+
+        if self._report is None:
+            return contextlib.nullcontext()
+
+        return self._report.timer(phase)
+
+    def _is_cached(self, x):
+        """
+        Returns True if x is the most recently evaluated design point.
+        """
+
+        return self._last_x is not None and np.array_equal(x, self._last_x)
@@ -0,0 +1,188 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for recording telemetry (counters, timers & restart results) of an SROM
+optimization.
+"""
+
+import contextlib
+import time
+
+
+class OptimizationReport(object):
+    """
+    Structured record of an SROM optimization, filled in by the Optimizer,
+    e.g. for logging to a metrics system or finding where time is spent.
+
+    Counters:
+
+    num_objective_evaluations - # objective function evaluations
+    num_gradient_evaluations - # gradient evaluations
+    num_statistics_evaluations - # evaluations of the SROM statistics
+    num_target_queries - # queries of the target random vector during the
+        optimization (drawing samples/initial guesses)
+    target_queries_avoided - # target CDF/moment/correlation queries served
+        from the precomputed target statistics, by statistic
+
+    Timers (seconds, see PHASES):
+
+    timers['total'] - wall time of the optimization
+    timers['solver'] - time in scipy (or the QP solver), including the
+        objective/gradient evaluations it requests
+    timers['objective'] - time computing objective function values
+    timers['gradient'] - time computing gradients
+    timers['statistics'] - time computing SROM statistics (CDFs, moments,
+        correlation), part of the objective & gradient times
+    timers['target'] - time querying the target random vector
+
+    Restarts: list with a dictionary for each restart (sample set / initial
+    guess) with keys index, objective, success, message, num_iterations, time
+    & best_objective (best objective so far).
+
+    The final optimum is described by best_objective & errors (dictionary of
+    the final moment, cdf & correlation errors). stop_reason is the
+    RestartController criterion that ended the restarts early, if any.
+    """
+
+    PHASES = ("total", "solver", "statistics", "objective", "gradient",
+              "target")
+
+    def __init__(self):
+
+        self.num_objective_evaluations = 0
+        self.num_gradient_evaluations = 0
+        self.num_statistics_evaluations = 0
+        self.num_target_queries = 0
+        self.target_queries_avoided = {}
+
+        self.timers = dict((phase, 0.) for phase in self.PHASES)
+
+        self.restarts = []
+        self.best_objective = None
+        self.errors = {}
+        self.stop_reason = None
+
+    @property
+    def num_restarts(self):
+        return len(self.restarts)
+
+    @property
+    def solver_overhead(self):
+        """
+        Time spent in the solver itself, i.e., excluding the objective &
+        gradient evaluations it requested.
+        """
+
+        return max(self.timers["solver"] - self.timers["objective"] -
+                   self.timers["gradient"], 0.)
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        """
+        Context manager adding the time spent in its body to timers[phase].
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[phase] += time.perf_counter() - start
+
+    def record_restart(self, objective, restart_time, success=True,
+                       message="", num_iterations=None):
+        """
+        Appends the result of a restart to restarts & returns its dictionary.
+        """
+
+        objective = float(objective)
+        if self.best_objective is None or objective < self.best_objective:
+            self.best_objective = objective
+
+        restart = {"index": len(self.restarts),
+                   "objective": objective,
+                   "success": bool(success),
+                   "message": str(message),
+                   "num_iterations": None if num_iterations is None
+                   else int(num_iterations),
+                   "time": float(restart_time),
+                   "best_objective": self.best_objective}
+        self.restarts.append(restart)
+
+        return restart
+
+    def merge(self, other):
+        """
+        Adds the counters, timers (except the total time) & restarts of
+        another report, e.g. from a worker process, to this report.
+        """
+
+        self.num_objective_evaluations += other.num_objective_evaluations
+        self.num_gradient_evaluations += other.num_gradient_evaluations
+        self.num_statistics_evaluations += other.num_statistics_evaluations
+        self.num_target_queries += other.num_target_queries
+
+        for phase in self.PHASES:
+            if phase != "total":
+                self.timers[phase] += other.timers[phase]
+
+        if self.stop_reason is None:
+            self.stop_reason = other.stop_reason
+
+        for restart in other.restarts:
+            self.record_restart(restart["objective"], restart["time"],
+                                restart["success"], restart["message"],
+                                restart["num_iterations"])
+
+    def to_dict(self):
+        """
+        Returns the report as a (JSON serializable) dictionary.
+        """
+
+        return {"num_objective_evaluations": self.num_objective_evaluations,
+                "num_gradient_evaluations": self.num_gradient_evaluations,
+                "num_statistics_evaluations": self.num_statistics_evaluations,
+                "num_target_queries": self.num_target_queries,
+                "target_queries_avoided": dict(self.target_queries_avoided),
+                "timers": dict(self.timers),
+                "solver_overhead": self.solver_overhead,
+                "num_restarts": self.num_restarts,
+                "restarts": [dict(restart) for restart in self.restarts],
+                "best_objective": self.best_objective,
+                "errors": dict(self.errors),
+                "stop_reason": self.stop_reason}
+
+    def __str__(self):
+
+        lines = ["SROM optimization report:",
+                 "\tRestarts: %d (%d converged)" %
+                 (self.num_restarts,
+                  sum(restart["success"] for restart in self.restarts)),
+                 "\tBest objective: %s" % self.best_objective,
+                 "\tEvaluations: %d objective, %d gradient, %d statistics, "
+                 "%d target queries" %
+                 (self.num_objective_evaluations,
+                  self.num_gradient_evaluations,
+                  self.num_statistics_evaluations,
+                  self.num_target_queries)]
+
+        if self.stop_reason is not None:
+            lines.append("\tStopped early: %s" % self.stop_reason)
+
+        lines.append("\tTimes (s): " + ", ".join(
+            "%s %.3f" % (phase, self.timers[phase]) for phase in self.PHASES))
+
+        return "\n".join(lines)
@@ -17,60 +17,36 @@
 Class to solve SROM optimization problem.
 """
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import scipy.optimize as opt
-import time
+from scipy.spatial import cKDTree
 
 from SROMPy.optimize import ObjectiveFunction
 from SROMPy.optimize import Gradient
+from SROMPy.optimize import ObjectiveGradient
+from SROMPy.optimize import OptimizationReport
+from SROMPy.optimize import RestartController
+from SROMPy.optimize import CandidateGenerator
+from SROMPy.optimize import QuadraticObjective
+from SROMPy.optimize import SimplexQP
+from SROMPy.target import RandomVariable
 
 
-# ------------Helper funcs for scipy optimize-----------------------------
-def scipy_objective_function(x, objective_function, gradient, samples, srom_size, dim, joint_opt):
-    """
-    Function to pass to scipy minimize defining objective. Wraps the
-    ObjectiveFunction.evaluate() function that defines SROM error. Need to
-    unpack design variables x into samples & probabilities. Handle two cases:
-
-    1) joint optimization over samples & probabilities (samples=None)
-    2) sequential optimization -> optimize probabilities for fixed samples
-    """
-
-    if joint_opt:
-        probabilities = x[srom_size * dim:]
-        samples = x[:srom_size * dim]
-        error = objective_function.evaluate(samples.reshape(srom_size, dim), probabilities)
-    else:
-        # Unpacking simple with samples are fixed:
-        probabilities = x
-        error = objective_function.evaluate(samples, probabilities)
-
-    return error
-
-
-def scipy_gradient(x, objective_function, gradient, samples, srom_size, dim, joint_opt):
+def _run_restarts_in_worker(optimizer, num_restarts, seed, loop_args):
     """
-    Function to pass to scipy minimize defining objective. Wraps the
-    ObjectiveFunction.evaluate() function that defines SROM error. Need to
-    unpack design variables x into samples & probabilities. Handle two cases:
-
-    1) joint optimization over samples & probabilities (samples=None)
-    2) sequential optimization -> optimize probabilities for fixed samples
+    Runs a chunk of optimization restarts in a process pool worker. Returns
+    tuple of the best objective value and corresponding samples &
+    probabilities found, and the best restarts kept & OptimizationReport of
+    the worker.
     """
 
-    if joint_opt:
-        probabilities = x[srom_size * dim:]
-        samples = x[:srom_size * dim]
-        gradient = gradient.evaluate(samples.reshape(srom_size, dim), probabilities)
-    else:
-        # Unpacking simple with samples are fixed:
-        probabilities = x
-        gradient = gradient.evaluate(samples, probabilities)
+    result = optimizer._run_restarts(num_restarts, seed, *loop_args)
 
-    return gradient
-
-
-# -----------------------------------------------------------------
+    return result, optimizer.best_restarts, optimizer.report
 
 
 class Optimizer:
@@ -80,6 +56,15 @@ class Optimizer:
     between SROM & target random vector
     """
 
+    # Target samples assigned to SROM samples per batch & Monte Carlo draws
+    # used for targets without samples when computing initial guesses.
+    VORONOI_CHUNK_SIZE = 65536
+    NUM_VORONOI_SAMPLES = 20000
+
+    # Max. # of CDF kernel values (candidates x grid pts x SROM size x dim)
+    # evaluated at once when assembling batched quadratic objectives.
+    QP_CDF_CHUNK_VALUES = 2 ** 22
+
     def __init__(self, target, srom, obj_weights=None,
                  error='SSE', max_moment=5, cdf_grid_pts=100, joint_opt=False,
                  scale=None):
@@ -99,6 +84,7 @@ class Optimizer:
         """
 
         self._target = target
+        self._srom = srom
 
         # Initialize objective function defining SROM vs target error.
         self._srom_objective_function = ObjectiveFunction(srom, target,
@@ -107,24 +93,49 @@ class Optimizer:
                                                           cdf_grid_pts,
                                                           joint_opt=joint_opt)
 
+        # Gradient shares the objective function's precomputed target
+        # statistics (and CDF error grid).
+        target_statistics = self._srom_objective_function.target_statistics
         self._srom_gradient = Gradient(srom, target, obj_weights, error,
-                                       max_moment, cdf_grid_pts, scale=scale, joint_opt=joint_opt)
+                                       max_moment, cdf_grid_pts, scale=scale, joint_opt=joint_opt,
+                                       target_statistics=target_statistics)
 
         # Get srom size & dimension.
         self._srom_size = srom.size
         self._dim = srom.dim
 
         # Gradient only available for SSE error obj function.
-        if error.upper() == "SSE":
-            self._grad = scipy_gradient
-        else:
-            self._grad = None
+        self._use_gradient = error.upper() == "SSE"
+        self._joint_opt = joint_opt
+
+        # Best (objective function value, samples, probabilities) restarts
+        # found by the last optimization, best first.
+        self.best_restarts = []
+        self._num_kept_restarts = 0
+
+        # Telemetry of the last optimization & callback run after each
+        # restart.
+        self.report = OptimizationReport()
+        self._callback = None
+        self._restart_controller = None
+
+        # Random number generator of the restarts run by this CPU/worker
+        # (numpy's global random state outside of _run_restarts).
+        self._rng = None
+
+        # Generates the candidate sample sets of the restarts.
+        self._candidate_generator = CandidateGenerator(target,
+                                                       self._srom_size,
+                                                       self._dim)
 
         self.__detect_parallelization()
 
     def get_optimal_params(self, num_test_samples=500, tolerance=None,
                            options=None, method=None, joint_opt=False,
-                           output_interval=10, verbose=True, qmc_engine=None):
+                           output_interval=10, verbose=True, qmc_engine=None,
+                           n_jobs=1, batch_size=None, num_kept_restarts=0,
+                           callback=None, restart_controller=None,
+                           candidates=None):
         """
         Solve the SROM optimization problem - finds samples & probabilities
         that minimize the error between SROM/Target RV statistics.
@@ -139,11 +150,47 @@ class Optimizer:
             -tolerance, float, tolerance of scipy optimization algorithm
             -options, dict, options for scipy optimization algorithm, see scipy
                 documentation.
-            -method, str, method specifying scipy optimization algorithm
+            -method, str, method specifying scipy optimization algorithm, or
+                'qp' to solve each sequential probability subproblem directly
+                as a simplex-constrained quadratic program with an active-set
+                method (SSE error only)
             -output_interval, int, how often to print optimization progress
             -verbose: bool. Flag for whether to generate text output.
-
-        returns optimal SROM samples & probabilities
+            -qmc_engine: str. 'Sobol' or 'Halton' to draw the joint
+                optimization initial guesses from a SampleRandomVector with
+                quasi-random indices (see also candidates).
+            -n_jobs: int. Number of worker processes to split the restarts
+                across (in addition to any MPI parallelization). -1 uses one
+                process per available CPU core. Each worker gets its own
+                random number stream, so results are reproducible for a given
+                n_jobs. As with n_jobs=1, the restarts' random number streams
+                are seeded from the CPU rank, not numpy's global random state,
+                so repeated calls give the same restarts.
+            -batch_size: int. If given, sequential optimization draws this
+                many candidate sample sets at a time and optimizes all of
+                their probabilities in one batched array pass (projected
+                gradient on the probability simplex) instead of one scipy
+                call per sample set. Only available for the SSE error.
+            -num_kept_restarts: int. Number of best restarts (objective
+                function value, samples, probabilities) to keep in
+                best_restarts, e.g. to warm start a later re-optimization
+                with refine_params. With MPI, each CPU keeps its own.
+            -callback: callable. Called after each restart with the
+                restart's dictionary from the OptimizationReport (objective,
+                success, num_iterations, time, ...). With n_jobs > 1 it is
+                called in this process once the workers finish.
+            -restart_controller: RestartController. Stops the restarts early
+                (e.g., target objective reached, no improvement in a number
+                of restarts, time budget used) so num_test_samples is only
+                the max. # restarts. Applied per CPU & process pool worker.
+            -candidates: str or CandidateGenerator. How the candidate sample
+                sets (& joint initial guesses) are generated: 'random'
+                (default), quasi-random 'sobol'/'halton', Latin hypercube
+                'lhs', or 'kmeans'/'kmedoids' clusters of target samples.
+
+        returns optimal SROM samples & probabilities. Counters, timers and
+        per-restart results of the optimization are recorded in the
+        OptimizationReport self.report (per CPU with MPI).
 
         """
 
@@ -153,41 +200,323 @@ class Optimizer:
         if num_test_samples <= 0:
             raise ValueError("Insufficient number of test samples specified.")
 
+        if not isinstance(n_jobs, int):
+            raise TypeError("n_jobs must be a positive int or -1.")
+
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+
+        if n_jobs <= 0:
+            raise ValueError("n_jobs must be a positive int or -1.")
+
+        if callback is not None and not callable(callback):
+            raise TypeError("callback must be callable.")
+
+        if restart_controller is not None and \
+                not isinstance(restart_controller, RestartController):
+            raise TypeError("restart_controller must be a RestartController.")
+
+        if qmc_engine not in (None, 'Sobol', 'Halton'):
+            raise ValueError("Invalid QMC engine provided.")
+
+        self.__set_candidate_generator(candidates)
+
+        if not isinstance(num_kept_restarts, int):
+            raise TypeError("num_kept_restarts must be a non-negative int.")
+
+        if num_kept_restarts < 0:
+            raise ValueError("num_kept_restarts must be a non-negative int.")
+
+        if batch_size is not None:
+            if not isinstance(batch_size, int):
+                raise TypeError("batch_size must be a positive int.")
+
+            if batch_size <= 0:
+                raise ValueError("batch_size must be a positive int.")
+
+            if joint_opt or self._joint_opt:
+                raise ValueError("batch_size is only supported for "
+                                 "sequential optimization.")
+
+            if not self._use_gradient:
+                raise ValueError("batch_size is only supported for the SSE "
+                                 "error.")
+
+        if self.__use_qp_solver(method):
+
+            if joint_opt or self._joint_opt:
+                raise ValueError("The qp method is only supported for "
+                                 "sequential optimization.")
+
+            if not self._use_gradient:
+                raise ValueError("The qp method is only supported for the "
+                                 "SSE error.")
+
         # Make test for options(both cases maxiter, disp) and tolerance (TODO)
 
         # Report whether we're running in sequential or parallel mode.
         if verbose:
-            self.show_parallelization_information(num_test_samples)
+            self.show_parallelization_information(num_test_samples, n_jobs)
+
+        self.__start_report(num_kept_restarts, callback, restart_controller)
 
         # Find optimal parameters.
-        t0 = time.time()
-        optimal_samples, optimal_probabilities = \
-            self.__perform_optimization(num_test_samples,
-                                        joint_opt,
-                                        method,
-                                        output_interval,
-                                        verbose,
-                                        tolerance,
-                                        options,
-                                        qmc_engine)
-
-        # Display final errors in statistics:
-        moment_error, cdf_error, correlation_error, mean_error = \
-            self.get_errors(optimal_samples, optimal_probabilities)
+        with self.report.timer("total"):
+            optimal_samples, optimal_probabilities = \
+                self.__perform_optimization(num_test_samples,
+                                            joint_opt,
+                                            method,
+                                            output_interval,
+                                            verbose,
+                                            tolerance,
+                                            options,
+                                            qmc_engine,
+                                            n_jobs,
+                                            batch_size)
+
+        self.__finish_report(optimal_samples, optimal_probabilities, verbose)
+
+        return optimal_samples, optimal_probabilities
+
+    def refine_params(self, initial_params, tolerance=None, options=None,
+                      method=None, joint_opt=False, verbose=True,
+                      callback=None):
+        """
+        Locally refines given SROM samples & probabilities (warm start)
+        instead of searching from random restarts, e.g. to update an existing
+        SROM after a small change in the target. All starting points are kept
+        in best_restarts (best first) after refinement.
+
+        inputs:
+            -initial_params, list of (samples, probabilities) tuples to start
+                the local optimization from.
+            -tolerance, float, tolerance of scipy optimization algorithm
+            -options, dict, options for scipy optimization algorithm, e.g.
+                a small 'maxiter' for a quick refinement.
+            -method, str, method specifying scipy optimization algorithm, or
+                'qp' to re-solve the probabilities of the samples exactly
+                (sequential optimization & SSE error only)
+            -joint_opt, bool, Flag for refining samples & probabilities
+                jointly rather than only the probabilities of fixed samples.
+            -verbose: bool. Flag for whether to generate text output.
+            -callback: callable. Called after each refined starting point
+                with its restart dictionary from the OptimizationReport.
+
+        returns optimal SROM samples & probabilities (telemetry is recorded
+        in self.report)
+        """
+
+        if len(initial_params) == 0:
+            raise ValueError("At least one set of initial params is needed.")
+
+        if self.__use_qp_solver(method):
+
+            if joint_opt or self._joint_opt:
+                raise ValueError("The qp method is only supported for "
+                                 "sequential optimization.")
+
+            if not self._use_gradient:
+                raise ValueError("The qp method is only supported for the "
+                                 "SSE error.")
+
+        if callback is not None and not callable(callback):
+            raise TypeError("callback must be callable.")
+
+        self.__start_report(len(initial_params), callback)
+        total_start_time = time.perf_counter()
+
+        best_objective_function_result = np.inf
+        optimal_samples = None
+        optimal_probabilities = None
+
+        for samples, probabilities in initial_params:
+
+            restart_start_time = time.perf_counter()
+            optimization_result = None
+
+            samples = np.reshape(np.array(samples, dtype=float),
+                                 (self._srom_size, self._dim))
+            probabilities = np.array(probabilities, dtype=float).flatten()
+
+            if self.__use_qp_solver(method):
+
+                with self.report.timer("solver"):
+                    objectives, probabilities = \
+                        self.__solve_probability_qps(samples, method,
+                                                     tolerance, options)
+                (objective, probabilities) = (objectives[0], probabilities[0])
+
+            elif joint_opt:
+
+                # Starting samples must lie within the (new) target bounds.
+                samples = np.clip(samples, self._target.mins,
+                                  self._target.maxs)
+
+                scipy_objective, jac = self.get_scipy_objective(None, True)
+                with self.report.timer("solver"):
+                    optimization_result = opt.minimize(
+                        scipy_objective,
+                        np.hstack((samples.flatten(), probabilities)),
+                        jac=jac,
+                        constraints=self.get_constraints(True),
+                        method=method,
+                        bounds=self.get_param_bounds(True),
+                        tol=tolerance,
+                        options=options)
+
+                objective = optimization_result['fun']
+                samples = np.reshape(
+                    optimization_result['x'][:self._srom_size * self._dim],
+                    (self._srom_size, self._dim))
+                probabilities = optimization_result['x'][-self._srom_size:]
+
+            else:
+
+                scipy_objective, jac = self.get_scipy_objective(samples,
+                                                                False)
+                with self.report.timer("solver"):
+                    optimization_result = opt.minimize(
+                        scipy_objective,
+                        probabilities,
+                        jac=jac,
+                        constraints=self.get_constraints(False),
+                        method=method,
+                        bounds=self.get_param_bounds(False),
+                        tol=tolerance,
+                        options=options)
+
+                objective = optimization_result['fun']
+                probabilities = optimization_result['x']
+
+            self.__record_restart(objective, samples, probabilities,
+                                  time.perf_counter() - restart_start_time,
+                                  optimization_result)
+
+            if objective < best_objective_function_result:
+                best_objective_function_result = objective
+                optimal_samples = samples
+                optimal_probabilities = probabilities
+
+        self.report.timers["total"] += time.perf_counter() - total_start_time
+        self.__finish_report(optimal_samples, optimal_probabilities, verbose)
+
+        return optimal_samples, optimal_probabilities
+
+    # -----Helper funcs----
+
+    def __set_candidate_generator(self, candidates):
+        """
+        Sets the generator of candidate sample sets from a method name or
+        CandidateGenerator (None for random draws).
+        """
+
+        if candidates is None:
+            candidates = "random"
+
+        if isinstance(candidates, str):
+            candidates = CandidateGenerator(self._target, self._srom_size,
+                                            self._dim, candidates)
+        elif not isinstance(candidates, CandidateGenerator):
+            raise TypeError("candidates must be a str or CandidateGenerator.")
+
+        if candidates.srom_size != self._srom_size:
+            raise ValueError("candidates must generate sample sets of the "
+                             "SROM size.")
+
+        self._candidate_generator = candidates
+
+    def __start_report(self, num_kept_restarts, callback,
+                       restart_controller=None):
+        """
+        Resets the kept restarts & the OptimizationReport for a new
+        optimization.
+        """
+
+        self.best_restarts = []
+        self._num_kept_restarts = num_kept_restarts
+        self._callback = callback
+        self._restart_controller = restart_controller
+
+        self.report = OptimizationReport()
+        self._initial_queries_avoided = dict(
+            self._srom_objective_function.target_statistics.queries_avoided)
+
+    def __finish_report(self, samples, probabilities, verbose):
+        """
+        Records the final errors & target queries avoided in the report and
+        prints the optimization time & final errors if verbose.
+        """
+
+        self._callback = None
+        self._restart_controller = None
+
+        moment_error, cdf_error, correlation_error, _ = \
+            self.get_errors(samples, probabilities)
+        self.report.errors = {"moment": float(moment_error),
+                              "cdf": float(cdf_error),
+                              "correlation": float(correlation_error)}
+
+        queries_avoided = \
+            self._srom_objective_function.target_statistics.queries_avoided
+        self.report.target_queries_avoided = dict(
+            (name, count - self._initial_queries_avoided.get(name, 0))
+            for name, count in queries_avoided.items())
 
         if verbose and self.cpu_rank == 0:
-            print("\tOptimization time: %.3f seconds" % (time.time() - t0))
+            print("\tOptimization time: %.3f seconds" %
+                  self.report.timers["total"])
             print("\tFinal SROM errors:")
             print("\t\tCDF: ", cdf_error)
             print("\t\tMoment: ", moment_error)
             print("\t\tCorrelation: ", correlation_error)
 
-        return optimal_samples, optimal_probabilities
+    def __record_restart(self, objective, samples, probabilities,
+                         restart_time, optimization_result=None):
+        """
+        Records a restart in the report, runs the callback & keeps the
+        num_kept_restarts best restarts (objective function value, samples,
+        probabilities) found so far in best_restarts, best first.
+        """
 
-    # -----Helper funcs----
+        if optimization_result is None:
+            restart = self.report.record_restart(objective, restart_time)
+        else:
+            restart = self.report.record_restart(
+                objective, restart_time,
+                optimization_result.get('success', True),
+                optimization_result.get('message', ""),
+                optimization_result.get('nit', None))
+
+        if self._callback is not None:
+            self._callback(restart)
+
+        if self._restart_controller is not None and \
+                self._restart_controller.update(objective):
+            self.report.stop_reason = self._restart_controller.stop_reason
+
+        if self._num_kept_restarts == 0:
+            return
+
+        self.best_restarts.append(
+            (float(objective),
+             np.reshape(np.array(samples, dtype=float),
+                        (self._srom_size, self._dim)),
+             np.array(probabilities, dtype=float).flatten()))
+
+        self.best_restarts.sort(key=lambda restart: restart[0])
+        del self.best_restarts[self._num_kept_restarts:]
+
+    def __stop_restarts(self):
+        """
+        Returns True if the restart controller (if any) stopped the restarts.
+        """
+
+        return self._restart_controller is not None and \
+            self._restart_controller.stop_reason is not None
 
     def __perform_optimization(self, num_test_samples, joint_opt, method,
-                               output_interval, verbose, tolerance, options, qmc_engine):
+                               output_interval, verbose, tolerance, options, qmc_engine,
+                               n_jobs, batch_size):
         """
         Calls optimization loop function and, in the case of parallelization,
         acquires the optimal results achieved across all CPUs before
@@ -204,55 +533,168 @@ class Optimizer:
         -tolerance: float, tolerance for scipy optimization algorithm
         -options: dict, options for scipy optimization algorithm, see scipy
                 documentation.
+        -n_jobs: int, number of worker processes to split restarts across.
+        -batch_size: int, number of candidate sample sets per batched pass,
+                or None to optimize each sample set separately with scipy.
 
         returns optimal SROM samples & probabilities
         """
-        if not joint_opt:
-            if verbose:
+        if verbose and self.cpu_rank == 0:
+            if not joint_opt:
                 print("Running sequential optimization")
-            optimal_samples, optimal_probabilities = \
-                self.__run_optimization_loop(num_test_samples,
-                                             joint_opt,
-                                             method,
-                                             output_interval,
-                                             verbose,
-                                             tolerance,
-                                             options,
-                                             qmc_engine)
-        else:
-            if verbose:
+            else:
                 print("Running joint optimization")
-            optimal_samples, optimal_probabilities = \
-                self.__run_joint_optimization_loop(num_test_samples,
-                                                   joint_opt,
-                                                   method,
-                                                   output_interval,
-                                                   verbose,
-                                                   tolerance,
-                                                   options,
-                                                   qmc_engine)
+
+        num_test_samples_per_cpu = num_test_samples // self.number_CPUs
+        loop_args = (joint_opt, method, output_interval, verbose, tolerance,
+                     options, qmc_engine, batch_size)
+
+        if n_jobs == 1:
+            best_objective_function_result, optimal_samples, \
+                optimal_probabilities = \
+                self._run_restarts(num_test_samples_per_cpu, self.cpu_rank,
+                                   *loop_args)
+        else:
+            best_objective_function_result, optimal_samples, \
+                optimal_probabilities = \
+                self.__run_restarts_in_process_pool(num_test_samples_per_cpu,
+                                                    n_jobs,
+                                                    loop_args)
 
         # If we're running in parallel mode, we need to gather all of the data
         # across CPUs and identify the best result.
         if self.number_CPUs > 1:
             optimal_samples, optimal_probabilities = \
-                self.__get_optimal_parallel_results(optimal_samples,
-                                                    optimal_probabilities)
+                self.__get_optimal_parallel_results(
+                    best_objective_function_result,
+                    optimal_samples,
+                    optimal_probabilities)
 
         return optimal_samples, optimal_probabilities
 
-    def __run_optimization_loop(self, num_test_samples, joint_opt, method,
+    def _run_restarts(self, num_restarts, seed, joint_opt, method,
+                      output_interval, verbose, tolerance, options, qmc_engine,
+                      batch_size=None):
+        """
+        Creates the random number generator the restarts draw their sample
+        sets with & runs num_restarts optimization restarts with the
+        sequential or joint optimization loop.
+        -num_restarts: int, number of restarts (sample sets) to run.
+        -seed: int or np.random.SeedSequence, seed for the restarts' numpy
+                Generator.
+        Remaining inputs are as for __perform_optimization.
+
+        returns tuple of best objective function value and the corresponding
+        optimal SROM samples & probabilities
+        """
+
+        self._rng = np.random.default_rng(seed)
+
+        if self._restart_controller is not None:
+            self._restart_controller.start()
+
+        if batch_size is not None:
+            return self.__run_batched_optimization_loop(num_restarts,
+                                                        batch_size,
+                                                        method,
+                                                        output_interval,
+                                                        verbose,
+                                                        tolerance,
+                                                        options)
+        elif not joint_opt:
+            return self.__run_optimization_loop(num_restarts,
+                                                joint_opt,
+                                                method,
+                                                output_interval,
+                                                verbose,
+                                                tolerance,
+                                                options,
+                                                qmc_engine)
+        else:
+            return self.__run_joint_optimization_loop(num_restarts,
+                                                      joint_opt,
+                                                      method,
+                                                      output_interval,
+                                                      verbose,
+                                                      tolerance,
+                                                      options,
+                                                      qmc_engine)
+
+    def __run_restarts_in_process_pool(self, num_restarts, n_jobs, loop_args):
+        """
+        Splits the optimization restarts as evenly as possible across a pool
+        of n_jobs worker processes. Each worker's chunk of restarts uses its
+        own random number stream spawned from the CPU rank (like the single
+        process restarts, independent of numpy's global random state), and
+        the best result is reduced deterministically (lowest objective
+        function value, ties going to the earliest chunk), so results are
+        reproducible for a given n_jobs.
+        -num_restarts: int, total number of restarts to run on this CPU.
+        -n_jobs: int, number of worker processes.
+        -loop_args: tuple of remaining inputs to _run_restarts.
+
+        returns tuple of best objective function value and the corresponding
+        optimal SROM samples & probabilities
+        """
+
+        # Number of restarts per worker, dropping empty chunks.
+        chunk_sizes = [num_restarts // n_jobs + (1 if i < num_restarts % n_jobs
+                                                 else 0)
+                       for i in range(n_jobs)]
+        chunk_sizes = [size for size in chunk_sizes if size > 0]
+
+        # No restarts on this CPU (e.g., fewer restarts than MPI ranks), so
+        # leave the report empty & return no result, like the serial loops.
+        if len(chunk_sizes) == 0:
+            return np.inf, None, None
+
+        seeds = np.random.SeedSequence(self.cpu_rank).spawn(len(chunk_sizes))
+
+        # Progress can't be reported from inside the workers, and the
+        # callback is run here for the workers' restarts once they finish.
+        loop_args = list(loop_args)
+        loop_args[3] = False
+        loop_args = tuple(loop_args)
+
+        callback = self._callback
+        self._callback = None
+
+        try:
+            with ProcessPoolExecutor(max_workers=len(chunk_sizes)) as executor:
+                futures = [executor.submit(_run_restarts_in_worker, self,
+                                           chunk_size, seed, loop_args)
+                           for chunk_size, seed in zip(chunk_sizes, seeds)]
+                results = [future.result() for future in futures]
+        finally:
+            self._callback = callback
+
+        best_result = (np.inf, None, None)
+        for result, best_restarts, report in results:
+            if result[0] < best_result[0]:
+                best_result = result
+
+            self.best_restarts.extend(best_restarts)
+
+            num_restarts_before = self.report.num_restarts
+            self.report.merge(report)
+
+            if callback is not None:
+                for restart in self.report.restarts[num_restarts_before:]:
+                    callback(restart)
+
+        self.best_restarts.sort(key=lambda restart: restart[0])
+        del self.best_restarts[self._num_kept_restarts:]
+
+        return best_result
+
+    def __run_optimization_loop(self, num_restarts, joint_opt, method,
                                 output_interval, verbose, tolerance, options, qmc_engine):
         """
-        Is run by __perform_optimization to perform sampling and acquire
-        optimal parameter values.
+        Is run by _run_restarts to perform sampling and acquire optimal
+        parameter values.
 
-        Calls optimization loop function and, in the case of parallelization,
-        acquires the optimal results achieved across all CPUs before
-        returning them.
-        -num_test_samples: int, If optimizing sequentially (samples then
-                probabilities), this is number of random sample sets to test in
-                opt.
+        -num_restarts: int, number of random sample sets to test in opt on
+                this process.
         -joint_opt: bool, Flag for optimizing jointly for samples &
                 probabilities rather than sequentially (draw samples then
                 optimize probabilities in loop - default).
@@ -263,7 +705,8 @@ class Optimizer:
         -options: dict, options for scipy optimization algorithm, see scipy 
                 documentation.
 
-        returns optimal SROM samples & probabilities
+        returns tuple of best objective function value and the corresponding
+        optimal SROM samples & probabilities
         """
 
         # Track optimal func value with corresponding samples/probabilities.
@@ -271,33 +714,62 @@ class Optimizer:
         optimal_samples = None
         best_objective_function_result = 1e6
 
-        np.random.seed(self.cpu_rank)
-        num_test_samples_per_cpu = num_test_samples // self.number_CPUs
-
         # Perform sampling, tracking the best results.
-        for i in range(num_test_samples_per_cpu):
+        for i in range(num_restarts):
 
-            # Randomly draw new.
-            srom_samples = self._target.draw_random_sample(self._srom_size)
+            restart_start_time = time.perf_counter()
+
+            # Generate new candidate sample set.
+            with self.report.timer("target"):
+                srom_samples = self._candidate_generator.draw(rng=self._rng)
+                self.report.num_target_queries += 1
+
+            if self.__use_qp_solver(method):
+
+                with self.report.timer("solver"):
+                    objectives, probabilities = \
+                        self.__solve_probability_qps(srom_samples, method,
+                                                     tolerance, options)
+
+                self.__record_restart(objectives[0], srom_samples,
+                                      probabilities[0],
+                                      time.perf_counter() - restart_start_time)
+
+                if objectives[0] < best_objective_function_result:
+                    optimal_samples = srom_samples
+                    optimal_probabilities = probabilities[0]
+                    best_objective_function_result = objectives[0]
+
+                if verbose and self.number_CPUs == 1 and \
+                        (i == 0 or (i + 1) % output_interval == 0):
+                    print("\tIteration %d Current Optimal Objective: %.4f" % \
+                          (i + 1, best_objective_function_result))
+
+                if self.__stop_restarts():
+                    break
+
+                continue
 
             # Optimize using scipy.
-            args = (self._srom_objective_function,
-                    self._srom_gradient,
-                    srom_samples,
-                    self._srom_size,
-                    self._dim,
-                    joint_opt)
-
-            optimization_result = \
-                opt.minimize(scipy_objective_function,
-                             self.get_initial_guess(joint_opt, qmc_engine),
-                             args=args,
-                             jac=self._grad,
-                             constraints=self.get_constraints(joint_opt),
-                             method=method,
-                             bounds=self.get_param_bounds(joint_opt),
-                             tol=tolerance,
-                             options=options)
+            objective, jac = self.get_scipy_objective(srom_samples, joint_opt)
+            initial_guess = self.get_initial_guess(joint_opt, qmc_engine,
+                                                   srom_samples)
+
+            with self.report.timer("solver"):
+                optimization_result = \
+                    opt.minimize(objective,
+                                 initial_guess,
+                                 jac=jac,
+                                 constraints=self.get_constraints(joint_opt),
+                                 method=method,
+                                 bounds=self.get_param_bounds(joint_opt),
+                                 tol=tolerance,
+                                 options=options)
+
+            self.__record_restart(optimization_result['fun'], srom_samples,
+                                  optimization_result['x'],
+                                  time.perf_counter() - restart_start_time,
+                                  optimization_result)
 
             # If error is lower than lowest so far, keep track of results.
             if optimization_result['fun'] < best_objective_function_result:
@@ -311,21 +783,149 @@ class Optimizer:
                 print("\tIteration %d Current Optimal Objective: %.4f" % \
                       (i + 1, best_objective_function_result))
 
-        return optimal_samples, optimal_probabilities
+            if self.__stop_restarts():
+                break
+
+        return best_objective_function_result, optimal_samples, \
+            optimal_probabilities
+
+    def __run_batched_optimization_loop(self, num_restarts, batch_size,
+                                        method, output_interval, verbose,
+                                        tolerance, options):
+        """
+        Is run by _run_restarts to perform sequential optimization in
+        batches: each batch of randomly drawn sample sets has all of its
+        probabilities optimized at once by a projected gradient method on the
+        quadratic SSE objective, so no per-candidate python/scipy overhead is
+        incurred.
+
+        -num_restarts: int, number of random sample sets to test in opt on
+                this process.
+        -batch_size: int, number of sample sets optimized per batch.
+        -method: str, 'qp' to solve each QP in the batch exactly with the
+                active-set method rather than by projected gradient.
+        -output_interval: int, how often (in batches) to print progress.
+        -verbose: bool. Flag for whether to generate text output.
+        -tolerance: float, convergence tolerance of the QP solver.
+        -options: dict, 'maxiter' sets the max iterations of the QP solver.
 
-    def __run_joint_optimization_loop(self, num_test_samples, joint_opt, method,
+        returns tuple of best objective function value and the corresponding
+        optimal SROM samples & probabilities
+        """
+
+        # Track optimal func value with corresponding samples/probabilities.
+        optimal_probabilities = None
+        optimal_samples = None
+        best_objective_function_result = 1e6
+
+        num_batches = int(np.ceil(num_restarts / float(batch_size)))
+        for i in range(num_batches):
+
+            batch_start_time = time.perf_counter()
+            num_candidates = min(batch_size, num_restarts - i * batch_size)
+
+            # Generate new candidate sample sets for the whole batch.
+            with self.report.timer("target"):
+                candidates = self._candidate_generator.draw(num_candidates,
+                                                            self._rng)
+                self.report.num_target_queries += num_candidates
+
+            with self.report.timer("solver"):
+                objectives, probabilities = \
+                    self.__solve_probability_qps(candidates, method,
+                                                 tolerance, options)
+            best_index = np.argmin(objectives)
+
+            # Each candidate is a restart, sharing the batch time.
+            candidate_time = (time.perf_counter() - batch_start_time) / \
+                num_candidates
+            for k in range(num_candidates):
+                self.__record_restart(objectives[k], candidates[k],
+                                      probabilities[k], candidate_time)
+
+            # If error is lower than lowest so far, keep track of results.
+            if objectives[best_index] < best_objective_function_result:
+                optimal_samples = candidates[best_index]
+                optimal_probabilities = probabilities[best_index]
+                best_objective_function_result = objectives[best_index]
+
+            # Report ongoing results to user if in sequential mode.
+            if verbose and self.number_CPUs == 1 and \
+                    (i == 0 or (i + 1) % output_interval == 0):
+                print("\tBatch %d Current Optimal Objective: %.4f" % \
+                      (i + 1, best_objective_function_result))
+
+            # The stopping criteria are checked once per batch.
+            if self.__stop_restarts():
+                break
+
+        return best_objective_function_result, optimal_samples, \
+            optimal_probabilities
+
+    @staticmethod
+    def __use_qp_solver(method):
+        """
+        Returns whether method selects the dedicated QP solver rather than a
+        scipy optimization algorithm.
+        """
+
+        return isinstance(method, str) and method.lower() == 'qp'
+
+    def __solve_probability_qps(self, candidates, method, tolerance, options):
+        """
+        Solves the (quadratic) SSE problem for the optimal probabilities of
+        each of a batch of candidate sample sets.
+        -candidates: (K x m x d) or (m x d) array of SROM sample sets.
+        -method: str, 'qp' for the exact active-set solver, otherwise a
+                projected gradient method is used.
+        -tolerance: float, tolerance of the QP solver.
+        -options: dict, 'maxiter' sets the max iterations of the QP solver.
+
+        returns tuple of the (K) objective function values & (K x m) optimal
+        probabilities
+        """
+
+        cdf_chunk_size = max(1, self.QP_CDF_CHUNK_VALUES //
+                             int(np.prod(np.shape(candidates))))
+
+        quadratic_objective = QuadraticObjective(
+            self._srom_objective_function.target_statistics,
+            self._srom_objective_function.weights,
+            candidates,
+            self._srom.scale,
+            cdf_chunk_size)
+
+        max_iterations = None
+        if options is not None:
+            max_iterations = options.get('maxiter', None)
+
+        if self.__use_qp_solver(method):
+            probabilities = SimplexQP.solve_active_set(
+                quadratic_objective.hessian,
+                quadratic_objective.linear_term,
+                max_iterations=max_iterations,
+                tolerance=1e-10 if tolerance is None else tolerance)
+        else:
+            probabilities = SimplexQP.solve_projected_gradient(
+                quadratic_objective.hessian,
+                quadratic_objective.linear_term,
+                max_iterations=max_iterations or 1000,
+                tolerance=1e-8 if tolerance is None else tolerance)
+
+        objectives, _ = quadratic_objective.evaluate(probabilities)
+        self.report.num_objective_evaluations += len(objectives)
+
+        return objectives, probabilities
+
+    def __run_joint_optimization_loop(self, num_restarts, joint_opt, method,
                                       output_interval, verbose, tolerance, options,
                                       qmc_engine=None):
         """
-        Is run by __perform_optimization to perform sampling and acquire
-        optimal parameter values.
+        Is run by _run_restarts to perform sampling and acquire optimal
+        parameter values.
 
-        Calls optimization loop function and, in the case of parallelization,
-        acquires the optimal results achieved across all CPUs before
-        returning them.
-        -num_test_samples: int, If optimizing sequentially (samples then
-                probabilities), this is number of random sample sets to test in
-                opt.
+        -num_restarts: int, number of random initial guesses to run the
+                joint optimization from on this process.
         -joint_opt: bool, Flag for optimizing jointly for samples &
                 probabilities rather than sequentially (draw samples then
                 optimize probabilities in loop - default).
@@ -336,7 +936,8 @@ class Optimizer:
         -options: dict, options for scipy optimization algorithm, see scipy
                 documentation.
 
-        returns optimal SROM samples & probabilities
+        returns tuple of best objective function value and the corresponding
+        optimal SROM samples & probabilities
         """
 
         # Track optimal func value with corresponding samples/probabilities.
@@ -346,40 +947,39 @@ class Optimizer:
         sample_len = self._srom_size * self._dim
         prob_len = self._srom_size
 
-        # TODO add MPI option for joint
-
         # For the joint it might be better to do an initial opt then use
         # the results from that opt for a second opt, doesn't seem to
         # improve the objective otherwise
 
-        # Set the samples to none for the joint procedure
-        srom_samples = None
-
-        # Optimize using scipy. These args are the same for each iteration
-        args = (self._srom_objective_function,
-                self._srom_gradient,
-                srom_samples,
-                self._srom_size,
-                self._dim,
-                joint_opt)
-
-        np.random.seed(self.cpu_rank)
-        num_test_samples_per_cpu = num_test_samples // self.number_CPUs
         i = 0
         # Perform sampling, tracking the best results.
         # while best_objective_function_result > 500:
-        for i in range(num_test_samples_per_cpu):
-
-            optimization_result = \
-                opt.minimize(scipy_objective_function,
-                             x0=self.get_initial_guess(joint_opt, qmc_engine=qmc_engine),
-                             args=args,
-                             jac=self._grad,
-                             constraints=(self.get_constraints(joint_opt)),
-                             method=method,
-                             bounds=self.get_param_bounds(joint_opt),
-                             tol=tolerance,
-                             options=options)
+        for i in range(num_restarts):
+
+            restart_start_time = time.perf_counter()
+
+            # Optimize using scipy. Samples are set to none for the joint
+            # procedure.
+            objective, jac = self.get_scipy_objective(None, joint_opt)
+            initial_guess = self.get_initial_guess(joint_opt,
+                                                   qmc_engine=qmc_engine)
+
+            with self.report.timer("solver"):
+                optimization_result = \
+                    opt.minimize(objective,
+                                 x0=initial_guess,
+                                 jac=jac,
+                                 constraints=(self.get_constraints(joint_opt)),
+                                 method=method,
+                                 bounds=self.get_param_bounds(joint_opt),
+                                 tol=tolerance,
+                                 options=options)
+
+            self.__record_restart(optimization_result['fun'],
+                                  optimization_result['x'][:sample_len],
+                                  optimization_result['x'][-prob_len:],
+                                  time.perf_counter() - restart_start_time,
+                                  optimization_result)
 
             # If error is lower than lowest so far, keep track of results.
             if optimization_result['fun'] < best_objective_function_result:
@@ -394,15 +994,25 @@ class Optimizer:
                       (i + 1, best_objective_function_result))
             i += 1
 
-        return optimal_samples.reshape(self._srom_size, self._dim), optimal_probabilities
+            if self.__stop_restarts():
+                break
+
+        return best_objective_function_result, \
+            optimal_samples.reshape(self._srom_size, self._dim), \
+            optimal_probabilities
 
-    def __get_optimal_parallel_results(self, optimal_samples,
+    def __get_optimal_parallel_results(self, best_objective_function_result,
+                                       optimal_samples,
                                        optimal_probabilities):
         """
-        Allows all CPUs to share results data to determine optimum. Optimal
-        results are then distributed to all CPUs and returned.
+        Allows all CPUs to share results data to determine optimum. The CPU
+        with the lowest objective function value is found with an MPI
+        allreduce (MINLOC, ties going to the lowest rank) and only that CPU's
+        optimal results are then broadcast to all CPUs and returned.
         Note: should only be run when multiple CPUs are utilized to compute
         optimization and mpi4py module is available.
+        -best_objective_function_result: objective function value of this
+               CPU's optimal samples & probabilities
         -optimal_samples: samples computed in get_optimal_params
         -optimal_probabilities: probabilities computed in
                get_optimal_params
@@ -410,48 +1020,37 @@ class Optimizer:
         returns tuple containing optimal samples and probabilities
         """
 
-        # Create a package to transmit results in.
-        this_cpu_results = {'samples': optimal_samples,
-                            'probabilities': optimal_probabilities}
-
-        # Gather results.
-        import mpi4py
-        comm = mpi4py.MPI.COMM_WORLD
-        all_cpu_results = comm.gather(this_cpu_results, root=0)
-
-        # Let CPU 0 gather and compare results to determine optimum.
-        if self.cpu_rank == 0:
-
-            best_mean_error = 1e6
+        from mpi4py import MPI
+        comm = MPI.COMM_WORLD
 
-            for result in all_cpu_results:
+        # Find which CPU achieved the lowest objective function value.
+        _, best_rank = \
+            comm.allreduce((float(best_objective_function_result),
+                            self.cpu_rank),
+                           op=MPI.MINLOC)
 
-                result_moment_error, result_cdf_error, \
-                    result_correlation_error, result_mean_error = \
-                    self.get_errors(optimal_samples, optimal_probabilities)
-
-                if result_mean_error < best_mean_error:
-                    best_mean_error = result_mean_error
-                    optimal_samples = result['samples']
-                    optimal_probabilities = result['probabilities']
-
-        # Now send optimal results from CPU 0 to all CPUs.
+        # Now send optimal results from that CPU to all CPUs.
         optimal_samples, optimal_probabilities = \
-            comm.broadcast([optimal_samples, optimal_probabilities], root=0)
+            comm.bcast((optimal_samples, optimal_probabilities),
+                       root=best_rank)
 
         return optimal_samples, optimal_probabilities
 
-    def show_parallelization_information(self, num_test_samples):
+    def show_parallelization_information(self, num_test_samples, n_jobs=1):
         """
         Displays whether sequential or parallel optimization is running,
         and shows a warning if the number samples cannot be equally
         distributed among the available number of CPUs.
         -num_test_samples: Total number of test samples to be run.
+        -n_jobs: Number of worker processes used on each CPU.
         """
 
-        if self.number_CPUs == 1:
+        if self.number_CPUs == 1 and n_jobs == 1:
             print("SROM Sequential Optimizer:")
 
+        elif self.number_CPUs == 1:
+            print("SROM Process Pool Optimizer (%s processes):" % n_jobs)
+
         elif self.cpu_rank == 0:
             print("SROM Parallel Optimizer (%s cpus):" % self.number_CPUs)
 
@@ -506,6 +1105,36 @@ class Optimizer:
         return (result_moment_error, result_cdf_error, result_correlation_error,
                 result_mean_error)
 
+    def get_scipy_objective(self, samples, joint_opt):
+        """
+        Returns tuple (objective function, jac) to pass to scipy minimize.
+        Both come from one ObjectiveGradient, so the objective & gradient at
+        the same point share a single set of SROM/target statistics. jac is
+        None if the gradient is not available (non-SSE error).
+        -samples: fixed SROM samples for sequential optimization, None for
+                joint optimization.
+        -joint_opt: bool, Flag for optimizing jointly for samples &
+                probabilities.
+        """
+
+        if self._use_gradient:
+            gradient = self._srom_gradient
+        else:
+            gradient = None
+
+        objective_gradient = ObjectiveGradient(self._srom_objective_function,
+                                               gradient,
+                                               samples,
+                                               self._srom_size,
+                                               self._dim,
+                                               joint_opt,
+                                               self.report)
+
+        if self._use_gradient:
+            return objective_gradient.objective, objective_gradient.gradient
+        else:
+            return objective_gradient.objective, None
+
     def get_hess(self):
         return np.zeros((self._srom_size * self._dim, self._srom_size * self._dim))
 
@@ -549,30 +1178,85 @@ class Optimizer:
                 samples[i] = np.clip(x, bounds[i][0] + 1e-2, bounds[i][1] - 1e-2)
         return samples
 
-    def get_initial_guess(self, joint_opt, qmc_engine=None):
+    def get_initial_guess(self, joint_opt, qmc_engine=None, samples=None):
         """
-        Return initial guess for optimization. Randomly drawn samples w/ equal
-        probability for joint optimization or just equal probabilities for
-        sequential optimization
+        Return initial guess for optimization. Randomly drawn samples (or the
+        given samples) with probabilities equal to the target probability of
+        their Voronoi cells (see get_voronoi_probabilities) for joint
+        optimization, or just those probabilities for sequential
+        optimization.
+        -joint_opt: bool, Flag for joint optimization.
+        -qmc_engine: str, QMC engine for drawing samples of a sample-based
+                target.
+        -samples: np array (srom_size x dim), SROM samples to get the initial
+                probabilities of (e.g. the candidate sample set of a
+                sequential restart). Drawn if None.
         """
 
-        # Randomly draw some samples & stack them with probabilities
-        samples = self._target.draw_random_sample(self._srom_size, qmc_engine)
-        samples = self.check_bounds(samples, self.get_param_bounds(joint_opt))
+        # Draw some samples (a candidate sample set unless a QMC engine for
+        # the sample-based target is given) & stack them with probabilities
+        with self.report.timer("target"):
+            if samples is None:
+                if qmc_engine is None:
+                    samples = self._candidate_generator.draw(rng=self._rng)
+                else:
+                    samples = self._target.draw_random_sample(
+                        self._srom_size, qmc_engine, rng=self._rng)
 
-        probabilities = np.zeros(self._srom_size)
-        for i in range(self._target.num_samples):
-            diffs = self._target.samples[i, :] - samples
-            diff_norms = np.linalg.norm(diffs, axis=1)
-            k = np.argmin(diff_norms)
-            probabilities[k] += 1
+                if joint_opt:
+                    samples = self.check_bounds(
+                        samples, self.get_param_bounds(joint_opt))
 
-        probabilities /= self._target.num_samples
-        assert(np.allclose([np.sum(probabilities)], [1.]))
+            probabilities = self.get_voronoi_probabilities(samples)
+            self.report.num_target_queries += 1
 
         if joint_opt:
-            initial_guess = np.hstack((samples.flatten(), probabilities))
+            initial_guess = np.hstack((np.ravel(samples), probabilities))
         else:
             initial_guess = probabilities
 
         return initial_guess
+
+    def get_voronoi_probabilities(self, samples):
+        """
+        Returns the target probability of each SROM sample's Voronoi cell
+        (the target samples closer to it than to any other SROM sample).
+        -samples: np array (srom_size x dim), SROM samples.
+
+        Sample-based targets assign their samples in blocks of
+        VORONOI_CHUNK_SIZE (without loading them all into memory) with a
+        KD-tree of the SROM samples. Scalar random
+        variables use the exact CDF at the cell boundaries (midpoints between
+        sorted samples). Other (analytic) targets assign
+        NUM_VORONOI_SAMPLES Monte Carlo draws.
+        """
+
+        samples = np.reshape(samples, (self._srom_size, self._dim))
+
+        if isinstance(self._target, RandomVariable):
+            order = np.argsort(samples[:, 0])
+            boundaries = 0.5 * (samples[order[1:], 0] + samples[order[:-1], 0])
+            cdf_values = np.hstack(([0.], self._target.compute_cdf(boundaries),
+                                    [1.]))
+
+            probabilities = np.zeros(self._srom_size)
+            probabilities[order] = np.diff(cdf_values)
+
+            return probabilities
+
+        if hasattr(self._target, "get_sample_blocks"):
+            sample_blocks = self._target.get_sample_blocks(
+                self.VORONOI_CHUNK_SIZE)
+        else:
+            sample_blocks = [np.reshape(
+                self._target.draw_random_sample(self.NUM_VORONOI_SAMPLES,
+                                                rng=self._rng),
+                (self.NUM_VORONOI_SAMPLES, self._dim))]
+
+        tree = cKDTree(samples)
+        counts = np.zeros(self._srom_size)
+        for sample_block in sample_blocks:
+            _, nearest = tree.query(np.asarray(sample_block, dtype=float))
+            counts += np.bincount(nearest, minlength=self._srom_size)
+
+        return counts / np.sum(counts)
@@ -0,0 +1,223 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class defining the SROM objective function for sequential optimization as a
+quadratic function of the SROM probabilities.
+"""
+
+import numpy as np
+from scipy.special import erf
+
+
+class QuadraticObjective(object):
+    """
+    For fixed SROM samples, the SSE objective function is quadratic in the
+    SROM probabilities p, since the SROM CDFs, moments, and correlation
+    matrix are all linear in p:
+
+        f(p) = 0.5 * ||A p - b||^2 = 0.5 * p^T H p - c^T p + f_0
+
+    where the rows of A map p to the (weighted, relative) SROM statistics
+    and b holds the corresponding target values, H = A^T A, c = A^T b, and
+    f_0 = 0.5 * b^T b. This class assembles H, c, and f_0 once for a batch
+    of K candidate sample sets, after which the objective and gradient for
+    all K sets are evaluated with single array operations.
+
+    :param target_statistics: precomputed statistics of the target
+    :type target_statistics: SROMPy TargetStatistics object
+    :param weights: relative weights of the CDF, moment, and correlation
+        error terms (in that order)
+    :type weights: 1d Numpy array (length = 3)
+    :param samples: K candidate SROM sample sets (or a single sample set)
+    :type samples: Numpy array, size - K x (SROM size) x (dim) or (SROM size)
+        x (dim)
+    :param scale: scale for the smooth (erf) CDF approximation. If None, uses
+        the empirical (indicator) CDF.
+    :type scale: float
+    :param cdf_chunk_size: max # of CDF grid pts to evaluate the CDF kernels
+        (of size K x grid pts x SROM size x dim) on at once, to bound memory
+        use for large batches/grids/SROMs. All grid pts are evaluated at once
+        by default.
+    :type cdf_chunk_size: int
+    """
+
+    def __init__(self, target_statistics, weights, samples, scale=None,
+                 cdf_chunk_size=None):
+
+        samples = np.array(samples, dtype=float)
+        if len(samples.shape) == 2:
+            samples = samples.reshape((1,) + samples.shape)
+
+        if samples.shape[2] != target_statistics.dim:
+            raise ValueError("SROM samples must have same dimension as target")
+
+        if cdf_chunk_size is not None:
+            if not isinstance(cdf_chunk_size, int):
+                raise TypeError("cdf_chunk_size must be a positive int.")
+            if cdf_chunk_size <= 0:
+                raise ValueError("cdf_chunk_size must be a positive int.")
+
+        self._target_statistics = target_statistics
+        self._weights = weights
+        self._scale = scale
+        self._samples = samples
+        self._cdf_chunk_size = cdf_chunk_size
+
+        self._hessian = None
+        self._linear_term = None
+        self._constant = None
+
+        self.__assemble()
+
+    @property
+    def samples(self):
+        return self._samples
+
+    @property
+    def hessian(self):
+        return self._hessian
+
+    @property
+    def linear_term(self):
+        return self._linear_term
+
+    @property
+    def constant(self):
+        return self._constant
+
+    def evaluate(self, probabilities):
+        """
+        Evaluates the objective function and its gradient for each of the K
+        sample sets.
+
+        :param probabilities: SROM probabilities for each sample set
+        :type probabilities: 2d Numpy array, size - K x (SROM size)
+
+        Returns tuple of objective values (length K array) & gradients (K x
+        (SROM size) array).
+        """
+
+        probabilities = np.reshape(probabilities, self._linear_term.shape)
+
+        hessian_p = np.einsum('kij,kj->ki', self._hessian, probabilities)
+        gradients = hessian_p - self._linear_term
+
+        objectives = (0.5 * np.einsum('ki,ki->k', probabilities, hessian_p) -
+                      np.einsum('ki,ki->k', probabilities, self._linear_term) +
+                      self._constant)
+
+        return objectives, gradients
+
+    def __assemble(self):
+        """
+        Accumulates H, c, and f_0 over the blocks of rows of A (K x # rows x
+        SROM size) for each error term with nonzero weight, so that A is never
+        formed in full. Errors are relative, so every row's target value is
+        one (scaled by the square root of the weight of its error term), i.e.
+        each block adds weight * rows^T rows to H, weight * rows^T 1 to c, and
+        0.5 * weight * # rows to f_0.
+        """
+
+        (num_sets, size, _) = self._samples.shape
+
+        self._hessian = np.zeros((num_sets, size, size))
+        self._linear_term = np.zeros((num_sets, size))
+        self._constant = 0.0
+
+        for weight, rows in self.__get_row_blocks():
+            self._hessian += weight * np.einsum('kri,krj->kij', rows, rows)
+            self._linear_term += weight * np.sum(rows, axis=1)
+            self._constant += 0.5 * weight * rows.shape[1]
+
+    def __get_row_blocks(self):
+        """
+        Yields (weight, rows) for each block of rows of A: the CDF rows in
+        chunks of at most cdf_chunk_size grid pts, then the moment and
+        correlation rows.
+        """
+
+        if self._weights[0] > 0.0:
+            num_grid_pts = self._target_statistics.get_cdfs()[1].shape[0]
+            chunk_size = self._cdf_chunk_size or max(num_grid_pts, 1)
+
+            for start in range(0, num_grid_pts, chunk_size):
+                yield (self._weights[0],
+                       self.__cdf_rows(slice(start, start + chunk_size)))
+
+        if self._weights[1] > 0.0:
+            yield self._weights[1], self.__moment_rows()
+        if self._weights[2] > 0.0 and self._target_statistics.dim > 1:
+            yield self._weights[2], self.__correlation_rows()
+
+    def __cdf_rows(self, grid_chunk):
+        """
+        Rows mapping probabilities to relative SROM CDF values:
+        F(x) / F_target(x) = sum_k p(k) * kernel(x - x(k)) / F_target(x),
+        for the CDF grid pts in the slice grid_chunk.
+        Returns K x (# grid pts in chunk * dim) x (SROM size) array.
+        """
+
+        target_cdfs, x_grid = self._target_statistics.get_cdfs()
+        target_cdfs = target_cdfs[grid_chunk]
+        x_grid = x_grid[grid_chunk]
+        (num_sets, size, dim) = self._samples.shape
+
+        # (K x # grid pts x SROM size x dim) kernel values.
+        grid = x_grid[np.newaxis, :, np.newaxis, :]
+        samples = self._samples[:, np.newaxis, :, :]
+        if self._scale is None:
+            kernel = (grid >= samples).astype(float)
+        else:
+            kernel = 0.5 * (1.0 + erf((grid - samples) /
+                                      (np.sqrt(2) * self._scale)))
+
+        kernel /= target_cdfs[np.newaxis, :, np.newaxis, :]
+
+        return kernel.transpose((0, 1, 3, 2)).reshape((num_sets, -1, size))
+
+    def __moment_rows(self):
+        """
+        Rows mapping probabilities to relative SROM moments:
+        mu_q / mu_q_target = sum_k p(k) * x(k)^q / mu_q_target.
+        Returns K x (max_moment * dim) x (SROM size) array.
+        """
+
+        target_moments = self._target_statistics.get_moments()
+        (num_sets, size, dim) = self._samples.shape
+        max_moment = target_moments.shape[0]
+
+        orders = np.arange(1, max_moment + 1).reshape((1, max_moment, 1, 1))
+        powers = self._samples[:, np.newaxis, :, :] ** orders
+        powers /= target_moments[np.newaxis, :, np.newaxis, :]
+
+        return powers.transpose((0, 1, 3, 2)).reshape((num_sets, -1, size))
+
+    def __correlation_rows(self):
+        """
+        Rows mapping probabilities to relative SROM correlation entries:
+        C_ij / C_ij_target = sum_k p(k) * x_i(k) * x_j(k) / C_ij_target.
+        Returns K x (dim * dim) x (SROM size) array.
+        """
+
+        target_corr = self._target_statistics.get_correlation()
+        (num_sets, size, dim) = self._samples.shape
+
+        products = (self._samples[:, :, :, np.newaxis] *
+                    self._samples[:, :, np.newaxis, :])
+        products /= target_corr[np.newaxis, np.newaxis, :, :]
+
+        return products.transpose((0, 2, 3, 1)).reshape((num_sets, -1, size))
@@ -0,0 +1,172 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Class for adaptively deciding when to stop the optimization restarts.
+"""
+
+import time
+
+import numpy as np
+
+
+class RestartController(object):
+    """
+    Decides when the multi-start loop of the Optimizer can stop before
+    running all num_test_samples restarts (random sample sets or initial
+    guesses) because the best objective is "good enough" or has stopped
+    improving. The restart count passed to the Optimizer is then the maximum
+    budget. Criteria that are None are not used; the loop stops once any
+    used criterion is met, but never before min_restarts restarts:
+
+    target_objective - the best objective function value found is at or
+        below this threshold.
+    patience - this many consecutive restarts didn't improve the best
+        objective by more than relative_tolerance.
+    max_time - the restarts have run for this many seconds (wall clock). The
+        restart running when the budget runs out is completed.
+    confidence - statistical stopping: the estimated probability that another
+        restart improves the best objective by more than relative_tolerance
+        is below 1 - confidence. The probability is estimated from the
+        restart results so far with Laplace's rule of succession, i.e.,
+        (# significant improvements + 1) / (# restarts + 1) counting
+        improvements after the first restart.
+
+    Each CPU (MPI rank) and process pool worker applies the criteria to its
+    own restarts.
+
+    inputs:
+        -target_objective: float, objective threshold to stop at.
+        -patience: int, # restarts without improvement to stop after.
+        -max_time: float, wall clock budget (seconds) for the restarts.
+        -confidence: float in (0, 1), confidence required for statistical
+            stopping.
+        -relative_tolerance: float, relative decrease of the best objective
+            that counts as an improvement.
+        -min_restarts: int, minimum # restarts to run.
+    """
+
+    def __init__(self, target_objective=None, patience=None, max_time=None,
+                 confidence=None, relative_tolerance=1e-3, min_restarts=1):
+
+        if patience is not None and \
+                (not isinstance(patience, int) or patience <= 0):
+            raise ValueError("patience must be a positive int.")
+
+        if max_time is not None and max_time <= 0:
+            raise ValueError("max_time must be positive.")
+
+        if confidence is not None and not 0. < confidence < 1.:
+            raise ValueError("confidence must be between 0 and 1.")
+
+        if relative_tolerance < 0:
+            raise ValueError("relative_tolerance must be non-negative.")
+
+        if not isinstance(min_restarts, int) or min_restarts <= 0:
+            raise ValueError("min_restarts must be a positive int.")
+
+        self._target_objective = target_objective
+        self._patience = patience
+        self._max_time = max_time
+        self._confidence = confidence
+        self._relative_tolerance = relative_tolerance
+        self._min_restarts = min_restarts
+
+        self.start()
+
+    @property
+    def num_restarts(self):
+        return self._num_restarts
+
+    @property
+    def best_objective(self):
+        return self._best_objective
+
+    @property
+    def stop_reason(self):
+        """
+        Criterion that stopped the restarts ('target_objective', 'patience',
+        'max_time' or 'confidence'), or None if they should continue.
+        """
+
+        return self._stop_reason
+
+    @property
+    def improvement_probability(self):
+        """
+        Estimated probability that the next restart improves the best
+        objective by more than relative_tolerance.
+        """
+
+        return (self._num_improvements + 1.) / (self._num_restarts + 1.)
+
+    def start(self):
+        """
+        Resets the controller & starts the clock for a new set of restarts.
+        """
+
+        self._start_time = time.perf_counter()
+        self._num_restarts = 0
+        self._num_improvements = 0
+        self._num_without_improvement = 0
+        self._best_objective = np.inf
+        self._stop_reason = None
+
+    def update(self, objective):
+        """
+        Records the objective function value of a finished restart. Returns
+        True if the restarts should stop.
+        """
+
+        if self._num_restarts > 0 and objective < self._best_objective - \
+                self._relative_tolerance * abs(self._best_objective):
+            self._num_improvements += 1
+            self._num_without_improvement = 0
+        elif self._num_restarts > 0:
+            self._num_without_improvement += 1
+
+        self._best_objective = min(self._best_objective, objective)
+        self._num_restarts += 1
+
+        if self._stop_reason is None:
+            self._stop_reason = self.__check_criteria()
+
+        return self._stop_reason is not None
+
+    def __check_criteria(self):
+        """
+        Returns the name of the first stopping criterion met, or None.
+        """
+
+        if self._num_restarts < self._min_restarts:
+            return None
+
+        if self._target_objective is not None and \
+                self._best_objective <= self._target_objective:
+            return "target_objective"
+
+        if self._patience is not None and \
+                self._num_without_improvement >= self._patience:
+            return "patience"
+
+        if self._max_time is not None and \
+                time.perf_counter() - self._start_time >= self._max_time:
+            return "max_time"
+
+        if self._confidence is not None and \
+                self.improvement_probability < 1. - self._confidence:
+            return "confidence"
+
+        return None
@@ -0,0 +1,116 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for sharing the SROM statistics compared during optimization between
+the objective function and its gradient.
+"""
+
+import contextlib
+
+
+class SROMStatistics(object):
+    """
+    Lazily computes and caches the SROM statistics (CDFs on the error grid,
+    moments, correlation matrix) that the objective function and gradient
+    compare for the SROM's current samples/probabilities, alongside the
+    corresponding precomputed target statistics. Sharing one instance
+    between the objective and gradient evaluated at the same parameters
+    means each SROM statistic is only computed once.
+
+    Must be discarded when the SROM parameters change.
+
+    :param srom: SROM whose parameters have already been set
+    :type srom: SROMPy SROM object
+    :param target_statistics: precomputed statistics of the target random
+        quantity being modeled by the SROM
+    :type target_statistics: SROMPy TargetStatistics object
+    :param report: optional report to time the SROM statistics computations
+        in (as the 'statistics' phase).
+    :type report: SROMPy OptimizationReport object
+    """
+
+    def __init__(self, srom, target_statistics, report=None):
+
+        self._srom = srom
+        self._target_statistics = target_statistics
+        self._report = report
+
+        self._cdfs = None
+        self._moments = None
+        self._correlations = None
+
+    def get_cdfs(self):
+        """
+        Returns tuple (srom_cdfs, target_cdfs, x_grid) restricted to the grid
+        points where the target CDF is nonzero (to prevent divide by zero in
+        relative errors). Arrays have size (# nonzero pts x dim).
+        """
+
+        if self._cdfs is None:
+
+            target_cdfs, x_grid = self._target_statistics.get_cdfs()
+            with self._timer():
+                srom_cdfs = self._srom.compute_cdf(x_grid)
+
+            self._cdfs = (srom_cdfs, target_cdfs, x_grid)
+
+        return self._cdfs
+
+    def get_moments(self):
+        """
+        Returns tuple (srom_moments, target_moments), each of size
+        (max_moment x dim). Zero target moments are replaced by one to prevent
+        divide by zero in relative errors.
+        """
+
+        if self._moments is None:
+
+            target_moments = self._target_statistics.get_moments()
+            with self._timer():
+                srom_moments = self._srom.compute_moments(
+                    self._target_statistics.max_moment)
+
+            self._moments = (srom_moments, target_moments)
+
+        return self._moments
+
+    def get_correlations(self):
+        """
+        Returns tuple (srom_corr, target_corr) of (dim x dim) correlation
+        matrices.
+        """
+
+        if self._correlations is None:
+
+            with self._timer():
+                srom_correlation = self._srom.compute_corr_mat()
+
+            self._correlations = (srom_correlation,
+                                  self._target_statistics.get_correlation())
+
+        return self._correlations
+
+    def _timer(self):
+        """
+        Returns context manager timing its body as the statistics phase of the
+        report (if any).
+        """
+
+        if self._report is None:
+            return contextlib.nullcontext()
+
+        return self._report.timer("statistics")
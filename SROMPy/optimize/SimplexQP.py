@@ -0,0 +1,278 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for solving quadratic programs over the probability simplex, i.e., the
+sequential SROM optimization problem for the probabilities.
+"""
+
+import numpy as np
+
+
+class SimplexQP(object):
+    """
+    Static methods for solving batches of quadratic programs of the form
+
+        min_p  0.5 * p^T H p - c^T p   s.t.  p >= 0,  sum(p) = 1
+
+    which is the SSE SROM optimization problem for the probabilities when
+    the SROM samples are fixed (see QuadraticObjective). Batches have
+    hessians of size (K x m x m) and linear terms of size (K x m).
+    """
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def project(vectors):
+        """
+        Returns the Euclidean projections of each row of vectors (K x m)
+        onto the probability simplex {p : p >= 0, sum(p) = 1}. Uses the
+        sort-based algorithm of Duchi et al. (2008).
+        """
+
+        vectors = np.atleast_2d(vectors)
+        (num_sets, size) = vectors.shape
+
+        sorted_vectors = -np.sort(-vectors, axis=1)
+        cumulative_sums = np.cumsum(sorted_vectors, axis=1) - 1.0
+        indices = np.arange(1, size + 1)
+
+        # Number of entries that remain positive after the projection.
+        num_positive = np.sum(sorted_vectors - cumulative_sums / indices > 0,
+                              axis=1)
+        thresholds = (cumulative_sums[np.arange(num_sets), num_positive - 1] /
+                      num_positive)
+
+        return np.maximum(vectors - thresholds[:, np.newaxis], 0.0)
+
+    @staticmethod
+    def solve_projected_gradient(hessian, linear_term, initial_guess=None,
+                                 max_iterations=1000, tolerance=1e-8):
+        """
+        Solves a batch of simplex-constrained QPs simultaneously with an
+        accelerated (FISTA) projected gradient method with adaptive momentum
+        restarts. Each iteration advances all K problems with single array
+        operations.
+
+        inputs:
+            -hessian - (K x m x m) array of (symmetric positive semidefinite)
+                hessians H
+            -linear_term - (K x m) array of linear terms c
+            -initial_guess - (K x m) array of starting probabilities. Equal
+                probabilities are used if not provided.
+            -max_iterations - int, max. # of iterations
+            -tolerance - float, stop once no probability changes by more than
+                this between iterations (for every problem in the batch)
+
+        returns (K x m) array of optimal probabilities
+        """
+
+        hessian = np.asarray(hessian)
+        if hessian.ndim == 2:
+            hessian = hessian[np.newaxis]
+        linear_term = np.atleast_2d(linear_term)
+        (num_sets, size) = linear_term.shape
+
+        if initial_guess is None:
+            probabilities = np.ones((num_sets, size)) / size
+        else:
+            probabilities = SimplexQP.project(initial_guess)
+
+        # Step size from the Lipschitz constant of the gradient.
+        lipschitz = np.linalg.eigvalsh(hessian)[:, -1]
+        step = 1.0 / np.maximum(lipschitz, 1e-12)
+
+        extrapolated = probabilities
+        momentum = np.ones(num_sets)
+
+        for _ in range(max_iterations):
+
+            gradients = np.einsum('kij,kj->ki', hessian, extrapolated) - \
+                linear_term
+            new_probabilities = \
+                SimplexQP.project(extrapolated - step[:, np.newaxis] * gradients)
+
+            steps = new_probabilities - probabilities
+            new_momentum = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum ** 2))
+            extrapolated = new_probabilities + \
+                ((momentum - 1.0) / new_momentum)[:, np.newaxis] * steps
+
+            # Restart momentum for problems where it points uphill.
+            restart = np.sum(gradients * steps, axis=1) > 0
+            new_momentum[restart] = 1.0
+            extrapolated[restart] = new_probabilities[restart]
+
+            probabilities = new_probabilities
+            momentum = new_momentum
+
+            if np.max(np.abs(steps)) < tolerance:
+                break
+
+        return probabilities
+
+    @staticmethod
+    def solve_active_set(hessian, linear_term, max_iterations=None,
+                         tolerance=1e-10):
+        """
+        Solves each simplex-constrained QP in a batch with a primal
+        active-set method (Lawson-Hanson style). Starting from the best
+        vertex of the simplex, probabilities are freed one at a time (the one
+        with the most negative KKT multiplier) and the equality-constrained
+        QP over the free probabilities is solved directly, stepping back to
+        the boundary whenever a free probability would become negative. The
+        optimum is found exactly (to round-off) in a number of iterations
+        that scales with the number of nonzero probabilities.
+
+        inputs:
+            -hessian - (K x m x m) or (m x m) array of (symmetric positive
+                semidefinite) hessians H
+            -linear_term - (K x m) or (m) array of linear terms c
+            -max_iterations - int, max. # of KKT solves per problem. Defaults
+                to 10 * m.
+            -tolerance - float, relative tolerance on the KKT multipliers
+
+        returns (K x m) array of optimal probabilities
+        """
+
+        hessian = np.asarray(hessian, dtype=float)
+        if hessian.ndim == 2:
+            hessian = hessian[np.newaxis]
+        linear_term = np.atleast_2d(linear_term)
+        (num_sets, size) = linear_term.shape
+
+        if max_iterations is None:
+            max_iterations = 10 * size
+
+        probabilities = np.zeros((num_sets, size))
+        for k in range(num_sets):
+            probabilities[k] = \
+                SimplexQP.__solve_single_active_set(hessian[k],
+                                                    linear_term[k],
+                                                    max_iterations,
+                                                    tolerance)
+
+        return probabilities
+
+    @staticmethod
+    def __solve_single_active_set(hessian, linear_term, max_iterations,
+                                  tolerance):
+        """
+        Active-set solve of a single simplex-constrained QP, see
+        solve_active_set.
+        """
+
+        size = linear_term.size
+
+        # Start at the vertex of the simplex with the lowest objective.
+        vertex = np.argmin(0.5 * np.diag(hessian) - linear_term)
+        probabilities = np.zeros(size)
+        probabilities[vertex] = 1.0
+        free = np.zeros(size, dtype=bool)
+        free[vertex] = True
+
+        # Probabilities that round-off kept from entering at the current
+        # point (as in the original Lawson-Hanson NNLS algorithm).
+        rejected = np.zeros(size, dtype=bool)
+
+        num_iterations = 0
+        while num_iterations < max_iterations:
+
+            # KKT check: fixed probabilities with negative multipliers can
+            # still decrease the objective.
+            gradient = hessian.dot(probabilities) - linear_term
+            equality_multiplier = np.mean(gradient[free])
+            multipliers = gradient - equality_multiplier
+            multipliers[free | rejected] = np.inf
+            entering = np.argmin(multipliers)
+
+            if multipliers[entering] >= \
+                    -tolerance * max(1.0, abs(equality_multiplier)):
+                break
+
+            free[entering] = True
+            num_iterations += 1
+            candidate = SimplexQP.__solve_free_subproblem(hessian,
+                                                          linear_term, free)
+
+            if candidate[entering] <= 0.0:
+                free[entering] = False
+                rejected[entering] = True
+                continue
+
+            rejected[:] = False
+
+            # Step back to the boundary (fixing blocking probabilities at
+            # zero) while the minimizer over the free probabilities leaves
+            # the simplex.
+            blocking = free & (candidate <= 0.0)
+            while np.any(blocking) and num_iterations < max_iterations:
+
+                ratios = probabilities[blocking] / \
+                    (probabilities[blocking] - candidate[blocking])
+                step = np.min(ratios)
+                probabilities = probabilities + \
+                    step * (candidate - probabilities)
+
+                leaving = free & (probabilities <= 0.0)
+                leaving[np.flatnonzero(blocking)[np.argmin(ratios)]] = True
+                probabilities[leaving] = 0.0
+                free &= ~leaving
+
+                num_iterations += 1
+                candidate = SimplexQP.__solve_free_subproblem(hessian,
+                                                              linear_term,
+                                                              free)
+                blocking = free & (candidate <= 0.0)
+
+            if not np.any(blocking):
+                probabilities = candidate
+
+        return probabilities / np.sum(probabilities)
+
+    @staticmethod
+    def __solve_free_subproblem(hessian, linear_term, free):
+        """
+        Solves the equality-constrained QP over the free probabilities (the
+        fixed ones are held at zero) through its KKT system.
+        """
+
+        free_indices = np.flatnonzero(free)
+        num_free = free_indices.size
+
+        kkt_matrix = np.zeros((num_free + 1, num_free + 1))
+        kkt_matrix[:num_free, :num_free] = \
+            hessian[np.ix_(free_indices, free_indices)]
+        kkt_matrix[:num_free, num_free] = -1.0
+        kkt_matrix[num_free, :num_free] = 1.0
+
+        rhs = np.append(linear_term[free_indices], 1.0)
+
+        # Fall back to a (slower) least squares solve if the KKT matrix is
+        # singular.
+        try:
+            solution = np.linalg.solve(kkt_matrix, rhs)
+            singular = not np.allclose(kkt_matrix.dot(solution), rhs)
+        except np.linalg.LinAlgError:
+            singular = True
+
+        if singular:
+            solution = np.linalg.lstsq(kkt_matrix, rhs, rcond=None)[0]
+
+        probabilities = np.zeros(linear_term.size)
+        probabilities[free_indices] = solution[:num_free]
+
+        return probabilities
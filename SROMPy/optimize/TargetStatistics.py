@@ -0,0 +1,141 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for precomputing the target statistics compared during optimization.
+"""
+
+import numpy as np
+
+
+class TargetStatistics(object):
+    """
+    Precomputes the target statistics that the SROM objective function and
+    gradient compare against: the target CDF on the error grid (and the grid
+    points where it is nonzero), the target moments with the zero guard
+    applied, and the target correlation matrix. These never change during
+    optimization, so they are computed once, frozen (read-only arrays), and
+    shared between the objective function and gradient.
+
+    Counts the target queries served from the cache (each of which would
+    have been a call to the target's compute_cdf/compute_moments/
+    compute_correlation_matrix without it) in queries_avoided.
+
+    :param target: target random quantity being modeled by the SROM
+    :type target: SROMPy target object
+    :param x_grid: grid of points to compare CDFs on, size (# pts x dim)
+    :type x_grid: 2d Numpy array
+    :param max_moment: max. order of moments being compared
+    :type max_moment: int
+    """
+
+    def __init__(self, target, x_grid, max_moment):
+
+        self._dim = target.dim
+        self._max_moment = max_moment
+        self.queries_avoided = {'cdf': 0, 'moments': 0, 'correlation': 0}
+
+        self._compute_cdfs(target, x_grid)
+        self._compute_moments(target)
+        self._compute_correlation(target)
+
+    @property
+    def dim(self):
+        return self._dim
+
+    @property
+    def max_moment(self):
+        return self._max_moment
+
+    @property
+    def x_grid(self):
+        return self._x_grid
+
+    @property
+    def num_queries_avoided(self):
+        return sum(self.queries_avoided.values())
+
+    def get_cdfs(self):
+        """
+        Returns tuple (target_cdfs, x_grid) restricted to the grid points
+        where the target CDF is nonzero (to prevent divide by zero in relative
+        errors). Arrays have size (# nonzero pts x dim).
+        """
+
+        self.queries_avoided['cdf'] += 1
+        return self._nonzero_cdfs, self._nonzero_x_grid
+
+    def get_moments(self):
+        """
+        Returns (max_moment x dim) array of target moments. Zero moments are
+        replaced by one to prevent divide by zero in relative errors.
+        """
+
+        self.queries_avoided['moments'] += 1
+        return self._moments
+
+    def get_correlation(self):
+        """
+        Returns (dim x dim) target correlation matrix (None for scalar
+        targets, where correlation is neglected).
+        """
+
+        self.queries_avoided['correlation'] += 1
+        return self._correlation
+
+    def _compute_cdfs(self, target, x_grid):
+
+        # Copy since targets may clip grid values to their range in place.
+        self._x_grid = np.array(x_grid, dtype=float)
+        target_cdfs = target.compute_cdf(np.array(self._x_grid))
+
+        # Check for 0 cdf values to prevent divide by zero.
+        nonzero_indices = np.where(target_cdfs[:, 0] > 0)[0]
+
+        self._nonzero_cdfs = self._freeze(target_cdfs[nonzero_indices, :])
+        self._nonzero_x_grid = self._freeze(self._x_grid[nonzero_indices, :])
+        self._freeze(self._x_grid)
+
+    def _compute_moments(self, target):
+
+        moments = np.array(target.compute_moments(self._max_moment),
+                           dtype=float)
+
+        # Reshape to 2D if returned as 1D for scalar RV.
+        if len(moments.shape) == 1:
+            moments = moments.reshape((self._max_moment, 1))
+
+        # Prevent divide by zero.
+        zero_indices = np.where(np.abs(moments) <= 1e-12)[0]
+        moments[zero_indices] = 1.0
+
+        self._moments = self._freeze(moments)
+
+    def _compute_correlation(self, target):
+
+        # Neglect for 1D random variable.
+        if self._dim == 1:
+            self._correlation = None
+        else:
+            correlation = np.array(target.compute_correlation_matrix(),
+                                   dtype=float)
+            self._correlation = self._freeze(correlation)
+
+    @staticmethod
+    def _freeze(array):
+
+        array.flags.writeable = False
+        return array
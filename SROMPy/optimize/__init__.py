@@ -14,7 +14,15 @@
 # under the License.
 
 name = "optimize"
+from .TargetStatistics import TargetStatistics
+from .SROMStatistics import SROMStatistics
 from .ObjectiveFunction import ObjectiveFunction
 from .Gradient import Gradient
+from .OptimizationReport import OptimizationReport
+from .RestartController import RestartController
+from .CandidateGenerator import CandidateGenerator
+from .ObjectiveGradient import ObjectiveGradient
+from .QuadraticObjective import QuadraticObjective
+from .SimplexQP import SimplexQP
 from .Optimizer import Optimizer
 
@@ -59,6 +59,14 @@ class SROM(object):
         self.probabilities = None
         self._scale = None  # smooth CDF approximation
 
+        # Best (objective function value, samples, probabilities) restarts of
+        # the last optimization, used to warm start reoptimize.
+        self.best_restarts = []
+
+        # OptimizationReport (counters, timers, per-restart results) of the
+        # last optimize/reoptimize call.
+        self.optimization_report = None
+
     @property
     def size(self):
         return self._size
@@ -67,6 +75,10 @@ class SROM(object):
     def dim(self):
         return self._dim
 
+    @property
+    def scale(self):
+        return self._scale
+
     def set_params(self, samples, probabilities):
         """
         Set defining SROM parameters - samples & corresponding probabilities.
@@ -149,16 +161,13 @@ class SROM(object):
             raise ValueError("Must initialize SROM before computing moments")
 
         max_order = int(max_order)
-        moments = np.zeros((max_order, self._dim))
+        probabilities = self.probabilities.reshape(self._size)
 
-        for q in range(max_order):
-
-            # moment_q = sum_{k=1}^m p(k) * x(k)^q.
-            moment_q = np.zeros((1, self._dim))
-            for k, sample in enumerate(self.samples):
-                moment_q = moment_q + self.probabilities[k] * pow(sample, q + 1)
-
-            moments[q, :] = moment_q
+        # moment_q = sum_{k=1}^m p(k) * x(k)^q, for all q at once using a
+        # (max_order x m x d) table of sample powers.
+        orders = np.arange(1, max_order + 1).reshape((max_order, 1, 1))
+        powers = self.samples[np.newaxis, :, :] ** orders
+        moments = np.einsum('k,qkd->qd', probabilities, powers)
 
         return moments
 
@@ -209,32 +218,35 @@ class SROM(object):
 
     def _compute_cdf_empirical(self, num_pts, x_grid):
 
-        cdf_values = np.zeros((num_pts, self._dim))
+        probabilities = self.probabilities.reshape(self._size)
 
-        # Vectorized indicator implementation for CDF.
-        # CDF(x) = sum_{k=1}^m  1( sample^(k) < x) prob^(k).
-        for i, grid in enumerate(x_grid.T):
-            for k, sample in enumerate(self.samples):
+        # CDF(x) = sum_{k=1}^m  1( sample^(k) <= x) prob^(k).
+        # Sort the samples in each dimension & accumulate their probabilities,
+        # then the CDF at each grid pt is the cumulative probability of the
+        # samples up to its (searchsorted) position in the sorted samples.
+        order = np.argsort(self.samples, axis=0)
+        sorted_samples = np.take_along_axis(self.samples, order, axis=0)
+        cumulative_probabilities = np.zeros((self._size + 1, self._dim))
+        np.cumsum(probabilities[order], axis=0,
+                  out=cumulative_probabilities[1:])
 
-                indices = grid >= sample[i]
-                cdf_values[indices, i] += self.probabilities[k]
+        cdf_values = np.zeros((num_pts, self._dim))
+        for i in range(self._dim):
+            num_below = np.searchsorted(sorted_samples[:, i], x_grid[:, i],
+                                        side='right')
+            cdf_values[:, i] = cumulative_probabilities[num_below, i]
 
         return cdf_values
 
-    def _compute_cdf_erf(self, x, d, sigma):
-
-        cdf_value = 0.0
-        for k in range(self._size):
-            cdf_value += 0.5 * self.probabilities[k]*(1.0 + erf((x - self.samples[k, d]) / (np.sqrt(2) * sigma)))
-
-        return cdf_value
-
     def _compute_cdf_smooth(self, num_pts, x_grid, sigma):
 
-        cdf_values = np.zeros((num_pts, self._dim))
+        probabilities = self.probabilities.reshape(self._size)
 
-        for i, grid in enumerate(x_grid.T):
-            cdf_values[:, i] = self._compute_cdf_erf(grid, i, sigma=sigma)
+        # Sum of erf kernels centered on each SROM sample, evaluated over all
+        # grid pts & dimensions at once.
+        kernels = erf((x_grid[:, np.newaxis, :] -
+                       self.samples[np.newaxis, :, :]) / (np.sqrt(2) * sigma))
+        cdf_values = 0.5 * np.einsum('k,gkd->gd', probabilities, 1.0 + kernels)
 
         return cdf_values
 
@@ -249,10 +261,8 @@ class SROM(object):
         if self.samples is None or self.probabilities is None:
             raise ValueError("Must initialize SROM before computing moments")
 
-        corr = np.zeros((self._dim, self._dim))
-
-        for k, sample in enumerate(self.samples):
-            corr = corr + np.outer(sample, sample) * self.probabilities[k]
+        probabilities = self.probabilities.reshape((self._size, 1))
+        corr = np.dot(self.samples.T, probabilities * self.samples)
 
         return corr
 
@@ -268,7 +278,13 @@ class SROM(object):
                  joint_opt=False,
                  opt_output_interval=10,
                  verbose=True,
-                 scale=None):
+                 scale=None,
+                 n_jobs=1,
+                 batch_size=None,
+                 num_kept_restarts=5,
+                 callback=None,
+                 restart_controller=None,
+                 candidates=None):
         """
         Optimize for the SROM samples & probabilities to best match the
         target random vector statistics. The main functionality provided
@@ -298,7 +314,9 @@ class SROM(object):
         :type tolerance: float
         :param options: scipy optimization algorithm options (TODO)
         :type options: dict
-        :param method: method used for scipy optimization  (TODO)
+        :param method: method used for scipy optimization, or 'qp' to solve
+            each sequential probability subproblem directly as a quadratic
+            program over the probability simplex (SSE error only)
         :type method: string
         :param joint_opt: Flag to optimize jointly for samples & probabilities.
         :type joint_opt: bool
@@ -308,8 +326,34 @@ class SROM(object):
         :type verbose: bool
         :param scale: the scale for the smooth CDF approximation
         :type scale: float
-
-        Returns: None. Sets samples/probabilities member variables.
+        :param n_jobs: number of worker processes to split the optimization
+            restarts across (-1 uses all available CPU cores). Works with or
+            without MPI.
+        :type n_jobs: int
+        :param batch_size: if given, sequential optimization optimizes the
+            probabilities of this many sample sets at once in a single
+            batched array pass rather than one scipy call per sample set
+            (SSE error only).
+        :type batch_size: int
+        :param num_kept_restarts: number of best restarts to keep in
+            best_restarts for warm starting reoptimize.
+        :type num_kept_restarts: int
+        :param callback: function called after each restart with a
+            dictionary describing it (objective, success, num_iterations,
+            time, best_objective, ...).
+        :type callback: callable
+        :param restart_controller: stops the restarts early once the
+            objective is good enough or stops improving, making
+            num_test_samples the max. # restarts.
+        :type restart_controller: SROMPy RestartController object
+        :param candidates: how candidate sample sets are generated: 'random'
+            draws (default), quasi-random 'sobol' or 'halton' points, Latin
+            hypercube 'lhs' points, or 'kmeans'/'kmedoids' clusters of
+            target samples (see CandidateGenerator).
+        :type candidates: string or SROMPy CandidateGenerator object
+
+        Returns: None. Sets samples/probabilities member variables and the
+        OptimizationReport of the run in optimization_report.
 
         Assumes the targetRV object has been properly initialized beforehand.
         The optimization for SROM samples & probabilities is currently
@@ -344,9 +388,131 @@ class SROM(object):
                                                           method,
                                                           joint_opt,
                                                           opt_output_interval,
-                                                          verbose)
+                                                          verbose,
+                                                          n_jobs=n_jobs,
+                                                          batch_size=batch_size,
+                                                          num_kept_restarts=
+                                                          num_kept_restarts,
+                                                          callback=callback,
+                                                          restart_controller=
+                                                          restart_controller,
+                                                          candidates=candidates)
+
+        self.set_params(samples, probabilities)
+        self.best_restarts = opt.best_restarts
+        self.optimization_report = opt.report
+
+    def reoptimize(self, target_random_variable,
+                   weights=None,
+                   num_starts=1,
+                   error='SSE',
+                   max_moment=5,
+                   cdf_grid_pts=100,
+                   tolerance=None,
+                   options=None,
+                   method=None,
+                   joint_opt=False,
+                   verbose=True,
+                   scale=None,
+                   callback=None):
+        """
+        Re-optimize the SROM for a (slightly) changed target random vector,
+        e.g. after adding a new batch of samples or tweaking a distribution
+        parameter. Rather than searching from num_test_samples random
+        restarts like optimize, the optimization is warm started from the
+        current SROM samples & probabilities (and optionally the best
+        restarts kept from the previous optimization) and only locally
+        refined.
+
+        :param target_random_variable: the (updated) target random quantity
+            (variable/vector) being modeled by the SROM.
+        :type target_random_variable: SROMPy target object
+            (AnalyticRandomVector, SampleRandomVector, or random variable class)
+        :param weights: relative weights specifying importance of matching
+            CDFs, moments, and correlation of the target during optimization.
+            Default is equal weights [1,1,1].
+        :type weights: 1d Numpy array (length = 3)
+        :param num_starts: number of starting points to refine - the current
+            SROM parameters followed by the num_starts - 1 best restarts in
+            best_restarts.
+        :type num_starts: int
+        :param error: Type of error metric to use in objective ("SSE", "MAX",
+            "MEAN").
+        :type error: string
+        :param max_moment: Max. number of target moments to consider matching
+        :type max_moment: int
+        :param cdf_grid_pts: Number of points to evaluate CDF error on
+        :type cdf_grid_pts: int
+        :param tolerance: tolerance for scipy optimization algorithm
+        :type tolerance: float
+        :param options: scipy optimization algorithm options, e.g.
+            {'maxiter': 20} to bound the refinement time
+        :type options: dict
+        :param method: method used for scipy optimization, or 'qp' to re-solve
+            the probabilities of the current samples exactly (SSE error only)
+        :type method: string
+        :param joint_opt: Flag to refine samples & probabilities jointly,
+            rather than only the probabilities of the current samples.
+        :type joint_opt: bool
+        :param verbose: flag indicating to print optimization status to stdout
+        :type verbose: bool
+        :param scale: the scale for the smooth CDF approximation
+        :type scale: float
+        :param callback: function called after each refined starting point
+            with a dictionary describing it (see optimize).
+        :type callback: callable
+
+        Returns: None. Sets samples/probabilities member variables and the
+        OptimizationReport of the run in optimization_report.
+        """
+
+        if not isinstance(target_random_variable, RandomEntity):
+            raise TypeError("target_random_variable must inherit from "
+                            "RandomEntity.")
+
+        if self.samples is None or self.probabilities is None:
+            raise ValueError("Must optimize or set SROM parameters before "
+                             "reoptimizing")
+
+        if not isinstance(num_starts, int):
+            raise TypeError("num_starts must be a positive int.")
+
+        if num_starts <= 0:
+            raise ValueError("num_starts must be a positive int.")
+
+        # Current parameters first, then kept restarts (skipping the one the
+        # current parameters came from).
+        initial_params = [(self.samples, self.probabilities)]
+        for _, samples, probabilities in self.best_restarts:
+
+            if len(initial_params) == num_starts:
+                break
+
+            if not (np.array_equal(samples, self.samples) and
+                    np.allclose(probabilities, self.probabilities.flatten())):
+                initial_params.append((samples, probabilities))
+
+        self._scale = scale
+        opt = Optimizer(target_random_variable,
+                        self,
+                        weights,
+                        error,
+                        max_moment,
+                        cdf_grid_pts,
+                        joint_opt=joint_opt,
+                        scale=scale)
+
+        (samples, probabilities) = opt.refine_params(initial_params,
+                                                     tolerance,
+                                                     options,
+                                                     method,
+                                                     joint_opt,
+                                                     verbose,
+                                                     callback)
 
         self.set_params(samples, probabilities)
+        self.best_restarts = opt.best_restarts
+        self.optimization_report = opt.report
 
     def save_params(self, outfile="srom_params.txt", delimiter=' '):
         """
@@ -18,6 +18,7 @@ Define SROM-based output surrogate class
 """
 
 import numpy as np
+from scipy.spatial import cKDTree
 
 from .SROM import SROM
 
@@ -124,6 +125,10 @@ class SROMSurrogate:
         self._output_srom = SROM(size, dim)
         self._output_srom.set_params(output_samples, input_srom.probabilities)
 
+        # Spatial index over the input SROM samples for finding the Voronoi
+        # cell (closest SROM sample) of each input sample.
+        self._input_samples_tree = cKDTree(input_srom.samples)
+
     # Do these change for linear surrogate?
     def compute_moments(self, max_order):
         """
@@ -213,25 +218,116 @@ class SROMSurrogate:
 
         return surrogate_samples
 
-    def _sample_piecewise_constant_surrogate(self, input_samples):
+    def sample_stream(self, input_samples, chunk_size=100000, output=None):
         """
-        Evaluate standard piecewise constant output surrogate model
+        Generates output samples from the SROM surrogate block by block, so
+        that very large numbers of input samples can be propagated in constant
+        memory (out-of-core Monte Carlo).
+
+        :param input_samples: samples of inputs to draw output samples for.
+            Either a 2d Numpy array (e.g., a memory-mapped array from
+            np.load(..., mmap_mode='r')), the name of a .npy file (which is
+            memory-mapped), or any iterable of 2d Numpy array blocks of input
+            samples.
+        :type input_samples: 2d Numpy array, string, or iterable
+        :param chunk_size: max number of input samples to process at once.
+            Larger blocks from an iterable are split.
+        :type chunk_size: int
+        :param output: optional preallocated array (e.g., np.memmap or
+            np.lib.format.open_memmap) of size (N x do) that the output
+            samples are written into, in order.
+        :type output: 2d Numpy array
+
+        Returns: generator yielding 2d Numpy arrays of output samples for each
+        block of input samples (views into output, if provided). The output
+        samples are computed (and written to output) as the generator is
+        consumed.
+        """
+
+        if not isinstance(chunk_size, int):
+            raise TypeError("chunk_size must be a positive int.")
+
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive int.")
+
+        if output is not None:
+            if len(output.shape) != 2 or output.shape[1] != self._dim:
+                raise ValueError("output must have size (# samples x output "
+                                 "dim).")
+
+        if isinstance(input_samples, str):
+            input_samples = np.load(input_samples, mmap_mode='r')
+
+        if isinstance(input_samples, np.ndarray):
+            input_blocks = (input_samples[start:start + chunk_size]
+                            for start in range(0, input_samples.shape[0],
+                                               chunk_size))
+        else:
+            input_blocks = self.__split_blocks(input_samples, chunk_size)
+
+        return self.__generate_output_blocks(input_blocks, output)
+
+    def __generate_output_blocks(self, input_blocks, output):
         """
+        Yields surrogate output samples for each block of input samples,
+        writing them to output if provided. See sample_stream.
+        """
+
+        num_written = 0
+        for input_block in input_blocks:
 
-        input_samples_srom = self._input_srom.samples
+            # Load (memory-mapped) block into memory.
+            input_block = np.array(input_block, dtype=float)
+            if len(input_block.shape) == 1:
+                input_block = input_block.reshape((len(input_block), 1))
 
-        # Generate surrogate samples:
-        (num_samples, _) = input_samples.shape
+            output_block = self.sample(input_block)
 
-        # Generate surrogate samples:
-        surrogate_samples = np.zeros((num_samples, self._dim))
-        for i in range(num_samples):
+            if output is not None:
+                num_samples = output_block.shape[0]
+                if num_written + num_samples > output.shape[0]:
+                    raise ValueError("More input samples than rows in output.")
 
-            # Find which input SROM sample is closest to current sample.
-            sample_i = input_samples[i, :]
-            diff_norms = np.linalg.norm(sample_i - input_samples_srom, axis=1)
-            srom_index = np.argmin(diff_norms)
-            surrogate_samples[i, :] = self._out_samples[srom_index, :]
+                output[num_written:num_written + num_samples] = output_block
+                output_block = output[num_written:num_written + num_samples]
+                num_written += num_samples
+
+            yield output_block
+
+        if output is not None and hasattr(output, 'flush'):
+            output.flush()
+
+    @staticmethod
+    def __split_blocks(input_blocks, chunk_size):
+        """
+        Yields blocks from an iterable of input sample blocks, splitting any
+        with more than chunk_size samples.
+        """
+
+        for input_block in input_blocks:
+            for start in range(0, len(input_block), chunk_size):
+                yield input_block[start:start + chunk_size]
+
+    def _find_closest_srom_samples(self, input_samples):
+        """
+        Returns indices of the input SROM samples closest to each of the input
+        samples (i.e., the Voronoi cell each input sample falls in), found with
+        a single batched KD-tree query.
+        """
+
+        _, srom_indices = self._input_samples_tree.query(input_samples)
+
+        return srom_indices
+
+    def _sample_piecewise_constant_surrogate(self, input_samples):
+        """
+        Evaluate standard piecewise constant output surrogate model
+        """
+
+        # Find which input SROM sample is closest to each sample & gather
+        # corresponding outputs.
+        srom_indices = self._find_closest_srom_samples(input_samples)
+        surrogate_samples = self._out_samples[srom_indices, :]
 
         return surrogate_samples
 
@@ -252,27 +348,13 @@ class SROMSurrogate:
 
         """
 
-        input_samples_srom = self._input_srom.samples
-
-        # Generate surrogate samples:
-        (num_samples, _) = input_samples.shape
-
-        # Generate surrogate samples:
-        surrogate_samples = np.zeros((num_samples, self._dim))
-        for i in range(num_samples):
-
-            # Find which input SROM sample is closest to current sample.
-            sample_i = input_samples[i, :]
-            diffs = sample_i - input_samples_srom
-            diff_norms = np.linalg.norm(diffs, axis=1)
-            srom_index = np.argmin(diff_norms)
-
-            # Calculate output sample value (eq 11b from emery paper).
-            output_k = self._out_samples[srom_index, :]
-            diffs_k = diffs[srom_index, :]
-            grad_k = self._gradients[srom_index, :]
+        # Find which input SROM sample is closest to each sample.
+        srom_indices = self._find_closest_srom_samples(input_samples)
+        diffs = input_samples - self._input_srom.samples[srom_indices, :]
 
-            out = output_k + np.dot(grad_k, diffs_k)
-            surrogate_samples[i, :] = out
+        # Calculate output sample values (eq 11b from emery paper).
+        corrections = np.sum(self._gradients[srom_indices, :] * diffs, axis=1)
+        surrogate_samples = self._out_samples[srom_indices, :] + \
+            corrections[:, np.newaxis]
 
         return surrogate_samples
@@ -19,11 +19,13 @@ vectors whose components are governed by analytic probability distributions.
 """
 
 import copy
+import os
 import numpy as np
 
 from scipy.stats import multivariate_normal, norm
-from scipy import integrate, interpolate
 
+from SROMPy.target.CalibrationCache import CalibrationCache
+from SROMPy.target.NatafCalibration import NatafCalibration
 from SROMPy.target.RandomVector import RandomVector
 
 
@@ -38,13 +40,24 @@ class AnalyticRandomVector(RandomVector):
     :type random_variables: list of SROMPy random variable objects
     :param correlation_matrix: specifies correlation between vector components.
     :type correlation_matrix: np array, size: dim x dim
+    :param n_jobs: number of worker processes to split the gaussian
+        correlation calibration of the component pairs across (-1 uses all
+        available CPU cores).
+    :type n_jobs: int
+    :param cache: cache for the correlation calibration, which is looked up
+        before (and stored after) calibrating. True uses the default on-disk
+        cache (see CalibrationCache) and False disables caching. None (the
+        default) uses the default cache only if the SROMPY_CACHE_DIR
+        environment variable is set.
+    :type cache: bool or SROMPy CalibrationCache object
 
     random_variables list must have length equal to the random vector dimension.
     Each SROMPy random variable object in the list must be properly
     initialized and have compute_moments and compute_CDF functions implemented.
     """
 
-    def __init__(self, random_variables, correlation_matrix):
+    def __init__(self, random_variables, correlation_matrix, n_jobs=1,
+                 cache=None):
         """
         Create analytic random vector with components that follow
         standard probability distributions. Initialize using a list of
@@ -61,6 +74,11 @@ class AnalyticRandomVector(RandomVector):
             correlation_matrix - numpy array with size (dimension x dimension)
                                with correlation between each component. Must be
                                symmetric, square matrix.
+            n_jobs - number of worker processes for calibrating the gaussian
+                               correlation matrix.
+            cache - True/False to use/not use the default calibration
+                               cache, None to use it only if SROMPY_CACHE_DIR
+                               is set, or a CalibrationCache object.
         """
 
         # TODO - error checking to make sure random variables are properly
@@ -91,11 +109,42 @@ class AnalyticRandomVector(RandomVector):
             self.mins[i] = self._components[i].mins[0]
             self.maxs[i] = self._components[i].maxs[0]
 
-        # Generate Gaussian correlation matrix for sampling translation RV:
-        self.generate_gaussian_correlation()
+        self._nataf_calibration = None
 
-        # Generate unscaled correlation that is matched by SROM during opt.
-        self.generate_unscaled_correlation()
+        # Reuse previously calibrated correlation matrices if cached (opt-in,
+        # so users' home directories aren't written to by default).
+        if cache is None:
+            cache = "SROMPY_CACHE_DIR" in os.environ
+
+        if cache is True:
+            cache = CalibrationCache.get_default()
+        elif cache is False:
+            cache = None
+        elif not isinstance(cache, CalibrationCache):
+            raise TypeError("cache must be a bool or CalibrationCache.")
+
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.get_key(self._components, self._corr)
+
+        cached_correlations = None
+        if cache_key is not None:
+            cached_correlations = cache.load(cache_key)
+
+        if cached_correlations is not None:
+            (self._gaussian_corr, self._unscaled_correlation) = \
+                cached_correlations
+        else:
+
+            # Generate Gaussian correlation matrix for sampling translation RV:
+            self.generate_gaussian_correlation(n_jobs)
+
+            # Generate unscaled correlation that is matched by SROM during opt.
+            self.generate_unscaled_correlation()
+
+            if cache_key is not None:
+                cache.save(cache_key, self._gaussian_corr,
+                           self._unscaled_correlation)
 
     @staticmethod
     def verify_correlation_matrix(corr_matrix):
@@ -173,44 +222,92 @@ class AnalyticRandomVector(RandomVector):
         """
         return self._unscaled_correlation
 
-    def draw_random_sample(self, sample_size):
+    def draw_random_sample(self, sample_size, rng=None):
         """
         Implements the translation model to generate general random vectors with
         non-gaussian components. Nonlinear transformation of a std gaussian
         vector according to method in S.R. Arwade 2005 paper.
 
         random component sample: theta = inv_cdf(std_normal_cdf(normal_vec))
-                                 \Theta = F^{-1}(\Phi(G))
+                                 \\Theta = F^{-1}(\\Phi(G))
+
+        :param sample_size: number of samples to return
+        :type sample_size: int
+        :param rng: random number generator (or seed for one) to draw the
+            underlying std normal samples with. Uses numpy's global random
+            state if None.
+        :type rng: numpy.random.Generator or int
+
+        Returns (sample_size x dim) array of samples. All samples are drawn
+        at once: Z (sample_size x dim) std normal, correlated as G = Z L^T
+        (L the cholesky factor of the gaussian correlation matrix) and mapped
+        column by column through each component's inverse CDF.
+        """
 
+        # Draw std normal random vectors with given correlation.
+        if rng is None:
+            normal_samples = np.random.standard_normal((sample_size,
+                                                        self._dim))
+        else:
+            normal_samples = np.random.default_rng(rng).standard_normal(
+                (sample_size, self._dim))
+
+        return self.__translate(normal_samples)
+
+    def transform_uniform_sample(self, uniform_samples):
         """
+        Maps points in the unit hypercube to samples of this random vector
+        with the same translation model as draw_random_sample, i.e., uniform
+        points U become independent std normals Z = \\Phi^{-1}(U) first. Used
+        to turn quasi-random (Sobol/Halton) or Latin hypercube points into
+        space-filling samples of the random vector.
 
-        samples = np.zeros((sample_size, self._dim))
-        cholesky = np.linalg.cholesky(self._gaussian_corr)
+        :param uniform_samples: points in the open unit hypercube
+        :type uniform_samples: np array, size: (# samples x dim)
+
+        Returns (# samples x dim) array of samples.
+        """
+
+        uniform_samples = np.asarray(uniform_samples, dtype=float)
 
-        # Is there a way to optimize this sampling loop?
-        for i in range(sample_size):
+        if uniform_samples.ndim != 2 or \
+                uniform_samples.shape[1] != self._dim:
+            raise ValueError("uniform_samples must have size "
+                             "(# samples x dim)")
 
-            # Draw standard std normal random vector with given correlation.
-            normal_vector = cholesky*norm.rvs(size=self._dim)
+        if np.any(uniform_samples <= 0.) or np.any(uniform_samples >= 1.):
+            raise ValueError("uniform_samples must be in the open unit "
+                             "hypercube")
 
-            # Evaluate std normal CDF at the random vector.
-            norm_cdf = norm.cdf(normal_vector)
+        return self.__translate(norm.ppf(uniform_samples))
 
-            # Transform by inverse CDF of random vector's components.
-            for j in range(self._dim):
-                samples[i][j] = \
-                    self._components[j].compute_inv_cdf(norm_cdf[j])[0]
+    def __translate(self, normal_samples):
+        """
+        Correlates independent std normal samples (# samples x dim) with the
+        gaussian correlation matrix and maps them through the components'
+        inverse CDFs.
+        """
+
+        cholesky = np.linalg.cholesky(self._gaussian_corr)
+        normal_samples = np.dot(normal_samples, cholesky.T)
+
+        # Evaluate std normal CDF at the random vectors.
+        norm_cdf = norm.cdf(normal_samples)
+
+        # Transform by inverse CDF of random vector's components.
+        samples = np.zeros((normal_samples.shape[0], self._dim))
+        for j in range(self._dim):
+            samples[:, j] = self._components[j].compute_inv_cdf(norm_cdf[:, j])
 
         return samples
 
     def integrand_helper(self, u, v, k, j, rho_kj):
         """
-        Helper function for numerical integration in the
-        generate_gaussian_correlation() function. Implements the integrand of
-        equation 6 of J.M. Emery 2015 paper that needs to be integrated w/
-        scipy
-        Passing in values of the k^th and j^th component of the random variable
-        - u and v - and the specified correlation between them rho_kj.
+        Integrand of equation 6 of J.M. Emery 2015 paper at the std normal
+        values u and v of the k^th and j^th components, with correlation
+        rho_kj between them. Kept for backwards compatibility -
+        get_correlation_entry now integrates it with Gauss-Hermite
+        quadrature (see NatafCalibration) rather than calling it.
         """
 
         normal_pdf_kj = multivariate_normal.pdf([u, v],
@@ -220,9 +317,7 @@ class AnalyticRandomVector(RandomVector):
         f_k = self._components[k].compute_inv_cdf(norm.cdf(u))
         f_j = self._components[j].compute_inv_cdf(norm.cdf(v))
 
-        integrand = f_k*f_j*normal_pdf_kj
-
-        return integrand
+        return f_k * f_j * normal_pdf_kj
 
     def get_correlation_entry(self, k, j, rho_kj):
         """
@@ -231,63 +326,39 @@ class AnalyticRandomVector(RandomVector):
         Helper function for generate_gaussian_correlation
         Need to integrate product of k/j component's inv cdf & a standard
         2D normal pdf with correlation rho_kj. This is equation 6 in J.M. Emery
-        et al 2015.
+        et al 2015, evaluated with Gauss-Hermite quadrature (see
+        NatafCalibration).
         """
 
-        # Integrate using scipy.
-        k_lims = [-4, 4]
-        j_lims = [-4, 4]
-
-        # Get product of moments & std deviations for equation 6.
-        mu_k_mu_j = (self._components[k].compute_moments(1)[0] *
-                     self._components[j].compute_moments(1)[0])
-        std_k_std_j = (self._components[k].get_variance() *
-                       self._components[j].get_variance())**0.5
-
-        # Try adjusting tolerance to speed this up:
-        # 1.49e-8 is default for both.
-        opts = {'epsabs': 1.e-5, 'epsrel': 1e-5}
-        e_integral = integrate.nquad(self.integrand_helper, [k_lims, j_lims],
-                                     args=(k, j, rho_kj), opts=opts)
-
-        eta_kj = (e_integral - mu_k_mu_j)/std_k_std_j
+        return self.__get_nataf_calibration().compute_correlation(k, j, rho_kj)
 
-        return eta_kj[0]
-
-    def generate_gaussian_correlation(self):
+    def generate_gaussian_correlation(self, n_jobs=1):
         """
         Generates the Gaussian correlation matrix that will achieve the
         covariance matrix specified for this random vector when using a
         translation random vector sampling approach. See J.M. Emery 2015 paper
         pages 922,923 on this procedure.
-        Helper function - no inputs, operates on self._correlation correlation
-        matrix and generates self._gaussian_corr
+        Helper function - operates on self._correlation correlation
+        matrix and generates self._gaussian_corr. The gaussian correlation of
+        each component pair is found by root finding on the correlation it
+        produces; pairs are independent and can be split across n_jobs
+        processes.
         """
 
-        self._gaussian_corr = np.ones(self._corr.shape)
-
-        # Want to build interpolant from eta correlation values to rho
-        # correlation values.
-        num_points = 12
-
-        # -1 made matrix singular
-        rho_kj_grid = np.linspace(-0.99, 0.99, num_points)
-        eta_jk_grid = np.zeros(num_points)
-
-        for k in range(self._dim):
-            for j in range(k+1, self._dim):
-                print("Determining correlation entry ", k, " ", j)
+        self._gaussian_corr = \
+            self.__get_nataf_calibration().compute_gaussian_correlation_matrix(
+                np.array(self._corr, dtype=float), n_jobs)
 
-                # Compute grid of eta/rho pts:
-                for i, rho_kj in enumerate(rho_kj_grid):
-                    eta_jk_grid[i] = self.get_correlation_entry(k, j, rho_kj)
+    def __get_nataf_calibration(self):
+        """
+        Returns the NatafCalibration object for the components, creating it
+        on first use (it is not needed if the calibration is cached).
+        """
 
-                # Build interpolant to find rho value for specified eta.
-                rho_interp = interpolate.interp1d(eta_jk_grid, rho_kj_grid)
+        if self._nataf_calibration is None:
+            self._nataf_calibration = NatafCalibration(self._components)
 
-                # Use symmetry to save time:
-                self._gaussian_corr[k][j] = rho_interp(self._corr[k][j])
-                self._gaussian_corr[j][k] = rho_interp(self._corr[k][j])
+        return self._nataf_calibration
 
     def generate_unscaled_correlation(self):
         """
@@ -299,13 +370,10 @@ class AnalyticRandomVector(RandomVector):
 
         """
 
-        self._unscaled_correlation = copy.deepcopy(self._corr)
+        means = np.array([np.ravel(component.compute_moments(1))[0]
+                          for component in self._components])
+        std_devs = np.sqrt([np.ravel(component.get_variance())[0]
+                            for component in self._components])
 
-        for i in range(self._dim):
-            for j in range(self._dim):
-                mu_i_mu_j = (self._components[i].compute_moments(1)[0] *
-                             self._components[j].compute_moments(1)[0])
-                std_i_std_j = (self._components[i].get_variance() *
-                               self._components[j].get_variance())**0.5
-                self._unscaled_correlation[i][j] *= std_i_std_j
-                self._unscaled_correlation[i][j] += mu_i_mu_j
+        self._unscaled_correlation = self._corr * np.outer(std_devs, std_devs)
+        self._unscaled_correlation += np.outer(means, means)
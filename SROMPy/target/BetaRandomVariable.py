@@ -139,15 +139,18 @@ class BetaRandomVariable(RandomVariable):
         return scipy_beta.pdf(x_grid, self._alpha, self._beta, self._shift,
                               self._scale)
 
-    def draw_random_sample(self, sample_size):
+    def draw_random_sample(self, sample_size, rng=None):
         """
         Draws random samples from the beta random variable. Returns numpy
-        array of length 'sample_size' containing these samples
+        array of length 'sample_size' containing these samples. rng is an
+        optional numpy Generator (or seed) to draw with.
         """
 
         # Use scipy beta rv to return shifted/scaled samples automatically.
+        random_state = None if rng is None else \
+            np.random.default_rng(rng)
         return scipy_beta.rvs(self._alpha, self._beta, self._shift, self._scale,
-                              sample_size)
+                              sample_size, random_state=random_state)
 
     def generate_moments(self, max_moment):
         """
@@ -0,0 +1,233 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for caching AnalyticRandomVector correlation calibrations on disk.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+
+class CalibrationCache(object):
+    """
+    Persistent, content-addressed on-disk cache of the gaussian & unscaled
+    correlation matrices of AnalyticRandomVector objects, so that rebuilding
+    a random vector with the same components and correlation matrix skips
+    the gaussian correlation calibration.
+
+    Entries are keyed on a hash of the component types & their defining
+    parameters (DEFINING_PARAMETERS) and the target correlation matrix, and
+    stored as one .npz file each. Random vectors with other component types
+    are not cached. The least
+    recently used entries are removed once the cache holds more than
+    max_entries entries.
+
+    :param cache_dir: directory to store the cache entries in. Defaults to
+        the SROMPY_CACHE_DIR environment variable, or ~/.cache/srompy if it
+        is not set.
+    :type cache_dir: string
+    :param max_entries: max. number of entries to keep in the cache.
+    :type max_entries: int
+    """
+
+    # Bump to invalidate entries when the calibration method changes.
+    VERSION = "nataf-gauss-hermite-1"
+
+    # Attributes defining the distribution of each supported component type.
+    # Derived state (e.g. cached moments) must not change the key.
+    DEFINING_PARAMETERS = {
+        "BetaRandomVariable": ("_alpha", "_beta", "_shift", "_scale"),
+        "GammaRandomVariable": ("_alpha", "_shift", "_scale"),
+        "NormalRandomVariable": ("_mean", "_std"),
+        "UniformRandomVariable": ("_minimum_value", "_range_size"),
+    }
+
+    _default_cache = None
+
+    def __init__(self, cache_dir=None, max_entries=256):
+
+        if not isinstance(max_entries, int):
+            raise TypeError("max_entries must be a positive int.")
+
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive int.")
+
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "SROMPY_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "srompy"))
+
+        self._cache_dir = os.path.join(cache_dir, "calibration")
+        self._max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_default(cls):
+        """
+        Returns the (shared) cache used by AnalyticRandomVector by default.
+        """
+
+        if cls._default_cache is None:
+            cls._default_cache = cls()
+
+        return cls._default_cache
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of lookups that were found in the cache.
+        """
+
+        num_lookups = self.hits + self.misses
+        return self.hits / float(num_lookups) if num_lookups > 0 else 0.0
+
+    def get_key(self, random_variables, correlation_matrix):
+        """
+        Returns the cache key (hex digest) for a random vector with the given
+        components & correlation matrix, or None if a component type isn't
+        supported (see DEFINING_PARAMETERS).
+        """
+
+        key_hash = hashlib.sha256(self.VERSION.encode())
+
+        for random_variable in random_variables:
+            type_name = type(random_variable).__name__
+            if type_name not in self.DEFINING_PARAMETERS:
+                return None
+
+            key_hash.update(type_name.encode())
+
+            for name in self.DEFINING_PARAMETERS[type_name]:
+                key_hash.update(name.encode())
+                self.__update_hash(key_hash, getattr(random_variable, name))
+
+        self.__update_hash(key_hash, np.asarray(correlation_matrix,
+                                                dtype=float))
+
+        return key_hash.hexdigest()
+
+    def load(self, key):
+        """
+        Returns tuple of the cached (gaussian correlation, unscaled
+        correlation) matrices for key, or None if not cached.
+        """
+
+        file_name = self.__get_file_name(key)
+
+        try:
+            with np.load(file_name) as entry:
+                result = (entry["gaussian_correlation"],
+                          entry["unscaled_correlation"])
+        except (IOError, OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+
+        # Mark entry as recently used (not possible in a read-only cache).
+        try:
+            os.utime(file_name, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+
+        return result
+
+    def save(self, key, gaussian_correlation, unscaled_correlation):
+        """
+        Stores the gaussian & unscaled correlation matrices under key, then
+        evicts the least recently used entries beyond max_entries. Returns
+        whether the entry was stored (e.g., False if the cache directory is
+        not writable).
+        """
+
+        file_name = self.__get_file_name(key)
+        temporary_file_name = "%s.%d.tmp.npz" % (file_name, os.getpid())
+
+        try:
+            if not os.path.isdir(self._cache_dir):
+                os.makedirs(self._cache_dir)
+
+            # Write to a temporary file & rename so readers never see a
+            # partial entry.
+            np.savez(temporary_file_name,
+                     gaussian_correlation=gaussian_correlation,
+                     unscaled_correlation=unscaled_correlation)
+            os.replace(temporary_file_name, file_name)
+        except OSError:
+            return False
+
+        self.__evict()
+
+        return True
+
+    def clear(self):
+        """
+        Removes all entries from the cache & resets the hit/miss counts.
+        """
+
+        for file_name in self.__get_entry_file_names():
+            os.remove(file_name)
+
+        self.hits = 0
+        self.misses = 0
+
+    def __evict(self):
+
+        file_names = self.__get_entry_file_names()
+        if len(file_names) <= self._max_entries:
+            return
+
+        file_names.sort(key=os.path.getmtime)
+        for file_name in file_names[:len(file_names) - self._max_entries]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def __get_entry_file_names(self):
+
+        if not os.path.isdir(self._cache_dir):
+            return []
+
+        return [os.path.join(self._cache_dir, file_name)
+                for file_name in os.listdir(self._cache_dir)
+                if file_name.endswith(".npz") and ".tmp" not in file_name]
+
+    def __get_file_name(self, key):
+        return os.path.join(self._cache_dir, key + ".npz")
+
+    @staticmethod
+    def __update_hash(key_hash, value):
+
+        try:
+            array = np.asarray(value)
+        except (TypeError, ValueError):
+            array = None
+
+        if array is not None and array.dtype != object:
+            key_hash.update(str((array.dtype.str, array.shape)).encode())
+            key_hash.update(np.ascontiguousarray(array).tobytes())
+        else:
+            key_hash.update(repr(value).encode())
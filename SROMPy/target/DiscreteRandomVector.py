@@ -36,6 +36,7 @@ class DiscreteRandomVector(RandomVector):
         # Cache statistics so they can be returned quickly later.
         self._precompute_moments()
         self._precompute_correlation_matrix()
+        self._precompute_sorted_samples()
 
         self._cdf_x_grid_cache = None
         self._cdf_cache = None
@@ -99,12 +100,12 @@ class DiscreteRandomVector(RandomVector):
 
             cdf_values = np.zeros((num_pts, self._dim))
 
-            # Vectorized indicator implementation for CDF
-            # CDF(x) = sum_{k=1}^m  1( sample^(k) < x) prob^(k)
+            # CDF(x) = sum_{k=1}^m  1( sample^(k) <= x) prob^(k), looked up
+            # from the sorted samples/cumulative probabilities.
             for i, grid in enumerate(x_grid.T):
-                for k, sample in enumerate(self._samples):
-                    indices = grid >= sample[i]
-                    cdf_values[indices, i] += self._probabilities[k]
+                num_below = np.searchsorted(self._sorted_samples[:, i], grid,
+                                            side='right')
+                cdf_values[:, i] = self._cumulative_probabilities[num_below, i]
 
             # Cache these values to return next time:
             self._cdf_x_grid_cache = x_grid
@@ -118,12 +119,15 @@ class DiscreteRandomVector(RandomVector):
         """
         return self._corr_matrix
 
-    def draw_random_sample(self, sample_size):
+    def draw_random_sample(self, sample_size, rng=None):
         """
         Randomly draws a sample of this random vector.
 
         :param sample_size: number of samples to return
         :type sample_size: int
+        :param rng: random number generator (or seed for one) to draw with.
+            Uses numpy's global random state if None.
+        :type rng: numpy.random.Generator or int
 
         sample_size must be smaller than total # of samples. For discrete
         random vector, we return a randomly selected # of samples
@@ -134,7 +138,8 @@ class DiscreteRandomVector(RandomVector):
 
         # Generate random indices for samples array.
         all_indices = np.arange(self._num_samples)
-        random_indices = np.random.choice(all_indices, sample_size,
+        generator = np.random if rng is None else np.random.default_rng(rng)
+        random_indices = generator.choice(all_indices, sample_size,
                                           replace=False)
 
         sample = self._samples[random_indices, :]
@@ -147,29 +152,39 @@ class DiscreteRandomVector(RandomVector):
         array.
         """
     
+        probabilities = np.asarray(self._probabilities).flatten()
+
+        # moment_q = sum_{k=1}^m p(k) * x(k)^q
         self._moments = np.zeros((self._max_moment, self._dim))
-        
+        sample_powers = np.ones(self._samples.shape)
         for order in range(self._max_moment):
-        
-            # moment_q = sum_{k=1}^m p(k) * x(k)^q
-            moment_q = np.zeros((1, self._dim))
-            for k, sample in enumerate(self._samples):
-                moment_q = moment_q + self._probabilities[k] * \
-                                      pow(sample, order+1)
-
-            self._moments[order, :] = moment_q
+            sample_powers = sample_powers * self._samples
+            self._moments[order, :] = np.dot(probabilities, sample_powers)
 
     def _precompute_correlation_matrix(self):
         """
         Precomputes and stores correlation matrix and stores in 
         "_corr_matrix" member variable array.
         """
-        corr = np.zeros((self._dim, self._dim))
+        probabilities = np.asarray(self._probabilities).reshape((-1, 1))
+        self._corr_matrix = np.dot(self._samples.T,
+                                   probabilities * self._samples)
+
+    def _precompute_sorted_samples(self):
+        """
+        Sorts the samples in each dimension and stores them with the
+        cumulative sum of their probabilities ("_sorted_samples" and
+        "_cumulative_probabilities" member variables), so that CDF values can
+        be found with a binary search.
+        """
 
-        for k, sample in enumerate(self._samples):
-            corr = corr + np.outer(sample, sample) * self._probabilities[k]
+        order = np.argsort(self._samples, axis=0)
+        self._sorted_samples = np.take_along_axis(self._samples, order, axis=0)
 
-        self._corr_matrix = corr
+        self._cumulative_probabilities = np.zeros((self._num_samples + 1,
+                                                   self._dim))
+        np.cumsum(np.asarray(self._probabilities).flatten()[order], axis=0,
+                  out=self._cumulative_probabilities[1:])
 
     def _is_cdf_cached(self, x_grid):
         """
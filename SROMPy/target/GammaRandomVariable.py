@@ -100,14 +100,18 @@ class GammaRandomVariable(RandomVariable):
         """
         return scipygamma.pdf(x_grid, self._alpha, self._shift, self._scale)
 
-    def draw_random_sample(self, sample_sz):
+    def draw_random_sample(self, sample_sz, rng=None):
         """
         Draws random samples from the gamma random variable. Returns numpy
-        array of length 'sample_size' containing these samples
+        array of length 'sample_size' containing these samples. rng is an
+        optional numpy Generator (or seed) to draw with.
         """
 
         # Use scipy gamma rv to return shifted/scaled samples automatically.
-        return scipygamma.rvs(self._alpha, self._shift, self._scale, sample_sz)
+        random_state = None if rng is None else \
+            np.random.default_rng(rng)
+        return scipygamma.rvs(self._alpha, self._shift, self._scale,
+                              sample_sz, random_state=random_state)
 
     def generate_moments(self, max_moment):
         """
@@ -0,0 +1,191 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Class for calibrating the gaussian correlation of a translation (Nataf)
+random vector.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.polynomial.hermite_e import hermegauss
+from scipy.optimize import brentq
+from scipy.stats import norm
+
+
+def _solve_gaussian_correlation_entries(calibration, pairs, correlations):
+    """
+    Solves for the gaussian correlation of a list of component pairs in a
+    process pool worker.
+    """
+
+    return [calibration.solve_gaussian_correlation(k, j, correlation)
+            for (k, j), correlation in zip(pairs, correlations)]
+
+
+class NatafCalibration(object):
+    """
+    Computes the correlation matrix of the underlying standard gaussian
+    vector G that produces a specified correlation between the components of
+    a translation random vector, X_k = F_k^{-1}(Phi(G_k)) (see J.M. Emery et
+    al 2015, equation 6).
+
+    The correlation between components k & j produced by a gaussian
+    correlation rho,
+
+        eta_kj(rho) = (E[X_k X_j] - mu_k mu_j) / (sigma_k sigma_j),
+
+    is evaluated with tensorized Gauss-Hermite quadrature, writing
+    G_j = rho G_k + sqrt(1 - rho^2) Z for independent std normal G_k, Z. The
+    transformations F^{-1}(Phi(.)) of each component are tabulated once on a
+    fine grid of std normal values, so evaluating eta_kj requires no calls to
+    the components. rho is then found by root finding on eta_kj(rho).
+
+    :param random_variables: SROMPy random variable objects defining each
+        component of the random vector (must implement compute_inv_cdf,
+        compute_moments & get_variance).
+    :type random_variables: list of SROMPy random variable objects
+    :param num_quadrature_points: # of Gauss-Hermite pts per dimension
+    :type num_quadrature_points: int
+    :param num_table_points: # of pts in each component's tabulated
+        transformation
+    :type num_table_points: int
+    """
+
+    # Std normal values covered by the tabulated transformations (Phi(8) is
+    # within round-off of 1).
+    TABLE_LIMIT = 8.0
+
+    def __init__(self, random_variables, num_quadrature_points=40,
+                 num_table_points=4001):
+
+        nodes, weights = hermegauss(num_quadrature_points)
+        self._nodes = nodes
+        self._weights = weights / np.sqrt(2 * np.pi)
+
+        self._table_grid = np.linspace(-self.TABLE_LIMIT, self.TABLE_LIMIT,
+                                       num_table_points)
+
+        num_components = len(random_variables)
+        self._transformation_tables = np.zeros((num_components,
+                                                num_table_points))
+        self._node_values = np.zeros((num_components, num_quadrature_points))
+        self._means = np.zeros(num_components)
+        self._std_devs = np.zeros(num_components)
+
+        for k, random_variable in enumerate(random_variables):
+
+            self._transformation_tables[k] = np.ravel(
+                random_variable.compute_inv_cdf(norm.cdf(self._table_grid)))
+            self._node_values[k] = np.interp(nodes, self._table_grid,
+                                             self._transformation_tables[k])
+
+            self._means[k] = np.ravel(random_variable.compute_moments(1))[0]
+            self._std_devs[k] = \
+                np.sqrt(np.ravel(random_variable.get_variance())[0])
+
+    def compute_correlation(self, k, j, gaussian_correlation):
+        """
+        Returns the correlation between components k & j of the translation
+        random vector when their underlying gaussians have correlation
+        gaussian_correlation.
+        """
+
+        rho = gaussian_correlation
+        inner_points = rho * self._nodes[:, np.newaxis] + \
+            np.sqrt(1.0 - rho ** 2) * self._nodes[np.newaxis, :]
+        inner_values = np.interp(inner_points, self._table_grid,
+                                 self._transformation_tables[j])
+
+        expectation = np.dot(self._weights * self._node_values[k],
+                             np.dot(inner_values, self._weights))
+
+        return (expectation - self._means[k] * self._means[j]) / \
+            (self._std_devs[k] * self._std_devs[j])
+
+    def solve_gaussian_correlation(self, k, j, correlation):
+        """
+        Returns the gaussian correlation that produces the specified
+        correlation between components k & j of the translation random
+        vector.
+        """
+
+        bounds = (-0.999, 0.999)
+
+        residuals = [self.compute_correlation(k, j, bound) - correlation
+                     for bound in bounds]
+
+        if residuals[0] > 0 or residuals[1] < 0:
+            raise ValueError("Correlation %s between components %d and %d is "
+                             "not achievable by the translation random "
+                             "vector." % (correlation, k, j))
+
+        return brentq(lambda rho: self.compute_correlation(k, j, rho) -
+                      correlation, bounds[0], bounds[1], xtol=1e-12)
+
+    def compute_gaussian_correlation_matrix(self, correlation_matrix,
+                                            n_jobs=1):
+        """
+        Returns the gaussian correlation matrix producing correlation_matrix
+        for the translation random vector.
+
+        :param correlation_matrix: target correlation of the components.
+        :type correlation_matrix: np array, size: dim x dim
+        :param n_jobs: number of worker processes to split the (independent)
+            component pairs across. -1 uses one process per CPU core.
+        :type n_jobs: int
+        """
+
+        if not isinstance(n_jobs, int):
+            raise TypeError("n_jobs must be a positive int or -1.")
+
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+
+        if n_jobs <= 0:
+            raise ValueError("n_jobs must be a positive int or -1.")
+
+        dim = correlation_matrix.shape[0]
+        pairs = [(k, j) for k in range(dim) for j in range(k + 1, dim)]
+        correlations = [correlation_matrix[k][j] for (k, j) in pairs]
+
+        if n_jobs == 1 or len(pairs) <= 1:
+            entries = _solve_gaussian_correlation_entries(self, pairs,
+                                                          correlations)
+        else:
+            chunks = [range(i, len(pairs), n_jobs) for i in range(n_jobs)]
+            chunks = [chunk for chunk in chunks if len(chunk) > 0]
+
+            with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+                futures = [executor.submit(_solve_gaussian_correlation_entries,
+                                           self,
+                                           [pairs[i] for i in chunk],
+                                           [correlations[i] for i in chunk])
+                           for chunk in chunks]
+
+                entries = [None] * len(pairs)
+                for chunk, future in zip(chunks, futures):
+                    for i, entry in zip(chunk, future.result()):
+                        entries[i] = entry
+
+        gaussian_correlation = np.eye(dim)
+        for (k, j), entry in zip(pairs, entries):
+            gaussian_correlation[k][j] = entry
+            gaussian_correlation[j][k] = entry
+
+        return gaussian_correlation
@@ -92,14 +92,18 @@ class NormalRandomVariable(RandomVariable):
         """
         return scipy_normal.pdf(x_grid, self._mean, self._std)
 
-    def draw_random_sample(self, sample_size):
+    def draw_random_sample(self, sample_size, rng=None):
         """
         Draws random samples from the normal random variable. Returns numpy
-        array of length 'sample_size' containing these samples
+        array of length 'sample_size' containing these samples. rng is an
+        optional numpy Generator (or seed) to draw with.
         """
 
         # Use scipy normal rv to return shifted/scaled samples automatically.
-        return scipy_normal.rvs(self._mean, self._std, sample_size)
+        random_state = None if rng is None else \
+            np.random.default_rng(rng)
+        return scipy_normal.rvs(self._mean, self._std,
+                                sample_size, random_state=random_state)
 
     def generate_moments(self, max_moment):
         """
@@ -25,6 +25,11 @@ and NormalRandomVariable.
 
 class RandomVariable(RandomEntity):
 
+    @property
+    def dim(self):
+        # Random variables are scalar.
+        return 1
+
     @abc.abstractmethod
     def get_variance(self, max_order):
         return
@@ -46,7 +51,7 @@ class RandomVariable(RandomEntity):
         return
 
     @abc.abstractmethod
-    def draw_random_sample(self):
+    def draw_random_sample(self, sample_size, rng=None):
         return
 
     @abc.abstractmethod
@@ -46,5 +46,5 @@ class RandomVector(RandomEntity):
         return
 
     @abc.abstractmethod
-    def draw_random_sample(self, sample_size):
+    def draw_random_sample(self, sample_size, rng=None):
         return
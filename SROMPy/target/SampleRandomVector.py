@@ -17,8 +17,11 @@
 Class for defining a sample-based random vector with empirical estimators
 """
 
+import itertools
+import mmap
+import tempfile
+
 import numpy as np
-from scipy import interpolate
 from scipy.stats.qmc import Halton, Sobol
 
 from SROMPy.target import RandomVector
@@ -28,23 +31,59 @@ class SampleRandomVector(RandomVector):
     """
     Sample-based random vector. Defines a target random vector to match with
     an SROM based on a set of realizations of that random vector. Implements
-    basic statistics to use in SROM optimization and comparisons.
-
-    :param samples: set of realizations/samples of the random vector
-    :type samples: np array, size: (# samples x dim)
+    basic statistics to use in SROM optimization and comparisons. More samples
+    can be added later with update() or merge(), which update the statistics
+    without revisiting the existing samples.
+
+    :param samples: set of realizations/samples of the random vector, or the
+        name of a .npy file (memory-mapped) or text file (read in chunks)
+        containing them. Large sample sets can be given as a memory-mapped
+        array (np.memmap / np.load(..., mmap_mode='r')) so they are never
+        fully loaded into memory.
+    :type samples: np array, size: (# samples x dim), or string
     :param max_moment: max. order moment to precompute and store
     :type max_moment: int
+    :param chunk_size: number of samples processed at a time when computing
+        the moments, correlation matrix & CDFs, which bounds the temporary
+        memory used for large sample sets.
+    :type chunk_size: int
+    :param num_cdf_points: number of quantile knots used to represent each
+        marginal CDF (None to use all samples, i.e., the exact empirical CDF).
+        The compact CDF is built in a single pass with memory independent of
+        the # samples & differs from the exact one by at most cdf_error_bound,
+        which is about (1 + log2(# samples / chunk_size)) / num_cdf_points.
+        The exact CDF keeps all samples in memory.
+    :type num_cdf_points: int
     """
 
-    def __init__(self, samples, max_moment=10):
+    def __init__(self, samples, max_moment=10, chunk_size=65536,
+                 num_cdf_points=4096):
         """
         Initialize SampleRandomVector with an array of samples of the random
-        vector. Must be an array of size (# samples x dim). Statistics of the
+        vector. Must be an array of size (# samples x dim), or the name of a
+        .npy or text file with the samples in that layout. Statistics of the
         SampleRandomVector are precomputed during initialization - max_moment
         is the maximum moment order to compute & store for later use. If higher
-        moments are anticipated, this can be increased (or visa versa)
+        moments are anticipated, this can be increased (or visa versa).
+        chunk_size is the number of samples reduced at a time when computing
+        the statistics. num_cdf_points is the number of knots stored per
+        marginal CDF (None to store all samples).
         """
 
+        if not isinstance(chunk_size, (int, np.integer)) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        if num_cdf_points is not None and \
+                (not isinstance(num_cdf_points, (int, np.integer)) or
+                 num_cdf_points < 2):
+            raise ValueError("num_cdf_points must be an integer >= 2.")
+
+        # Temporary file backing samples read from a text file.
+        self._sample_file = None
+
+        if isinstance(samples, str):
+            samples = self.__open_sample_file(samples, chunk_size)
+
         # Check for 1D case (random variable).
         if len(samples.shape) == 1:
             samples = samples.reshape((len(samples), 1))
@@ -55,7 +94,9 @@ class SampleRandomVector(RandomVector):
             msg = "Dimension is greater than # samples! Check samples array"
             raise ValueError(msg)
 
-        self._CDFs = []
+        self._cdf_knots = None
+        self._cdf_levels = None
+        self._cdf_error_bound = None
         self.mins = []
         self.maxs = []
 
@@ -63,21 +104,98 @@ class SampleRandomVector(RandomVector):
         super(SampleRandomVector, self).__init__(dim)
 
         self._num_samples = num_samples
-        self._samples = samples
         self._max_moment = max_moment
+        self._chunk_size = int(chunk_size)
+        self._num_cdf_points = num_cdf_points
         self._moments = None
         self._correlation = None
 
+        # Samples are stored as a list of arrays (one per update/merge) &
+        # statistics as raw sums so that they can be updated incrementally.
+        self._sample_sets = [samples]
+        self._power_sums = None
+        self._outer_product_sum = None
+
         # Precompute & store statistics so they can be returned quickly later.
         self.generate_statistics(max_moment)
 
+    def __getstate__(self):
+        """
+        Pickles memory-mapped samples (e.g., when sending the random vector to
+        worker processes) by the name of their file, so that they are mapped
+        again rather than copied into memory when unpickled.
+        """
+
+        state = self.__dict__.copy()
+
+        # Only the random vector that created the temporary sample file
+        # deletes it.
+        state["_sample_file"] = None
+        state["_sample_sets"] = [self.__get_memmap_info(samples)
+                                 for samples in self._sample_sets]
+
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled random vector, mapping memory-mapped samples again.
+        """
+
+        state["_sample_sets"] = [
+            np.memmap(samples["filename"], dtype=samples["dtype"], mode="r",
+                      offset=samples["offset"], shape=samples["shape"],
+                      order=samples["order"])
+            if isinstance(samples, dict) else samples
+            for samples in state["_sample_sets"]]
+
+        self.__dict__.update(state)
+
+    @staticmethod
+    def __get_memmap_info(samples):
+        """
+        Returns the file name, dtype, offset, shape & order needed to map
+        samples again if they are a memory-mapped file, else samples.
+        """
+
+        # Views of a memmap (e.g., slices) don't start at its offset, so they
+        # are pickled as arrays.
+        if not isinstance(samples, np.memmap) or samples.filename is None or \
+                not isinstance(samples.base, mmap.mmap):
+            return samples
+
+        order = "F" if samples.flags.f_contiguous and \
+            not samples.flags.c_contiguous else "C"
+
+        return {"filename": samples.filename, "dtype": samples.dtype.str,
+                "offset": samples.offset, "shape": samples.shape,
+                "order": order}
+
     @property
     def num_samples(self):
         return self._num_samples
 
     @property
     def samples(self):
-        return self._samples
+        """
+        Array of all samples. Samples added by update/merge are stored
+        separately, so this is an in-memory copy of all of them if there are
+        several arrays - use get_sample_blocks() to iterate over large (e.g.,
+        memory-mapped) sample sets instead.
+        """
+
+        if len(self._sample_sets) > 1:
+            return np.concatenate(self._sample_sets)
+
+        return self._sample_sets[0]
+
+    @property
+    def cdf_error_bound(self):
+        """
+        Max. absolute difference between the stored marginal CDFs and the
+        (linearly interpolated) empirical CDFs of the samples.
+        """
+
+        return self._cdf_error_bound
 
     def compute_moments(self, max_order):
         """
@@ -127,14 +245,11 @@ class SampleRandomVector(RandomVector):
 
         cdf_values = np.zeros((num_points, self._dim))
 
-        # Evaluate CDF interpolants on grid.
+        # Interpolate CDF knots on grid - values outside of min/max along each
+        # dimension take the CDF value at the min/max.
         for d, grid in enumerate(x_grid.T):
-
-            # Make sure grid values lie within max/min along each dimension.
-            grid[np.where(grid < self.mins[d])] = self.mins[d]
-            grid[np.where(grid > self.maxs[d])] = self.maxs[d]
-
-            cdf_values[:, d] = self._CDFs[d](grid)
+            cdf_values[:, d] = np.interp(grid, self._cdf_knots[:, d],
+                                         self._cdf_levels)
 
         return cdf_values
 
@@ -144,12 +259,19 @@ class SampleRandomVector(RandomVector):
         """
         return self._correlation
 
-    def draw_random_sample(self, sample_size, qmc_engine=None):
+    def draw_random_sample(self, sample_size, qmc_engine=None, rng=None):
         """
         Randomly draws a sample of this random vector.
 
         :param sample_size: number of samples to return
         :type sample_size: int
+        :param qmc_engine: 'Halton' or 'Sobol' to select the samples with
+            quasi-random indices
+        :type qmc_engine: string
+        :param rng: random number generator (or seed for one) to draw (or
+            scramble the QMC engine) with. Seeded from (or, for the QMC
+            engines, uses) numpy's global random state if None.
+        :type rng: numpy.random.Generator or int
 
         sample_size must be smaller than total # of samples. For sample-based
         random vector, we return a randomly selected # of samples
@@ -160,22 +282,89 @@ class SampleRandomVector(RandomVector):
 
         if qmc_engine is not None:
             if qmc_engine == 'Halton':
-                sampler = Halton(d=self._dim)
+                sampler = Halton(d=self._dim, seed=rng)
                 random_indices = sampler.integers(l_bounds=0, u_bounds=self._num_samples, n=sample_size)
             elif qmc_engine == 'Sobol':
-                sampler = Sobol(d=self._dim)
+                sampler = Sobol(d=self._dim, seed=rng)
                 random_indices = sampler.integers(l_bounds=0, u_bounds=self._num_samples, n=sample_size)
             else:
                 raise ValueError("Invalid QMC engine provided.")
         else:
-            # Generate random indices for samples array.
-            all_indices = np.arange(self._num_samples)
-            random_indices = np.random.choice(all_indices, sample_size, replace=False)
+            # Generate random indices for samples array. Generator.choice
+            # doesn't permute all of the (possibly many) sample indices like
+            # the legacy np.random.choice does, so seed one from numpy's
+            # global random state if no generator is given.
+            if rng is None:
+                rng = np.random.randint(2 ** 31 - 1)
+
+            random_indices = np.random.default_rng(rng).choice(
+                self._num_samples, sample_size, replace=False)
 
-        sample = self._samples[random_indices, :]
+        sample = self.__take_samples(random_indices)
 
         return sample
 
+    def update(self, new_samples):
+        """
+        Adds new samples to the random vector & updates its statistics using
+        only the new samples (the existing samples are not revisited).
+
+        :param new_samples: new realizations/samples of the random vector.
+        :type new_samples: np array, size: (# new samples x dim)
+
+        The moments & correlation matrix are updated exactly. The CDFs are
+        merged exactly if all samples fit in num_cdf_points knots, otherwise
+        the quantile knots are merged approximately & cdf_error_bound grows
+        accordingly.
+        """
+
+        if len(new_samples.shape) == 1:
+            new_samples = new_samples.reshape((len(new_samples), 1))
+
+        if len(new_samples.shape) != 2 or new_samples.shape[1] != self._dim:
+            raise ValueError("New samples must have size (# samples x dim)")
+
+        num_new_samples = new_samples.shape[0]
+        if num_new_samples == 0:
+            return
+
+        max_moment = self._power_sums.shape[0]
+        (power_sums, outer_product_sum, cdf_table) = \
+            self.__compute_statistics([new_samples], max_moment)
+
+        self.__merge_statistics(num_new_samples, power_sums,
+                                outer_product_sum, cdf_table, [new_samples])
+
+    def merge(self, other):
+        """
+        Adds the samples & statistics of another SampleRandomVector (e.g.,
+        built from a different batch of samples) to this random vector,
+        without revisiting the samples of either.
+
+        :param other: random vector with the same dimension & max_moment.
+        :type other: SampleRandomVector
+
+        If this random vector stores exact CDFs (num_cdf_points=None) but
+        other doesn't, the exact CDFs are rebuilt from the samples of both.
+        """
+
+        if not isinstance(other, SampleRandomVector):
+            raise TypeError("Can only merge with another SampleRandomVector")
+
+        if other.dim != self._dim:
+            raise ValueError("Cannot merge random vectors of different dims")
+
+        if other._power_sums.shape != self._power_sums.shape:
+            raise ValueError("Cannot merge random vectors with different "
+                             "max_moment")
+
+        cdf_table = (other.num_samples, other._cdf_knots, other._cdf_levels,
+                     other._cdf_error_bound)
+
+        self.__merge_statistics(other.num_samples, other._power_sums,
+                                other._outer_product_sum, cdf_table,
+                                other._sample_sets)
+
     # --------------Helper initialization methods---------------------------
 
     def get_plot_cdfs(self):
@@ -187,7 +376,7 @@ class SampleRandomVector(RandomVector):
         x_grid = np.zeros((self._num_samples, self._dim))
         cdf_values = np.zeros((self._num_samples, self._dim))
 
-        for i, samples_i in enumerate(self._samples.T):
+        for i, samples_i in enumerate(self.samples.T):
 
             # Generate empirical CDF:
             sorted_i = np.sort(samples_i)
@@ -200,12 +389,17 @@ class SampleRandomVector(RandomVector):
     def generate_statistics(self, max_moment):
         """
         Precompute & store moments, CDFs, correlation matrix of the samples
-        so that they can be returned quickly later
+        so that they can be returned quickly later. All statistics are
+        accumulated in a single pass over blocks of the samples.
         """
 
-        self.generate_moments(max_moment)
-        self.generate_cdfs()
-        self.generate_correlation()
+        (self._power_sums, self._outer_product_sum, cdf_table) = \
+            self.__compute_statistics(self._sample_sets, max_moment)
+
+        self._moments = self._power_sums / float(self._num_samples)
+        self._correlation = self._outer_product_sum / float(self._num_samples)
+
+        self.__set_cdf_table(cdf_table)
 
     def generate_moments(self, max_moment):
         """
@@ -213,55 +407,355 @@ class SampleRandomVector(RandomVector):
         on samples. Moments from 1,...,max_order
         """
 
-        self._moments = np.zeros((max_moment, self._dim))
-
-        factor = (1./float(self._num_samples))
-        for q in range(0, max_moment):
+        self._power_sums = np.zeros((max_moment, self._dim))
 
-            moment_q = np.zeros((1, self._dim))
-            for sample in self._samples:
-                moment_q += factor*np.power(sample, q+1)
+        for sample_block in self.__get_sample_blocks(self._sample_sets):
+            self.__accumulate_power_sums(sample_block, self._power_sums)
 
-            self._moments[q, :] = moment_q
+        self._moments = self._power_sums / float(self._num_samples)
 
     def generate_cdfs(self):
         """
         Calculate & store marginal CDFs for each dimension of the random vector.
-        Stores a linear interpolator of the CDF for each dim
+        Stores a table of num_cdf_points quantile knots per dim, i.e. the sorted
+        samples at evenly spaced ranks with CDF values rank / # samples, that
+        is linearly interpolated to evaluate the CDF.
         Uses trick from :   http://stackoverflow.com/questions/3209362/
                             %20how-to-plot-empirical-cdf-in-matplotlib-in-python
         to calculate CDF from samples
+
+        The table is built in one pass over blocks of chunk_size samples: each
+        block is sorted into its own table & tables of equal # blocks are
+        merged pairwise (see __merge_cdf_table_pair), so only O(log(# blocks))
+        tables of num_cdf_points knots are held at a time. Since the empirical
+        CDF is monotone and matches the knots exactly, a single block's table
+        is within the largest CDF increment between consecutive knots,
+        ceil((# samples - 1) / (num_cdf_points - 1)) / # samples, of the CDF
+        interpolating all samples, & each level of merging adds about
+        1 / num_cdf_points to this bound (see cdf_error_bound). With
+        num_cdf_points=None, the tables keep all samples & the CDF is exact,
+        which needs memory for all samples.
         """
 
-        self._CDFs = []
+        self.__set_cdf_table(self.__compute_cdf_table(self._sample_sets))
 
-        # Need to store max/min samples in each dimension to prevent out of
-        # bounds values in the interpolators later.
-        self.mins = []
-        self.maxs = []
+    def generate_correlation(self):
+        """
+        Calculates and stores sample-based correlation matrix for random vector
+        """
 
-        # Get all samples of the i^th dimension at a time to generate CDF
-        # NOTE - does iterating over / sorting happen in place? Need deep copy?
-        for samples_i in self._samples.T:
+        self._outer_product_sum = np.zeros((self._dim, self._dim))
 
-            # Generate/store interpolant for empirical CDF:
-            sorted_i = np.sort(samples_i)
-            cdf_values = np.arange(1, len(sorted_i) + 1)/float(len(sorted_i))
-            cdf_func = interpolate.interp1d(sorted_i, cdf_values)
-            self._CDFs.append(cdf_func)
+        for sample_block in self.__get_sample_blocks(self._sample_sets):
+            self._outer_product_sum += sample_block.T.dot(sample_block)
 
-            self.mins.append(sorted_i[0])
-            self.maxs.append(sorted_i[-1])
+        self._correlation = self._outer_product_sum / float(self._num_samples)
 
-    def generate_correlation(self):
+    def get_sample_blocks(self, chunk_size=None):
         """
-        Calculates and stores sample-based correlation matrix for random vector
+        Yields consecutive blocks of the samples, without joining the arrays
+        added by update/merge or loading memory-mapped samples all at once.
+
+        :param chunk_size: max. # samples per block (uses the chunk_size of
+            this random vector if None).
+        :type chunk_size: int
+        """
+
+        return self.__get_sample_blocks(self._sample_sets, chunk_size)
+
+    def __get_sample_blocks(self, sample_sets, chunk_size=None):
+        """
+        Yields consecutive blocks of at most chunk_size rows of the samples
+        in each array of sample_sets.
+        """
+
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+
+        for samples in sample_sets:
+            for start in range(0, samples.shape[0], chunk_size):
+                yield np.asarray(samples[start:start + chunk_size],
+                                 dtype=float)
+
+    def __take_samples(self, indices):
+        """
+        Returns the samples at the given (overall) indices, looking them up
+        in each array of samples without joining them.
+        """
+
+        if len(self._sample_sets) == 1:
+            return self._sample_sets[0][indices, :]
+
+        offsets = np.cumsum([0] + [len(samples)
+                                   for samples in self._sample_sets])
+        set_indices = np.searchsorted(offsets, indices, side="right") - 1
+
+        taken_samples = np.zeros(np.shape(indices) + (self._dim,))
+        for k, samples in enumerate(self._sample_sets):
+            in_set = set_indices == k
+            taken_samples[in_set] = samples[indices[in_set] - offsets[k], :]
+
+        return taken_samples
+
+    def __compute_statistics(self, sample_sets, max_moment):
+        """
+        Returns the sums of the powers 1,...,max_moment (size max_moment x dim)
+        & of the outer products (size dim x dim) of the samples, & their CDF
+        table, accumulated in a single pass over blocks of the samples.
         """
 
-        # TODO - find faster numpy/scipy function
-        self._correlation = np.zeros((self._dim, self._dim))
+        power_sums = np.zeros((max_moment, self._dim))
+        outer_product_sum = np.zeros((self._dim, self._dim))
+        cdf_sketch = []
+
+        for sample_block in self.__get_sample_blocks(sample_sets):
+            self.__accumulate_power_sums(sample_block, power_sums)
+            outer_product_sum += sample_block.T.dot(sample_block)
+            self.__add_to_cdf_sketch(cdf_sketch, sample_block)
+
+        return (power_sums, outer_product_sum,
+                self.__collapse_cdf_sketch(cdf_sketch))
+
+    def __compute_cdf_table(self, sample_sets):
+        """
+        Returns the CDF table of the samples (see __get_block_cdf_table),
+        built in a single pass over blocks of the samples.
+        """
+
+        cdf_sketch = []
+
+        for sample_block in self.__get_sample_blocks(sample_sets):
+            self.__add_to_cdf_sketch(cdf_sketch, sample_block)
+
+        return self.__collapse_cdf_sketch(cdf_sketch)
+
+    def __add_to_cdf_sketch(self, cdf_sketch, sample_block):
+        """
+        Adds the CDF table of sample_block to cdf_sketch, a list of (level,
+        CDF table) pairs where a table of level l holds 2^l blocks. Like a
+        binary counter, tables of equal level are merged, so the sketch holds
+        O(log(# blocks)) tables & each sample goes through as many merges.
+        """
+
+        cdf_table = self.__get_block_cdf_table(sample_block)
+        level = 0
+
+        while cdf_sketch and cdf_sketch[-1][0] == level:
+            cdf_table = self.__merge_cdf_table_pair(cdf_sketch.pop()[1],
+                                                    cdf_table)
+            level += 1
+
+        cdf_sketch.append((level, cdf_table))
+
+    def __collapse_cdf_sketch(self, cdf_sketch):
+        """
+        Merges the CDF tables of cdf_sketch (smallest first) into one table.
+        """
+
+        cdf_table = cdf_sketch.pop()[1]
+
+        while cdf_sketch:
+            cdf_table = self.__merge_cdf_table_pair(cdf_sketch.pop()[1],
+                                                    cdf_table)
+
+        return cdf_table
+
+    def __get_block_cdf_table(self, sample_block):
+        """
+        Returns the CDF table of a block of samples: tuple of the # samples,
+        CDF knots (size # knots x dim), CDF levels at the knots & error bound
+        of interpolating between the knots.
+        """
+
+        num_samples = sample_block.shape[0]
+        ranks = self.__get_cdf_ranks(num_samples)
+        (cdf_levels, cdf_error_bound) = self.__get_cdf_levels(ranks,
+                                                              num_samples)
+        cdf_knots = np.sort(sample_block, axis=0)[ranks, :]
+
+        return num_samples, cdf_knots, cdf_levels, cdf_error_bound
+
+    def __set_cdf_table(self, cdf_table):
+        """
+        Stores the CDF knots, levels & error bound of cdf_table.
+        """
+
+        (_, self._cdf_knots, self._cdf_levels, self._cdf_error_bound) = \
+            cdf_table
+
+        # Need to store max/min samples in each dimension for grids, etc.
+        self.mins = list(self._cdf_knots[0, :])
+        self.maxs = list(self._cdf_knots[-1, :])
+
+    def __get_cdf_ranks(self, num_samples):
+        """
+        Returns the ranks (0-based) of the sorted samples kept as CDF knots,
+        which are the same for all dims.
+        """
+
+        if self._num_cdf_points is None or \
+                self._num_cdf_points >= num_samples:
+            return np.arange(num_samples)
+
+        return np.unique(np.round(np.linspace(
+            0, num_samples - 1, self._num_cdf_points)).astype(int))
+
+    @staticmethod
+    def __get_cdf_levels(ranks, num_samples):
+        """
+        Returns the CDF values at the knots with the given ranks & the error
+        bound of interpolating between them.
+        """
+
+        cdf_levels = (ranks + 1) / float(num_samples)
+
+        if len(ranks) < num_samples:
+            cdf_error_bound = np.max(np.diff(ranks)) / float(num_samples)
+        else:
+            cdf_error_bound = 0.
+
+        return cdf_levels, cdf_error_bound
+
+    def __merge_statistics(self, num_samples, power_sums, outer_product_sum,
+                           cdf_table, sample_sets):
+        """
+        Adds the statistics (sums & CDF table) of num_samples other samples to
+        those of this random vector.
+        """
+
+        all_sample_sets = self._sample_sets + list(sample_sets)
+
+        # A compact CDF can't be merged into an exact one, so rebuild the
+        # exact CDF from all of the samples instead.
+        if self._num_cdf_points is None and cdf_table[3] > 0.:
+            merged_cdf_table = self.__compute_cdf_table(all_sample_sets)
+        else:
+            merged_cdf_table = self.__merge_cdf_table_pair(
+                (self._num_samples, self._cdf_knots, self._cdf_levels,
+                 self._cdf_error_bound), cdf_table)
+
+        self.__set_cdf_table(merged_cdf_table)
+
+        self._num_samples += num_samples
+        self._power_sums = self._power_sums + power_sums
+        self._outer_product_sum = self._outer_product_sum + outer_product_sum
+        self._sample_sets = all_sample_sets
+
+        self._moments = self._power_sums / float(self._num_samples)
+        self._correlation = self._outer_product_sum / float(self._num_samples)
+
+    def __merge_cdf_table_pair(self, cdf_table, other_cdf_table):
+        """
+        Returns the CDF table of the samples of two CDF tables (see
+        __get_block_cdf_table).
+        """
+
+        (num_samples, cdf_knots, cdf_levels, cdf_error_bound) = cdf_table
+        (other_num_samples, other_cdf_knots, other_cdf_levels,
+         other_cdf_error_bound) = other_cdf_table
+
+        total_num_samples = num_samples + other_num_samples
+
+        # If both tables hold all of their samples, the merge is exact.
+        if cdf_error_bound == 0. and other_cdf_error_bound == 0.:
+
+            sorted_samples = np.sort(np.vstack((cdf_knots, other_cdf_knots)),
+                                     axis=0)
+            ranks = self.__get_cdf_ranks(total_num_samples)
+            (merged_levels, merged_error_bound) = \
+                self.__get_cdf_levels(ranks, total_num_samples)
+
+            return (total_num_samples, sorted_samples[ranks, :],
+                    merged_levels, merged_error_bound)
+
+        # Otherwise, evaluate the (sample weighted) mixture of both CDFs on
+        # the union of their knots & invert it at evenly spaced levels.
+        num_knots = min(self._num_cdf_points, total_num_samples)
+        merged_levels = np.linspace(1. / total_num_samples, 1., num_knots)
+        merged_knots = np.zeros((num_knots, self._dim))
+
+        for d in range(self._dim):
+
+            x_grid = np.union1d(cdf_knots[:, d], other_cdf_knots[:, d])
+            merged_cdf = \
+                (num_samples * np.interp(x_grid, cdf_knots[:, d], cdf_levels,
+                                         0., 1.) +
+                 other_num_samples * np.interp(x_grid, other_cdf_knots[:, d],
+                                               other_cdf_levels, 0., 1.)) / \
+                total_num_samples
+
+            merged_knots[:, d] = np.interp(merged_levels, merged_cdf, x_grid)
+
+        # Mixture of both errors, plus the difference between interpolating
+        # the separate & joint empirical CDFs (<= 3 / # samples) & the error
+        # of interpolating between the new knots.
+        merged_error_bound = \
+            (num_samples * cdf_error_bound +
+             other_num_samples * other_cdf_error_bound + 3.) / \
+            total_num_samples + (merged_levels[1] - merged_levels[0])
+
+        return (total_num_samples, merged_knots, merged_levels,
+                merged_error_bound)
+
+    @staticmethod
+    def __accumulate_power_sums(sample_block, power_sums):
+        """
+        Adds the sums over sample_block of each power 1,...,len(power_sums) of
+        the samples to power_sums, raising the block to successive powers in
+        place.
+        """
+
+        max_moment = power_sums.shape[0]
+
+        powers = np.array(sample_block, dtype=float)
+        for q in range(max_moment):
+            power_sums[q, :] += np.sum(powers, axis=0)
+
+            if q < max_moment - 1:
+                powers *= sample_block
+
+    def __open_sample_file(self, file_name, chunk_size):
+        """
+        Returns a read-only memory-mapped array of the samples in file_name.
+        .npy files are mapped directly; text files (whitespace or, for .csv,
+        comma delimited) are read chunk_size lines at a time into a (named, so
+        that it can be mapped again by pickled copies) temporary binary file
+        that is then mapped.
+        """
+
+        if file_name.endswith(".npy"):
+            return np.load(file_name, mmap_mode="r")
+
+        delimiter = "," if file_name.endswith(".csv") else None
+
+        self._sample_file = tempfile.NamedTemporaryFile(suffix=".bin")
+        (num_samples, dim) = (0, None)
+
+        with open(file_name, "r") as text_file:
+
+            lines = (line for line in text_file
+                     if line.strip() and not line.lstrip().startswith("#"))
+
+            while True:
+                chunk_lines = list(itertools.islice(lines, chunk_size))
+                if not chunk_lines:
+                    break
+
+                chunk = np.loadtxt(chunk_lines, delimiter=delimiter,
+                                   ndmin=2, dtype=float)
+
+                if dim is None:
+                    dim = chunk.shape[1]
+                elif chunk.shape[1] != dim:
+                    raise ValueError("Inconsistent # columns in sample file")
+
+                self._sample_file.write(chunk.tobytes())
+                num_samples += chunk.shape[0]
+
+        if num_samples == 0:
+            raise ValueError("Sample file %s contains no samples" % file_name)
+
+        self._sample_file.flush()
 
-        factor = (1./float(self._num_samples))
-        for sample in self._samples:
-            self._correlation = self._correlation +\
-                                factor * np.outer(sample, sample)
+        return np.memmap(self._sample_file, dtype=float, mode="r",
+                         shape=(num_samples, dim))
@@ -43,7 +43,7 @@ class UniformRandomVariable(RandomVariable):
         self._moments = None
 
         # Set dimension (scalar), min/max to equal mean +/- 4stds.
-        self.dim = 1
+        self._dim = 1
         self.mins = [min_val]
         self.maxs = [max_val]
 
@@ -55,7 +55,7 @@ class UniformRandomVariable(RandomVariable):
         """
         Returns variance of uniform random variable
         """
-        return self._std**2.0
+        return self._range_size ** 2.0 / 12.0
 
     def compute_moments(self, max_order):
         """
@@ -92,15 +92,18 @@ class UniformRandomVariable(RandomVariable):
         """
         return scipy_uniform.pdf(x_grid, self._minimum_value, self._range_size)
 
-    def draw_random_sample(self, sample_size):
+    def draw_random_sample(self, sample_size, rng=None):
         """
         Draws random samples from the uniform random variable. Returns numpy
-        array of length 'sample_size' containing these samples
+        array of length 'sample_size' containing these samples. rng is an
+        optional numpy Generator (or seed) to draw with.
         """
 
         # Use scipy uniform rv to return shifted/scaled samples automatically.
+        random_state = None if rng is None else \
+            np.random.default_rng(rng)
         return scipy_uniform.rvs(self._minimum_value, self._range_size,
-                                 sample_size)
+                                 sample_size, random_state=random_state)
 
     def generate_moments(self, max_moment):
         """
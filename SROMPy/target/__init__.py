@@ -16,8 +16,10 @@
 name = "target"
 from .AnalyticRandomVector import AnalyticRandomVector
 from .BetaRandomVariable import BetaRandomVariable
+from .CalibrationCache import CalibrationCache
 from .DiscreteRandomVector import DiscreteRandomVector
 from .GammaRandomVariable import GammaRandomVariable
+from .NatafCalibration import NatafCalibration
 from .NormalRandomVariable import NormalRandomVariable
 from .RandomVariable import RandomVariable
 from .RandomVector import RandomVector
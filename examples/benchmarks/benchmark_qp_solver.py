@@ -0,0 +1,110 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Compares the dedicated active-set QP solver (method='qp') against scipy's
+SLSQP for the sequential SROM probability subproblem - optimal probabilities
+for a fixed set of SROM samples under the SSE error - for a range of SROM
+sizes (m).
+
+Usage: python benchmark_qp_solver.py [max_slsqp_size]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.optimize as opt
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                             '..', '..'))
+    sys.path.insert(0, base_path)
+
+from SROMPy.optimize import ObjectiveFunction, QuadraticObjective, SimplexQP
+from SROMPy.srom import SROM
+from SROMPy.target import SampleRandomVector
+
+SROM_SIZES = [10, 20, 50, 100, 200, 500]
+DIMENSION = 2
+NUM_TARGET_SAMPLES = 5000
+
+
+def solve_slsqp(hessian, linear_term):
+
+    size = linear_term.size
+    constraint = {'type': 'eq', 'fun': lambda p: np.sum(p) - 1.,
+                  'jac': lambda p: np.ones((1, size))}
+
+    result = opt.minimize(lambda p: 0.5 * p.dot(hessian).dot(p) -
+                          linear_term.dot(p),
+                          np.ones(size) / size,
+                          jac=lambda p: hessian.dot(p) - linear_term,
+                          method='SLSQP',
+                          bounds=[(0., 1.)] * size,
+                          constraints=constraint)
+
+    return result['x']
+
+
+def run_benchmark(max_slsqp_size=500):
+
+    np.random.seed(0)
+    target = SampleRandomVector(np.random.rand(NUM_TARGET_SAMPLES, DIMENSION))
+
+    print("%5s %12s %12s %12s %14s" %
+          ("m", "slsqp (s)", "qp (s)", "speedup", "objective diff"))
+
+    for size in SROM_SIZES:
+
+        objective_function = ObjectiveFunction(SROM(size, DIMENSION), target)
+        quadratic_objective = \
+            QuadraticObjective(objective_function.target_statistics,
+                               objective_function.weights,
+                               target.draw_random_sample(size))
+        hessian = quadratic_objective.hessian
+        linear_term = quadratic_objective.linear_term
+
+        t0 = time.time()
+        qp_probabilities = SimplexQP.solve_active_set(hessian, linear_term)
+        qp_time = time.time() - t0
+        qp_objective = quadratic_objective.evaluate(qp_probabilities)[0][0]
+
+        if size > max_slsqp_size:
+            print("%5d %12s %12.4f %12s %14s" %
+                  (size, "-", qp_time, "-", "-"))
+            continue
+
+        t0 = time.time()
+        slsqp_probabilities = solve_slsqp(hessian[0], linear_term[0])
+        slsqp_time = time.time() - t0
+        slsqp_objective = \
+            quadratic_objective.evaluate(slsqp_probabilities)[0][0]
+
+        print("%5d %12.4f %12.4f %11.1fx %14.2e" %
+              (size, slsqp_time, qp_time, slsqp_time / qp_time,
+               qp_objective - slsqp_objective))
+
+
+if __name__ == '__main__':
+
+    max_size = 500
+    if len(sys.argv) > 1:
+        max_size = int(sys.argv[1])
+
+    run_benchmark(max_size)
@@ -0,0 +1,144 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Compares the vectorized SROM statistics (moments, empirical/smooth CDFs,
+correlation matrix) against the original per-sample loop implementations for
+a range of SROM sizes (m) and dimensions (d).
+
+Usage: python benchmark_srom_statistics.py [num_repeats]
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+from scipy.special import erf
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                             '..', '..'))
+    sys.path.insert(0, base_path)
+
+from SROMPy.srom import SROM
+
+SROM_SIZES = [10, 20, 50, 100, 200]
+DIMENSIONS = [1, 2, 5, 10, 20]
+MAX_MOMENT = 5
+NUM_GRID_POINTS = 100
+SCALE = 0.1
+
+
+# ------------Reference (loop-based) implementations-----------------------
+def loop_moments(samples, probabilities, max_order):
+
+    moments = np.zeros((max_order, samples.shape[1]))
+    for q in range(max_order):
+        moment_q = np.zeros((1, samples.shape[1]))
+        for k, sample in enumerate(samples):
+            moment_q = moment_q + probabilities[k] * pow(sample, q + 1)
+        moments[q, :] = moment_q
+
+    return moments
+
+
+def loop_cdf_empirical(samples, probabilities, x_grid):
+
+    cdf_values = np.zeros(x_grid.shape)
+    for i, grid in enumerate(x_grid.T):
+        for k, sample in enumerate(samples):
+            indices = grid >= sample[i]
+            cdf_values[indices, i] += probabilities[k]
+
+    return cdf_values
+
+
+def loop_cdf_smooth(samples, probabilities, x_grid, sigma):
+
+    cdf_values = np.zeros(x_grid.shape)
+    for i, grid in enumerate(x_grid.T):
+        for k in range(samples.shape[0]):
+            cdf_values[:, i] += 0.5 * probabilities[k] * \
+                (1.0 + erf((grid - samples[k, i]) / (np.sqrt(2) * sigma)))
+
+    return cdf_values
+
+
+def loop_corr_mat(samples, probabilities):
+
+    corr = np.zeros((samples.shape[1], samples.shape[1]))
+    for k, sample in enumerate(samples):
+        corr = corr + np.outer(sample, sample) * probabilities[k]
+
+    return corr
+
+
+# -----------------------------------------------------------------
+def time_call(func, num_repeats):
+    return min(timeit.repeat(func, number=1, repeat=num_repeats))
+
+
+def run_benchmark(num_repeats=5):
+
+    np.random.seed(0)
+
+    print("%5s %5s %12s %12s %12s %12s" %
+          ("m", "d", "moments", "cdf (emp)", "cdf (erf)", "corr"))
+
+    for size in SROM_SIZES:
+        for dim in DIMENSIONS:
+
+            samples = np.random.rand(size, dim)
+            probabilities = np.random.rand(size)
+            probabilities /= np.sum(probabilities)
+            x_grid = np.repeat(np.linspace(0., 1., NUM_GRID_POINTS)
+                               .reshape((NUM_GRID_POINTS, 1)), dim, axis=1)
+
+            srom = SROM(size, dim)
+            srom.set_params(samples, probabilities)
+
+            cases = [
+                (lambda: loop_moments(samples, probabilities, MAX_MOMENT),
+                 lambda: srom.compute_moments(MAX_MOMENT)),
+                (lambda: loop_cdf_empirical(samples, probabilities, x_grid),
+                 lambda: srom._compute_cdf_empirical(NUM_GRID_POINTS, x_grid)),
+                (lambda: loop_cdf_smooth(samples, probabilities, x_grid, SCALE),
+                 lambda: srom._compute_cdf_smooth(NUM_GRID_POINTS, x_grid,
+                                                  SCALE)),
+                (lambda: loop_corr_mat(samples, probabilities),
+                 lambda: srom.compute_corr_mat())]
+
+            speedups = []
+            for loop_func, vectorized_func in cases:
+
+                assert np.allclose(loop_func(), vectorized_func())
+
+                loop_time = time_call(loop_func, num_repeats)
+                vectorized_time = time_call(vectorized_func, num_repeats)
+                speedups.append(loop_time / vectorized_time)
+
+            print("%5d %5d %11.1fx %11.1fx %11.1fx %11.1fx" %
+                  tuple([size, dim] + speedups))
+
+
+if __name__ == '__main__':
+
+    repeats = 5
+    if len(sys.argv) > 1:
+        repeats = int(sys.argv[1])
+
+    run_benchmark(repeats)
@@ -0,0 +1,106 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+Compares the throughput (input samples per second) of the KD-tree based
+SROMSurrogate sampling against the original per-sample loop that computes
+distances to every SROM sample, for piecewise constant & linear surrogates.
+
+Usage: python benchmark_srom_surrogate.py [num_input_samples]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                             '..', '..'))
+    sys.path.insert(0, base_path)
+
+from SROMPy.srom import SROM, SROMSurrogate
+
+SROM_SIZES = [10, 50, 200]
+DIMENSIONS = [1, 3, 10]
+OUTPUT_DIMENSION = 2
+NUM_LOOP_SAMPLES = 20000
+
+
+# ------------Reference (loop-based) implementation-----------------------
+def loop_sample(srom_samples, output_samples, gradients, input_samples):
+
+    surrogate_samples = np.zeros((input_samples.shape[0],
+                                  output_samples.shape[1]))
+    for i in range(input_samples.shape[0]):
+        diffs = input_samples[i, :] - srom_samples
+        srom_index = np.argmin(np.linalg.norm(diffs, axis=1))
+        surrogate_samples[i, :] = output_samples[srom_index, :]
+        if gradients is not None:
+            surrogate_samples[i, :] += np.dot(gradients[srom_index, :],
+                                              diffs[srom_index, :])
+
+    return surrogate_samples
+
+
+# -----------------------------------------------------------------
+def run_benchmark(num_input_samples=1000000):
+
+    np.random.seed(0)
+
+    print("%5s %5s %8s %16s %16s %10s" %
+          ("m", "d", "model", "loop (smp/s)", "kd-tree (smp/s)", "speedup"))
+
+    for size in SROM_SIZES:
+        for dim in DIMENSIONS:
+
+            srom = SROM(size, dim)
+            srom.set_params(np.random.rand(size, dim), np.ones(size) / size)
+            output_samples = np.random.rand(size, OUTPUT_DIMENSION)
+            input_samples = np.random.rand(num_input_samples, dim)
+
+            for model, gradients in [("const", None),
+                                     ("linear", np.random.rand(size, dim))]:
+
+                surrogate = SROMSurrogate(srom, output_samples, gradients)
+
+                t0 = time.time()
+                loop_results = loop_sample(srom.samples, output_samples,
+                                           gradients,
+                                           input_samples[:NUM_LOOP_SAMPLES])
+                loop_rate = NUM_LOOP_SAMPLES / (time.time() - t0)
+
+                t0 = time.time()
+                tree_results = surrogate.sample(input_samples)
+                tree_rate = num_input_samples / (time.time() - t0)
+
+                assert np.allclose(loop_results,
+                                   tree_results[:NUM_LOOP_SAMPLES])
+
+                print("%5d %5d %8s %16.3e %16.3e %9.1fx" %
+                      (size, dim, model, loop_rate, tree_rate,
+                       tree_rate / loop_rate))
+
+
+if __name__ == '__main__':
+
+    num_samples = 1000000
+    if len(sys.argv) > 1:
+        num_samples = int(sys.argv[1])
+
+    run_benchmark(num_samples)
@@ -28,6 +28,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/NASA/SROMPy",
     packages=["SROMPy",
+              "SROMPy.benchmarks",
               "SROMPy.optimize",
               "SROMPy.postprocess",
               "SROMPy.srom",
@@ -0,0 +1,99 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import json
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.benchmarks import BenchmarkRunner, ObjectiveBenchmarks, \
+    PostprocessBenchmarks
+
+
+class ExampleBenchmarks(object):
+
+    params = [[1, 2], ["a", "b"]]
+    param_names = ["number", "letter"]
+
+    def setup(self, number, letter):
+        self.values = [letter] * number
+
+    def time_join(self, number, letter):
+        "".join(self.values)
+
+    def time_count(self, number, letter):
+        self.values.count(letter)
+
+
+def test_runs_every_parameter_combination():
+
+    results = BenchmarkRunner([ExampleBenchmarks], num_repeats=2).run(
+        verbose=False)
+
+    assert len(results) == 8
+    assert {result["name"] for result in results} == \
+        {"ExampleBenchmarks.time_count", "ExampleBenchmarks.time_join"}
+    assert {"number": 2, "letter": "b"} in \
+        [result["params"] for result in results]
+
+    for result in results:
+        assert len(result["times"]) == 2
+        assert result["min"] <= result["median"]
+
+
+def test_quick_run_and_pattern():
+
+    runner = BenchmarkRunner([ExampleBenchmarks], num_repeats=1, quick=True)
+    results = runner.run(pattern="join$", verbose=False)
+
+    assert len(results) == 1
+    assert results[0]["name"] == "ExampleBenchmarks.time_join"
+    assert results[0]["params"] == {"number": 1, "letter": "a"}
+
+
+def test_srompy_benchmarks_save_and_compare(tmp_path):
+
+    runner = BenchmarkRunner([ObjectiveBenchmarks, PostprocessBenchmarks],
+                             num_repeats=1, quick=True)
+    results = runner.run(verbose=False)
+    assert len(results) == 4
+
+    file_name = str(tmp_path / "results.json")
+    runner.save(results, file_name)
+
+    with open(file_name, "r") as results_file:
+        saved_results = json.load(results_file)
+
+    assert "numpy_version" in saved_results["metadata"]
+    assert saved_results["results"] == results
+
+    comparisons = BenchmarkRunner.compare(file_name, results)
+    assert len(comparisons) == 4
+    for comparison in comparisons:
+        assert comparison["ratio"] == 1.
+        assert not comparison["regression"]
+
+
+def test_invalid_num_repeats_raises_value_error():
+
+    with pytest.raises(ValueError):
+        BenchmarkRunner(num_repeats=0)
@@ -0,0 +1,105 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import pytest
+import numpy as np
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.optimize import CandidateGenerator
+from SROMPy.target import AnalyticRandomVector, BetaRandomVariable, \
+    NormalRandomVariable, SampleRandomVector
+
+
+@pytest.fixture
+def sample_random_vector():
+
+    np.random.seed(1)
+    return SampleRandomVector(np.random.rand(500, 2))
+
+
+@pytest.fixture
+def analytic_random_vector():
+
+    components = [BetaRandomVariable(2., 3.), NormalRandomVariable()]
+    return AnalyticRandomVector(components, np.array([[1., 0.3], [0.3, 1.]]),
+                                cache=False)
+
+
+def test_invalid_parameters_rejected(sample_random_vector):
+
+    with pytest.raises(ValueError):
+        CandidateGenerator(sample_random_vector, 10, 2, "grid")
+
+    with pytest.raises(ValueError):
+        CandidateGenerator(sample_random_vector, 10, 2, pool_size=5)
+
+    # Sample-based targets need at least srom_size samples to pick from.
+    with pytest.raises(ValueError):
+        CandidateGenerator(SampleRandomVector(np.random.rand(8, 2)), 10, 2)
+
+
+@pytest.mark.parametrize("method", CandidateGenerator.METHODS)
+def test_candidates_for_every_target_type(sample_random_vector,
+                                          analytic_random_vector, method):
+
+    targets = [(sample_random_vector, 2), (analytic_random_vector, 2),
+               (NormalRandomVariable(), 1)]
+
+    for target, dim in targets:
+        generator = CandidateGenerator(target, 8, dim, method.upper())
+
+        np.random.seed(2)
+        candidate = generator.draw()
+        assert candidate.shape == (8, dim)
+        assert np.all(np.isfinite(candidate))
+
+        # Reproducible with numpy's global random state.
+        np.random.seed(2)
+        assert np.allclose(candidate, generator.draw())
+
+        assert generator.draw(3).shape == (3, 8, dim)
+
+
+@pytest.mark.parametrize("method", ["sobol", "halton", "lhs", "kmedoids"])
+def test_sample_target_candidates_are_distinct_samples(sample_random_vector,
+                                                       method):
+
+    generator = CandidateGenerator(sample_random_vector, 10, 2, method)
+    candidate = generator.draw()
+
+    samples = sample_random_vector.samples
+    matches = [np.flatnonzero(np.all(samples == row, axis=1))
+               for row in candidate]
+
+    assert all(len(match) == 1 for match in matches)
+    assert len(np.unique(np.concatenate(matches))) == 10
+
+
+def test_latin_hypercube_stratifies_marginals():
+
+    generator = CandidateGenerator(NormalRandomVariable(), 10, 1, "lhs")
+    candidate = generator.draw()
+
+    # One sample in each decile of the std normal.
+    deciles = np.searchsorted(NormalRandomVariable().compute_inv_cdf(
+        np.linspace(0.1, 0.9, 9)), candidate[:, 0])
+    assert np.array_equal(np.sort(deciles), np.arange(10))
@@ -24,7 +24,7 @@ if 'PYTHONPATH' not in os.environ:
     sys.path.insert(0, base_path)
 
 from SROMPy.srom import SROM
-from SROMPy.optimize import Gradient
+from SROMPy.optimize import Gradient, ObjectiveFunction
 from SROMPy.target import SampleRandomVector
 
 
@@ -89,3 +89,87 @@ def test_gradient_joint(valid_srom, gradient_joint):
 
     assert isinstance(results, np.ndarray)
     assert results.size == (valid_srom.size * valid_srom.dim + valid_srom.size)
+
+
+def test_correlation_gradient_matches_finite_differences():
+    np.random.seed(2)
+    target = SampleRandomVector(np.random.rand(100, 3) + 0.5)
+    srom = SROM(6, 3)
+    weights = np.array([0., 0., 1.])
+
+    objective_function = ObjectiveFunction(srom, target, weights, 'SSE')
+    gradient = Gradient(srom, target, weights, 'SSE', joint_opt=True,
+                        target_statistics=objective_function.target_statistics)
+
+    samples = np.random.rand(6, 3) + 0.5
+    probabilities = np.random.rand(6)
+    probabilities /= np.sum(probabilities)
+
+    def correlation_error(parameters):
+        srom.set_params(parameters[:18].reshape(6, 3), parameters[18:])
+        return objective_function.compute_correlation_error()
+
+    parameters = np.hstack((samples.flatten(), probabilities))
+    step = 1e-6
+    finite_differences = np.zeros(parameters.size)
+    for i in range(parameters.size):
+        perturbation = np.zeros(parameters.size)
+        perturbation[i] = step
+        finite_differences[i] = (correlation_error(parameters + perturbation) -
+                                 correlation_error(parameters - perturbation))
+        finite_differences[i] /= 2. * step
+
+    srom.set_params(samples, probabilities)
+    analytic_gradient = gradient.compute_gradient(samples, probabilities)
+
+    assert np.allclose(analytic_gradient, finite_differences, rtol=1e-5,
+                       atol=1e-8)
+
+
+@pytest.mark.parametrize("cdf_chunk_size", [None, 7])
+def test_smooth_cdf_gradient_matches_finite_differences(cdf_chunk_size):
+    np.random.seed(3)
+    target = SampleRandomVector(np.random.rand(100, 2))
+    srom = SROM(5, 2)
+    srom._scale = 0.1
+    weights = np.array([1., 0., 0.])
+
+    objective_function = ObjectiveFunction(srom, target, weights, 'SSE',
+                                           num_cdf_grid_points=50)
+    gradient = Gradient(srom, target, weights, 'SSE', scale=0.1,
+                        joint_opt=True,
+                        target_statistics=objective_function.target_statistics,
+                        cdf_chunk_size=cdf_chunk_size)
+
+    samples = np.random.rand(5, 2)
+    probabilities = np.random.rand(5)
+    probabilities /= np.sum(probabilities)
+
+    def cdf_error(parameters):
+        srom.set_params(parameters[:10].reshape(5, 2), parameters[10:])
+        return objective_function.compute_cdf_error()
+
+    parameters = np.hstack((samples.flatten(), probabilities))
+    step = 1e-6
+    finite_differences = np.zeros(parameters.size)
+    for i in range(parameters.size):
+        perturbation = np.zeros(parameters.size)
+        perturbation[i] = step
+        finite_differences[i] = (cdf_error(parameters + perturbation) -
+                                 cdf_error(parameters - perturbation))
+        finite_differences[i] /= 2. * step
+
+    srom.set_params(samples, probabilities)
+    analytic_gradient = gradient.compute_gradient(samples, probabilities)
+
+    assert np.allclose(analytic_gradient, finite_differences, rtol=1e-5,
+                       atol=1e-6)
+
+
+def test_invalid_cdf_chunk_size_rejected(sample_random_vector, valid_srom):
+
+    with pytest.raises(TypeError):
+        Gradient(valid_srom, sample_random_vector, cdf_chunk_size=1.5)
+
+    with pytest.raises(ValueError):
+        Gradient(valid_srom, sample_random_vector, cdf_chunk_size=0)
@@ -175,3 +175,33 @@ def test_evaluate_returns_expected_result_smooth(valid_srom_smooth, sample_rando
 
                     assert isinstance(error, float)
                     assert error > 0.
+
+
+def test_target_statistics_precomputed(valid_srom, sample_random_vector,
+                                       monkeypatch):
+
+    objective_function = ObjectiveFunction(srom=valid_srom,
+                                           target=sample_random_vector,
+                                           error="SSE")
+    target_statistics = objective_function.target_statistics
+
+    # Target is never queried again once the objective is constructed.
+    def fail(*args):
+        raise AssertionError("Target statistics should be cached")
+
+    monkeypatch.setattr(sample_random_vector, "compute_cdf", fail)
+    monkeypatch.setattr(sample_random_vector, "compute_moments", fail)
+
+    samples = np.random.rand(valid_srom.size, valid_srom.dim)
+    probabilities = np.ones(valid_srom.size) / valid_srom.size
+
+    for _ in range(3):
+        objective_function.evaluate(samples, probabilities)
+
+    assert target_statistics.queries_avoided['cdf'] == 3
+    assert target_statistics.queries_avoided['moments'] == 3
+    assert target_statistics.num_queries_avoided == 6
+
+    # Cached statistics are read-only.
+    with pytest.raises(ValueError):
+        target_statistics.get_moments()[0, 0] = 0.
@@ -0,0 +1,100 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import numpy as np
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.srom import SROM
+from SROMPy.optimize import Gradient, ObjectiveFunction, ObjectiveGradient
+from SROMPy.target import SampleRandomVector
+
+
+@pytest.fixture
+def sample_random_vector():
+    np.random.seed(1)
+    random_vector = np.random.rand(50, 2)
+    return SampleRandomVector(random_vector)
+
+
+@pytest.fixture
+def valid_srom():
+    return SROM(10, 2)
+
+
+@pytest.fixture
+def srom_samples():
+    np.random.seed(2)
+    return np.random.rand(10, 2)
+
+
+@pytest.fixture
+def objective_gradient(sample_random_vector, valid_srom, srom_samples):
+    objective_function = ObjectiveFunction(valid_srom, sample_random_vector,
+                                           error='SSE')
+    gradient = Gradient(valid_srom, sample_random_vector, error='SSE',
+                        target_statistics=objective_function.target_statistics)
+
+    return ObjectiveGradient(objective_function, gradient, srom_samples,
+                             valid_srom.size, valid_srom.dim, False)
+
+
+def test_evaluate_matches_separate_evaluations(sample_random_vector,
+                                               valid_srom, srom_samples,
+                                               objective_gradient):
+
+    objective_function = ObjectiveFunction(valid_srom, sample_random_vector,
+                                           error='SSE')
+    gradient = Gradient(valid_srom, sample_random_vector, error='SSE')
+
+    probabilities = np.ones(valid_srom.size) / valid_srom.size
+
+    error, grad = objective_gradient.evaluate(probabilities)
+
+    assert np.isclose(error, objective_function.evaluate(srom_samples,
+                                                         probabilities))
+    assert np.allclose(grad, gradient.evaluate(srom_samples, probabilities))
+
+
+def test_repeated_evaluation_uses_cache(valid_srom, objective_gradient,
+                                        monkeypatch):
+
+    num_srom_cdf_evaluations = [0]
+    compute_cdf = valid_srom.compute_cdf
+
+    def counting_compute_cdf(x_grid):
+        num_srom_cdf_evaluations[0] += 1
+        return compute_cdf(x_grid)
+
+    monkeypatch.setattr(valid_srom, "compute_cdf", counting_compute_cdf)
+
+    probabilities = np.ones(10) / 10.
+
+    # Objective & gradient at the same point share one SROM CDF evaluation.
+    error = objective_gradient.objective(probabilities)
+    objective_gradient.gradient(probabilities)
+    assert objective_gradient.evaluate(probabilities)[0] == error
+    assert num_srom_cdf_evaluations[0] == 1
+
+    # New design point requires new statistics.
+    objective_gradient.evaluate(probabilities * 0.5)
+    assert num_srom_cdf_evaluations[0] == 2
@@ -0,0 +1,99 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import pytest
+import json
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.optimize import OptimizationReport
+
+
+@pytest.fixture
+def report():
+
+    report = OptimizationReport()
+    report.num_objective_evaluations = 10
+    report.num_gradient_evaluations = 8
+    report.timers["solver"] = 1.
+    report.timers["objective"] = 0.25
+    report.timers["gradient"] = 0.5
+
+    report.record_restart(3., 0.1, num_iterations=4)
+    report.record_restart(2., 0.2, success=False, message="Iteration limit")
+    report.record_restart(2.5, 0.1)
+
+    return report
+
+
+def test_record_restart_tracks_best_objective(report):
+
+    assert report.num_restarts == 3
+    assert [restart["index"] for restart in report.restarts] == [0, 1, 2]
+    assert [restart["best_objective"] for restart in report.restarts] == \
+        [3., 2., 2.]
+    assert report.best_objective == 2.
+    assert report.restarts[0]["num_iterations"] == 4
+    assert not report.restarts[1]["success"]
+
+
+def test_solver_overhead_excludes_evaluations(report):
+
+    assert report.solver_overhead == pytest.approx(0.25)
+
+
+def test_timer_accumulates_phase_time(report):
+
+    with report.timer("target"):
+        pass
+
+    with pytest.raises(RuntimeError):
+        with report.timer("target"):
+            raise RuntimeError()
+
+    assert report.timers["target"] > 0.
+
+
+def test_merge_adds_counters_and_restarts(report):
+
+    other = OptimizationReport()
+    other.num_objective_evaluations = 5
+    other.timers["total"] = 10.
+    other.timers["solver"] = 2.
+    other.record_restart(1., 0.3)
+
+    report.merge(other)
+
+    assert report.num_objective_evaluations == 15
+    assert report.timers["solver"] == pytest.approx(3.)
+    assert report.timers["total"] == 0.
+    assert report.num_restarts == 4
+    assert report.restarts[-1]["index"] == 3
+    assert report.best_objective == 1.
+
+
+def test_to_dict_is_json_serializable(report):
+
+    report_dict = json.loads(json.dumps(report.to_dict()))
+
+    assert report_dict["num_restarts"] == 3
+    assert report_dict["timers"]["solver"] == 1.
+    assert "Restarts: 3 (2 converged)" in str(report)
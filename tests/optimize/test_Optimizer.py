@@ -16,6 +16,8 @@
 import pytest
 import numpy as np
 import os
+import shutil
+import subprocess
 import sys
 
 if 'PYTHONPATH' not in os.environ:
@@ -25,9 +27,12 @@ if 'PYTHONPATH' not in os.environ:
     sys.path.insert(0, base_path)
 
 
+from SROMPy.optimize import CandidateGenerator
 from SROMPy.optimize import Optimizer
+from SROMPy.optimize import RestartController
 from SROMPy.srom import SROM
-from SROMPy.target import SampleRandomVector
+from SROMPy.target import AnalyticRandomVector, SampleRandomVector, \
+    UniformRandomVariable
 
 
 @pytest.fixture
@@ -142,3 +147,336 @@ def test_get_joint_optimal_params(sample_random_vector, valid_srom):
                                                           joint_opt=True,
                                                           verbose=True)
     assert np.allclose([np.sum(probabilities)], [1.])
+
+
+def test_batched_optimal_params(sample_random_vector, valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    samples, probabilities = optimizer.get_optimal_params(num_test_samples=25,
+                                                          verbose=False,
+                                                          batch_size=10)
+
+    assert samples.shape == (10, 1)
+    assert np.all(probabilities >= 0.)
+    assert np.allclose([np.sum(probabilities)], [1.])
+
+    with pytest.raises(ValueError):
+        optimizer.get_optimal_params(batch_size=0)
+
+    with pytest.raises(ValueError):
+        optimizer.get_optimal_params(batch_size=10, joint_opt=True)
+
+
+def test_qp_optimal_params(sample_random_vector, valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    samples, probabilities = optimizer.get_optimal_params(num_test_samples=5,
+                                                          method='qp',
+                                                          verbose=False)
+
+    assert np.all(probabilities >= 0.)
+    assert np.allclose([np.sum(probabilities)], [1.])
+
+    with pytest.raises(ValueError):
+        optimizer.get_optimal_params(method='qp', joint_opt=True)
+
+    with pytest.raises(ValueError):
+        Optimizer(sample_random_vector, valid_srom,
+                  error='MEAN').get_optimal_params(method='qp')
+
+
+def test_process_pool_restarts_are_reproducible(sample_random_vector,
+                                                valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    with pytest.raises(ValueError):
+        optimizer.get_optimal_params(num_test_samples=4, n_jobs=0)
+
+    results = [optimizer.get_optimal_params(num_test_samples=4, n_jobs=2,
+                                            verbose=False)
+               for _ in range(2)]
+
+    for samples, probabilities in results:
+        assert samples.shape == (valid_srom.size, valid_srom.dim)
+        assert np.allclose([np.sum(probabilities)], [1.])
+
+    # Same worker random number streams give the same optimum.
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.allclose(results[0][1], results[1][1])
+
+
+@pytest.mark.parametrize("method,batch_size", [(None, None), ('qp', None),
+                                               ('qp', 3)])
+def test_optimization_report(sample_random_vector, valid_srom, method,
+                             batch_size):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+    restarts = []
+
+    with pytest.raises(TypeError):
+        optimizer.get_optimal_params(callback=1)
+
+    samples, probabilities = optimizer.get_optimal_params(
+        num_test_samples=5, method=method, verbose=False,
+        batch_size=batch_size, callback=restarts.append)
+    report = optimizer.report
+
+    assert report.num_restarts == 5
+    assert restarts == report.restarts
+    assert report.num_target_queries >= 5
+    assert report.num_objective_evaluations >= 5
+    assert report.timers["total"] >= report.timers["solver"] > 0.
+    assert sum(report.target_queries_avoided.values()) > 0
+    assert set(report.errors) == {"moment", "cdf", "correlation"}
+
+    objective = optimizer.get_scipy_objective(samples, False)[0](probabilities)
+    assert np.isclose(report.best_objective, objective)
+
+
+def test_restarts_use_seeded_generator(sample_random_vector, valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    # Restarts don't depend on numpy's global random state.
+    results = []
+    for global_seed in [0, 1]:
+        np.random.seed(global_seed)
+        results.append(optimizer.get_optimal_params(
+            num_test_samples=4, method='qp', verbose=False,
+            candidates='lhs'))
+
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.allclose(results[0][1], results[1][1])
+
+
+def test_process_pool_without_restarts_on_cpu(monkeypatch,
+                                              sample_random_vector,
+                                              valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    # One restart split over two (MPI) CPUs leaves none for this CPU, which
+    # gets the other CPU's optimum.
+    other_cpu_optimum = (np.random.rand(valid_srom.size, valid_srom.dim),
+                         np.ones(valid_srom.size) / valid_srom.size)
+    local_results = []
+
+    def get_optimal_parallel_results(result, samples, probabilities):
+        local_results.append((result, samples, probabilities))
+        return other_cpu_optimum
+
+    monkeypatch.setattr(optimizer, "number_CPUs", 2)
+    monkeypatch.setattr(optimizer,
+                        "_Optimizer__get_optimal_parallel_results",
+                        get_optimal_parallel_results)
+
+    samples, probabilities = optimizer.get_optimal_params(
+        num_test_samples=1, n_jobs=2, verbose=False)
+
+    assert local_results == [(np.inf, None, None)]
+    assert np.array_equal(samples, other_cpu_optimum[0])
+    assert optimizer.report.num_restarts == 0
+
+
+def test_process_pool_report_merges_workers(sample_random_vector,
+                                            valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+    restarts = []
+
+    optimizer.get_optimal_params(num_test_samples=4, n_jobs=2, verbose=False,
+                                 callback=lambda restart:
+                                 restarts.append(restart))
+
+    assert optimizer.report.num_restarts == 4
+    assert len(restarts) == 4
+    assert optimizer.report.num_gradient_evaluations > 0
+
+
+@pytest.mark.parametrize("joint_opt,batch_size", [(False, None),
+                                                  (False, 4), (True, None)])
+def test_restart_controller_stops_early(sample_random_vector, valid_srom,
+                                        joint_opt, batch_size):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom,
+                          joint_opt=joint_opt, scale=0.1)
+
+    with pytest.raises(TypeError):
+        optimizer.get_optimal_params(restart_controller=1)
+
+    samples, probabilities = optimizer.get_optimal_params(
+        num_test_samples=50, joint_opt=joint_opt, verbose=False,
+        batch_size=batch_size, restart_controller=RestartController(
+            target_objective=np.inf, min_restarts=3))
+
+    # Batches are only checked once complete.
+    assert optimizer.report.num_restarts == (4 if batch_size else 3)
+    assert optimizer.report.stop_reason == "target_objective"
+    assert np.allclose([np.sum(probabilities)], [1.])
+
+    optimizer.get_optimal_params(num_test_samples=3, joint_opt=joint_opt,
+                                 verbose=False, batch_size=batch_size,
+                                 restart_controller=RestartController(
+                                     patience=10))
+    assert optimizer.report.num_restarts == 3
+    assert optimizer.report.stop_reason is None
+
+
+def test_restart_controller_applies_per_worker(sample_random_vector,
+                                               valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    optimizer.get_optimal_params(num_test_samples=20, n_jobs=2, verbose=False,
+                                 restart_controller=RestartController(
+                                     target_objective=np.inf,
+                                     min_restarts=2))
+
+    assert optimizer.report.num_restarts == 4
+    assert optimizer.report.stop_reason == "target_objective"
+
+
+@pytest.mark.parametrize("batch_size", [None, 5])
+def test_candidate_generators(sample_random_vector, valid_srom, batch_size):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom)
+
+    with pytest.raises(TypeError):
+        optimizer.get_optimal_params(candidates=1)
+
+    with pytest.raises(ValueError):
+        optimizer.get_optimal_params(candidates=CandidateGenerator(
+            sample_random_vector, 5, 1))
+
+    for candidates in ["lhs", CandidateGenerator(sample_random_vector, 10, 1,
+                                                 "sobol")]:
+        samples, probabilities = optimizer.get_optimal_params(
+            num_test_samples=5, method='qp', verbose=False,
+            batch_size=batch_size, candidates=candidates)
+
+        assert samples.shape == (10, 1)
+        assert np.allclose([np.sum(probabilities)], [1.])
+
+
+def test_joint_initial_guess_uses_candidates(sample_random_vector,
+                                            valid_srom):
+
+    optimizer = Optimizer(sample_random_vector, valid_srom, joint_opt=True,
+                          scale=0.1)
+
+    samples, probabilities = optimizer.get_optimal_params(
+        num_test_samples=2, joint_opt=True, verbose=False, candidates="halton")
+
+    assert samples.shape == (10, 1)
+    assert np.allclose([np.sum(probabilities)], [1.])
+
+
+def test_voronoi_probabilities_match_nearest_samples(valid_srom):
+
+    np.random.seed(4)
+    target_samples = np.random.rand(1000, 2)
+
+    # Target samples split over several arrays are assigned block by block.
+    target = SampleRandomVector(target_samples[:700])
+    target.update(target_samples[700:])
+    optimizer = Optimizer(target, SROM(10, 2))
+    optimizer.VORONOI_CHUNK_SIZE = 64
+
+    samples = np.random.rand(10, 2)
+    probabilities = optimizer.get_voronoi_probabilities(samples)
+
+    distances = np.linalg.norm(target_samples[:, None, :] - samples, axis=2)
+    expected = np.bincount(np.argmin(distances, axis=1), minlength=10) / 1000.
+    assert np.allclose(probabilities, expected)
+
+    initial_guess = optimizer.get_initial_guess(False, samples=samples)
+    assert np.allclose(initial_guess, expected)
+
+
+def test_voronoi_probabilities_without_target_samples(valid_srom):
+
+    # Cells of the uniform random variable are exact CDF differences.
+    optimizer = Optimizer(UniformRandomVariable(0., 10.), valid_srom)
+    samples = np.arange(10.)[::-1]
+    probabilities = optimizer.get_voronoi_probabilities(samples)
+
+    assert np.allclose(probabilities, [0.15] + [0.1] * 8 + [0.05])
+
+    # Analytic random vectors use Monte Carlo draws.
+    target = AnalyticRandomVector([UniformRandomVariable(0., 1.)] * 2,
+                                  np.eye(2), cache=False)
+    optimizer = Optimizer(target, SROM(4, 2))
+    samples = np.array([[0.25, 0.25], [0.25, 0.75], [0.75, 0.25],
+                        [0.75, 0.75]])
+    probabilities = optimizer.get_voronoi_probabilities(samples)
+
+    assert np.allclose(np.sum(probabilities), 1.)
+    assert np.allclose(probabilities, 0.25, atol=0.02)
+
+
+def test_random_variable_target(valid_srom):
+
+    optimizer = Optimizer(UniformRandomVariable(0., 1.), valid_srom)
+
+    samples, probabilities = optimizer.get_optimal_params(num_test_samples=2,
+                                                          verbose=False)
+
+    assert samples.shape == (10, 1)
+    assert np.allclose([np.sum(probabilities)], [1.])
+
+
+MPI_TEST_SCRIPT = """
+import numpy as np
+from mpi4py import MPI
+
+from SROMPy.optimize import Optimizer
+from SROMPy.optimize import RestartController
+from SROMPy.srom import SROM
+from SROMPy.target import SampleRandomVector
+
+np.random.seed(1)
+target = SampleRandomVector(np.random.rand(50, 2))
+
+for joint_opt in [False, True]:
+    optimizer = Optimizer(target, SROM(5, 2), joint_opt=joint_opt, scale=0.1)
+
+    # Best objective this rank finds on its own.
+    local_best = optimizer._run_restarts(2, MPI.COMM_WORLD.rank, joint_opt,
+                                         None, 10, False, None, None, None)[0]
+
+    samples, probabilities = optimizer.get_optimal_params(
+        num_test_samples=8, joint_opt=joint_opt, verbose=False)
+    objective = optimizer.get_scipy_objective(samples, False)[0](
+        probabilities)
+
+    results = MPI.COMM_WORLD.allgather((local_best, objective, samples,
+                                        probabilities))
+    if MPI.COMM_WORLD.rank == 0:
+        for _, objective_i, samples_i, probabilities_i in results:
+            assert np.array_equal(samples_i, samples)
+            assert np.array_equal(probabilities_i, probabilities)
+        assert np.isclose(objective, min(result[0] for result in results))
+        print("MPI OK")
+"""
+
+
+def test_mpi_ranks_agree_on_optimum():
+
+    pytest.importorskip("mpi4py")
+    if shutil.which("mpiexec") is None:
+        pytest.skip("mpiexec not available")
+
+    base_path = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=base_path)
+
+    output = subprocess.run(["mpiexec", "-n", "4", sys.executable, "-c",
+                             MPI_TEST_SCRIPT],
+                            env=env, capture_output=True, text=True,
+                            timeout=600)
+
+    assert output.returncode == 0, output.stderr
+    assert output.stdout.count("MPI OK") == 2
@@ -0,0 +1,105 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+
+import numpy as np
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.srom import SROM
+from SROMPy.optimize import ObjectiveFunction, QuadraticObjective
+from SROMPy.target import SampleRandomVector
+
+
+@pytest.fixture
+def sample_random_vector():
+    np.random.seed(1)
+    random_vector = np.random.rand(50, 2)
+    return SampleRandomVector(random_vector)
+
+
+@pytest.fixture
+def candidate_samples():
+    np.random.seed(2)
+    return np.random.rand(3, 10, 2)
+
+
+@pytest.mark.parametrize("scale", [None, 0.1])
+def test_objective_matches_objective_function(sample_random_vector,
+                                              candidate_samples, scale):
+
+    srom = SROM(10, 2)
+    srom._scale = scale
+    objective_function = ObjectiveFunction(srom, sample_random_vector,
+                                           error='SSE')
+
+    quadratic_objective = \
+        QuadraticObjective(objective_function.target_statistics,
+                           objective_function.weights, candidate_samples,
+                           scale)
+
+    np.random.seed(3)
+    probabilities = np.random.rand(3, 10)
+    probabilities /= np.sum(probabilities, axis=1)[:, np.newaxis]
+
+    objectives, gradients = quadratic_objective.evaluate(probabilities)
+
+    for k in range(candidate_samples.shape[0]):
+        srom.set_params(candidate_samples[k], probabilities[k])
+        assert np.isclose(objectives[k], objective_function.compute_error())
+
+    assert gradients.shape == probabilities.shape
+
+
+@pytest.mark.parametrize("scale", [None, 0.1])
+def test_chunked_assembly_matches_unchunked(sample_random_vector,
+                                            candidate_samples, scale):
+
+    objective_function = ObjectiveFunction(SROM(10, 2), sample_random_vector,
+                                           error='SSE')
+    args = (objective_function.target_statistics, objective_function.weights,
+            candidate_samples, scale)
+
+    quadratic_objective = QuadraticObjective(*args)
+    chunked_quadratic_objective = QuadraticObjective(*args, cdf_chunk_size=7)
+
+    assert np.allclose(chunked_quadratic_objective.hessian,
+                       quadratic_objective.hessian)
+    assert np.allclose(chunked_quadratic_objective.linear_term,
+                       quadratic_objective.linear_term)
+    assert np.isclose(chunked_quadratic_objective.constant,
+                      quadratic_objective.constant)
+
+    with pytest.raises(TypeError):
+        QuadraticObjective(*args, cdf_chunk_size=1.5)
+
+    with pytest.raises(ValueError):
+        QuadraticObjective(*args, cdf_chunk_size=0)
+
+
+def test_invalid_sample_dimension_rejected(sample_random_vector):
+
+    objective_function = ObjectiveFunction(SROM(10, 2), sample_random_vector)
+
+    with pytest.raises(ValueError):
+        QuadraticObjective(objective_function.target_statistics,
+                           objective_function.weights, np.zeros((10, 3)))
@@ -0,0 +1,99 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.optimize import RestartController
+
+
+@pytest.mark.parametrize("kwargs", [{"patience": 0}, {"patience": 1.5},
+                                    {"max_time": 0.}, {"confidence": 1.},
+                                    {"relative_tolerance": -1.},
+                                    {"min_restarts": 0}])
+def test_invalid_parameters_rejected(kwargs):
+
+    with pytest.raises(ValueError):
+        RestartController(**kwargs)
+
+
+def test_no_criteria_never_stops():
+
+    controller = RestartController()
+
+    assert not any(controller.update(objective)
+                   for objective in [3., 2., 2., 2.])
+    assert controller.stop_reason is None
+    assert controller.num_restarts == 4
+    assert controller.best_objective == 2.
+
+
+def test_target_objective_respects_min_restarts():
+
+    controller = RestartController(target_objective=1., min_restarts=3)
+
+    assert not controller.update(0.5)
+    assert not controller.update(2.)
+    assert controller.update(2.)
+    assert controller.stop_reason == "target_objective"
+
+
+def test_patience_counts_restarts_without_improvement():
+
+    controller = RestartController(patience=2, relative_tolerance=0.1)
+
+    # 1.95 is within the relative tolerance of 2, so doesn't improve.
+    assert not controller.update(3.)
+    assert not controller.update(2.)
+    assert not controller.update(1.95)
+    assert controller.update(2.5)
+    assert controller.stop_reason == "patience"
+    assert controller.best_objective == 1.95
+
+
+def test_max_time():
+
+    controller = RestartController(max_time=1e-9)
+
+    assert controller.update(1.)
+    assert controller.stop_reason == "max_time"
+
+    # Restarting resets the controller.
+    controller.start()
+    assert controller.stop_reason is None
+    assert controller.num_restarts == 0
+
+
+def test_confidence_uses_improvement_rate():
+
+    controller = RestartController(confidence=0.9)
+
+    controller.update(2.)
+    controller.update(1.)
+    assert controller.improvement_probability == pytest.approx(2. / 3.)
+
+    while not controller.update(1.):
+        pass
+
+    # (1 improvement + 1) / (# restarts + 1) < 0.1
+    assert controller.num_restarts == 20
+    assert controller.stop_reason == "confidence"
@@ -0,0 +1,108 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+
+import numpy as np
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from scipy.optimize import minimize
+
+from SROMPy.optimize import SimplexQP
+
+
+@pytest.fixture
+def batched_qp():
+    np.random.seed(3)
+    factors = np.random.randn(4, 20, 6)
+    hessian = np.einsum('kri,krj->kij', factors, factors)
+    linear_term = np.einsum('kri,kr->ki', factors, np.random.randn(4, 20))
+    return hessian, linear_term
+
+
+def test_project_onto_simplex():
+
+    np.random.seed(4)
+    vectors = np.random.randn(5, 8)
+    projections = SimplexQP.project(vectors)
+
+    assert np.all(projections >= 0.)
+    assert np.allclose(np.sum(projections, axis=1), 1.)
+
+    # Points already on the simplex are unchanged.
+    assert np.allclose(SimplexQP.project(projections), projections)
+
+
+def test_solve_matches_slsqp(batched_qp):
+
+    hessian, linear_term = batched_qp
+    probabilities = SimplexQP.solve_projected_gradient(hessian, linear_term,
+                                                       max_iterations=5000,
+                                                       tolerance=1e-12)
+
+    for k in range(hessian.shape[0]):
+
+        def objective(p):
+            return 0.5 * p.dot(hessian[k]).dot(p) - linear_term[k].dot(p)
+
+        result = minimize(objective, np.ones(6) / 6., method='SLSQP',
+                          bounds=[(0, 1)] * 6,
+                          constraints={'type': 'eq',
+                                       'fun': lambda p: np.sum(p) - 1.},
+                          tol=1e-12)
+
+        assert objective(probabilities[k]) <= result['fun'] + 1e-8
+
+
+def test_active_set_matches_projected_gradient(batched_qp):
+
+    hessian, linear_term = batched_qp
+    active_set_probabilities = SimplexQP.solve_active_set(hessian,
+                                                          linear_term)
+    projected_probabilities = \
+        SimplexQP.solve_projected_gradient(hessian, linear_term,
+                                           max_iterations=5000,
+                                           tolerance=1e-12)
+
+    assert np.all(active_set_probabilities >= 0.)
+    assert np.allclose(np.sum(active_set_probabilities, axis=1), 1.)
+    assert np.allclose(active_set_probabilities, projected_probabilities,
+                       atol=1e-6)
+
+
+def test_active_set_rank_deficient_hessian():
+
+    # Far fewer rows than probabilities, as for large SROMs.
+    np.random.seed(5)
+    factors = np.random.randn(10, 60)
+    hessian = factors.T.dot(factors)
+    linear_term = factors.T.dot(np.random.randn(10))
+
+    probabilities = SimplexQP.solve_active_set(hessian, linear_term)[0]
+
+    gradient = hessian.dot(probabilities) - linear_term
+    free = probabilities > 0.
+    multiplier = np.mean(gradient[free])
+
+    # KKT conditions.
+    assert np.allclose(gradient[free], multiplier)
+    assert np.all(gradient[~free] >= multiplier - 1e-8)
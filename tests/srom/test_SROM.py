@@ -16,6 +16,7 @@
 import pytest
 import numpy as np
 import os
+import pickle
 import sys
 
 if 'PYTHONPATH' not in os.environ:
@@ -43,3 +44,116 @@ def test_invalid_init_parameter_values_rejected():
 def test_invalid_optimize_parameter_values_rejected():
 
     pass
+
+
+def test_statistics_match_per_sample_definitions():
+
+    np.random.seed(2)
+    samples = np.random.rand(15, 3)
+    probabilities = np.random.rand(15)
+    probabilities /= np.sum(probabilities)
+
+    srom = SROM(15, 3)
+    srom.set_params(samples, probabilities)
+
+    # Moments: sum_k p(k) * x(k)^q.
+    expected_moments = np.array([np.sum(probabilities[:, None] * samples ** q,
+                                        axis=0) for q in range(1, 5)])
+    assert np.allclose(srom.compute_moments(4), expected_moments)
+
+    # Empirical CDF: sum_k 1(x(k) <= x) * p(k).
+    x_grid = np.linspace(0., 1., 20)
+    expected_cdfs = np.zeros((20, 3))
+    for k in range(15):
+        expected_cdfs += probabilities[k] * \
+            (x_grid[:, None] >= samples[k, :][None, :])
+    assert np.allclose(srom.compute_cdf(x_grid), expected_cdfs)
+
+    # Correlation: sum_k x(k) x(k)^T p(k).
+    expected_corr = sum(np.outer(s, s) * p for s, p in
+                        zip(samples, probabilities))
+    assert np.allclose(srom.compute_corr_mat(), expected_corr)
+
+    # Smooth CDF tends to the empirical CDF as the scale goes to zero.
+    srom._scale = 1e-8
+    assert np.allclose(srom.compute_cdf(x_grid + 1e-6), expected_cdfs)
+
+
+@pytest.mark.parametrize("method, joint_opt", [(None, False), ("qp", False),
+                                               (None, True)])
+def test_reoptimize_improves_on_updated_target(method, joint_opt):
+
+    np.random.seed(3)
+    target = SampleRandomVector(np.random.rand(200, 2))
+
+    # Joint optimization needs the smooth CDF.
+    scale = 0.1 if joint_opt else None
+
+    srom = SROM(8, 2)
+    srom.optimize(target, num_test_samples=5, verbose=False, joint_opt=joint_opt,
+                  scale=scale, num_kept_restarts=3)
+    assert len(srom.best_restarts) == 3
+    assert srom.best_restarts[0][0] <= srom.best_restarts[-1][0]
+    assert srom.optimization_report.num_restarts == 5
+
+    # Shift the target with a new batch of samples.
+    target.update(np.random.rand(100, 2) * 1.2)
+
+    old_objective = get_objective(srom, target)
+
+    refined = []
+    srom.reoptimize(target, num_starts=2, method=method, joint_opt=joint_opt,
+                    scale=scale, verbose=False, callback=refined.append)
+
+    assert np.isclose(np.sum(srom.probabilities), 1.)
+    assert len(srom.best_restarts) == 2
+    assert refined == srom.optimization_report.restarts
+    assert len(refined) == 2
+    assert get_objective(srom, target) <= old_objective + 1e-8
+
+
+def test_reoptimize_requires_srom_params():
+
+    target = SampleRandomVector(np.random.rand(20, 1))
+
+    with pytest.raises(ValueError):
+        SROM(5, 1).reoptimize(target, verbose=False)
+
+    srom = SROM(5, 1)
+    srom.set_params(np.random.rand(5, 1), np.ones(5) / 5.)
+    with pytest.raises(ValueError):
+        srom.reoptimize(target, num_starts=0, verbose=False)
+
+
+@pytest.mark.parametrize("extension", [".txt", ".npy"])
+def test_optimize_file_backed_target_in_process_pool(tmp_path, extension):
+
+    np.random.seed(6)
+    samples = np.random.rand(300, 2)
+
+    file_name = str(tmp_path / ("samples" + extension))
+    if extension == ".npy":
+        np.save(file_name, samples)
+    else:
+        np.savetxt(file_name, samples, fmt="%.17g")
+
+    # Workers receive the file backed samples by file name.
+    target = SampleRandomVector(file_name)
+    copied_target = pickle.loads(pickle.dumps(target))
+    assert copied_target.samples.filename is not None
+    assert np.array_equal(copied_target.samples, samples)
+
+    srom = SROM(5, 2)
+    srom.optimize(target, num_test_samples=4, verbose=False, n_jobs=2)
+
+    assert np.isclose(np.sum(srom.probabilities), 1.)
+    assert srom.optimization_report.num_restarts == 4
+
+
+def get_objective(srom, target):
+
+    from SROMPy.optimize import ObjectiveFunction
+
+    objective_function = ObjectiveFunction(srom, target, error='SSE')
+    return objective_function.evaluate(srom.samples,
+                                       srom.probabilities.flatten())
@@ -13,6 +13,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import numpy as np
 import pytest
 import os
 import sys
@@ -23,9 +24,89 @@ if 'PYTHONPATH' not in os.environ:
 
     sys.path.insert(0, base_path)
 
+from SROMPy.srom import SROM, SROMSurrogate
 
 
 def test_1():
     pass
 
 
+@pytest.fixture
+def input_srom():
+    np.random.seed(0)
+    srom = SROM(20, 3)
+    srom.set_params(np.random.rand(20, 3), np.ones(20) / 20.)
+    return srom
+
+
+@pytest.fixture
+def input_samples():
+    np.random.seed(1)
+    return np.random.rand(500, 3)
+
+
+def closest_srom_indices(srom_samples, input_samples):
+    return np.array([np.argmin(np.linalg.norm(sample - srom_samples, axis=1))
+                     for sample in input_samples])
+
+
+def test_piecewise_constant_sample(input_srom, input_samples):
+
+    output_samples = np.random.rand(20, 2)
+    surrogate = SROMSurrogate(input_srom, output_samples)
+
+    indices = closest_srom_indices(input_srom.samples, input_samples)
+
+    assert np.allclose(surrogate.sample(input_samples),
+                       output_samples[indices])
+
+
+def test_piecewise_linear_sample(input_srom, input_samples):
+
+    output_samples = np.random.rand(20, 2)
+    gradients = np.random.rand(20, 3)
+    surrogate = SROMSurrogate(input_srom, output_samples, gradients)
+
+    indices = closest_srom_indices(input_srom.samples, input_samples)
+    expected_samples = np.zeros((500, 2))
+    for i, k in enumerate(indices):
+        expected_samples[i] = output_samples[k] + \
+            np.dot(gradients[k], input_samples[i] - input_srom.samples[k])
+
+    assert np.allclose(surrogate.sample(input_samples), expected_samples)
+
+
+def test_sample_stream_matches_sample(input_srom, input_samples, tmp_path):
+
+    output_samples = np.random.rand(20, 2)
+    gradients = np.random.rand(20, 3)
+    surrogate = SROMSurrogate(input_srom, output_samples, gradients)
+    expected_samples = surrogate.sample(input_samples.copy())
+
+    # In-memory array, split into chunks.
+    blocks = list(surrogate.sample_stream(input_samples, chunk_size=64))
+    assert len(blocks) == 8
+    assert np.allclose(np.vstack(blocks), expected_samples)
+
+    # Iterable of (uneven) blocks, written to a preallocated memmap.
+    input_file = str(tmp_path / "inputs.npy")
+    np.save(input_file, input_samples)
+    output = np.lib.format.open_memmap(str(tmp_path / "outputs.npy"),
+                                       mode='w+', shape=(500, 2))
+    input_blocks = [input_samples[:300], input_samples[300:]]
+    for _ in surrogate.sample_stream(input_blocks, chunk_size=200,
+                                     output=output):
+        pass
+    assert np.allclose(np.load(str(tmp_path / "outputs.npy")),
+                       expected_samples)
+
+    # Memory-mapped .npy input file.
+    blocks = surrogate.sample_stream(input_file, chunk_size=100)
+    assert np.allclose(np.vstack(list(blocks)), expected_samples)
+
+    with pytest.raises(ValueError):
+        surrogate.sample_stream(input_samples, chunk_size=0)
+
+    with pytest.raises(ValueError):
+        list(surrogate.sample_stream(input_samples,
+                                     output=np.zeros((100, 2))))
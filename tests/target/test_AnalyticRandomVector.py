@@ -13,6 +13,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import numpy as np
 import pytest
 import os
 import sys
@@ -23,9 +24,97 @@ if 'PYTHONPATH' not in os.environ:
 
     sys.path.insert(0, base_path)
 
+from SROMPy.target import AnalyticRandomVector, BetaRandomVariable, \
+    GammaRandomVariable, NormalRandomVariable
 
 
 def test_1():
     pass
 
 
+def test_draw_random_sample_correlation():
+
+    correlation = np.array([[1., 0.6, 0.2],
+                            [0.6, 1., 0.4],
+                            [0.2, 0.4, 1.]])
+    components = [NormalRandomVariable(1., 0.5), NormalRandomVariable(),
+                  NormalRandomVariable(-2., 2.)]
+    random_vector = AnalyticRandomVector(components, correlation,
+                                         cache=False)
+
+    samples = random_vector.draw_random_sample(100000, rng=0)
+
+    assert samples.shape == (100000, 3)
+    assert np.allclose(np.mean(samples, axis=0), [1., 0., -2.], atol=0.03)
+    assert np.allclose(np.std(samples, axis=0), [0.5, 1., 2.], atol=0.03)
+    assert np.allclose(np.corrcoef(samples.T), correlation, atol=0.02)
+
+
+def test_draw_random_sample_reproducible():
+
+    components = [NormalRandomVariable(), GammaRandomVariable(2., 0., 1.)]
+    random_vector = AnalyticRandomVector(components, np.eye(2), cache=False)
+
+    samples = random_vector.draw_random_sample(10, rng=4)
+    assert np.allclose(samples,
+                       random_vector.draw_random_sample(
+                           10, rng=np.random.default_rng(4)))
+
+    np.random.seed(5)
+    samples = random_vector.draw_random_sample(10)
+    np.random.seed(5)
+    assert np.allclose(samples, random_vector.draw_random_sample(10))
+
+    # Gamma component is positive.
+    assert np.all(samples[:, 1] > 0.)
+
+
+def test_transform_uniform_sample_matches_translation_model():
+
+    correlation = np.array([[1., 0.5], [0.5, 1.]])
+    random_vector = AnalyticRandomVector([NormalRandomVariable(1., 2.),
+                                          NormalRandomVariable()],
+                                         correlation, cache=False)
+
+    # Median maps to the median, extremes to the tails.
+    samples = random_vector.transform_uniform_sample([[0.5, 0.5],
+                                                      [0.999, 0.001]])
+    assert np.allclose(samples[0], [1., 0.])
+    assert samples[1, 0] > 7. and samples[1, 1] < 0.
+
+    uniform_samples = np.random.default_rng(0).random((100000, 2))
+    samples = random_vector.transform_uniform_sample(uniform_samples)
+    assert np.allclose(np.corrcoef(samples.T), correlation, atol=0.02)
+
+    with pytest.raises(ValueError):
+        random_vector.transform_uniform_sample([[0.5, 1.]])
+
+    with pytest.raises(ValueError):
+        random_vector.transform_uniform_sample([0.5, 0.5])
+
+
+def test_integrand_helper():
+
+    correlation = np.array([[1., 0.5], [0.5, 1.]])
+    random_vector = AnalyticRandomVector([NormalRandomVariable(1., 2.),
+                                          NormalRandomVariable(-1., 1.)],
+                                         correlation, cache=False)
+
+    # f_k(0) * f_j(0) * bivariate normal pdf at the origin.
+    expected = -1. / (2. * np.pi * np.sqrt(1. - 0.5 ** 2))
+    assert np.isclose(random_vector.integrand_helper(0., 0., 0, 1, 0.5),
+                      expected)
+
+
+def test_non_gaussian_components_match_correlation():
+
+    correlation = np.array([[1., 0.5],
+                            [0.5, 1.]])
+    components = [GammaRandomVariable(2., 0., 1.),
+                  BetaRandomVariable(2., 5.)]
+    random_vector = AnalyticRandomVector(components, correlation,
+                                         cache=False)
+
+    samples = random_vector.draw_random_sample(200000, rng=1)
+
+    assert np.allclose(np.corrcoef(samples.T), correlation, atol=0.01)
@@ -0,0 +1,171 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import numpy as np
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.target import AnalyticRandomVector, BetaRandomVariable, \
+    CalibrationCache, GammaRandomVariable
+
+
+@pytest.fixture
+def calibration_cache(tmp_path):
+    return CalibrationCache(str(tmp_path), max_entries=2)
+
+
+@pytest.fixture
+def components():
+    return [GammaRandomVariable(2., 0., 1.), BetaRandomVariable(2., 5.)]
+
+
+def correlation_matrix(rho):
+    return np.array([[1., rho], [rho, 1.]])
+
+
+def test_rebuild_hits_cache(calibration_cache, components):
+
+    random_vector = AnalyticRandomVector(components, correlation_matrix(0.5),
+                                         cache=calibration_cache)
+    assert calibration_cache.misses == 1
+    assert calibration_cache.hits == 0
+
+    cached_vector = AnalyticRandomVector(components, correlation_matrix(0.5),
+                                         cache=calibration_cache)
+    assert calibration_cache.hits == 1
+    assert calibration_cache.hit_rate == 0.5
+
+    assert np.array_equal(random_vector._gaussian_corr,
+                          cached_vector._gaussian_corr)
+    assert np.array_equal(random_vector._unscaled_correlation,
+                          cached_vector._unscaled_correlation)
+
+    # Calibration is still available on demand for cached vectors.
+    assert np.isclose(cached_vector.get_correlation_entry(0, 1, 0.3),
+                      random_vector.get_correlation_entry(0, 1, 0.3))
+
+
+def test_key_depends_on_inputs(calibration_cache, components):
+
+    key = calibration_cache.get_key(components, correlation_matrix(0.5))
+
+    assert key == calibration_cache.get_key(components,
+                                            correlation_matrix(0.5))
+    assert key != calibration_cache.get_key(components,
+                                            correlation_matrix(0.4))
+    assert key != calibration_cache.get_key(
+        [GammaRandomVariable(3., 0., 1.), BetaRandomVariable(2., 5.)],
+        correlation_matrix(0.5))
+
+    # Derived state (cached moments) doesn't change the key.
+    components[0].compute_moments(3)
+    assert key == calibration_cache.get_key(components,
+                                            correlation_matrix(0.5))
+
+
+def test_unsupported_component_types_not_cached(calibration_cache,
+                                                components):
+
+    class CustomRandomVariable(GammaRandomVariable):
+        pass
+
+    assert calibration_cache.get_key(
+        [CustomRandomVariable(2., 0., 1.), components[1]],
+        correlation_matrix(0.5)) is None
+
+
+def test_evicts_least_recently_used(calibration_cache):
+
+    keys = ["a", "b", "c"]
+    for i, key in enumerate(keys):
+        calibration_cache.save(key, np.eye(2) * i, np.eye(2))
+
+        # Ensure distinct modification times.
+        file_name = os.path.join(calibration_cache.cache_dir, key + ".npz")
+        os.utime(file_name, (i, i))
+
+    assert calibration_cache.load("a") is None
+    gaussian_correlation, _ = calibration_cache.load("c")
+    assert np.array_equal(gaussian_correlation, np.eye(2) * 2)
+
+    calibration_cache.clear()
+    assert calibration_cache.load("c") is None
+
+
+def test_read_only_cache_hit(monkeypatch, calibration_cache, components):
+
+    random_vector = AnalyticRandomVector(components, correlation_matrix(0.5),
+                                         cache=calibration_cache)
+
+    cache_dir = calibration_cache.cache_dir
+    for file_name in os.listdir(cache_dir):
+        os.chmod(os.path.join(cache_dir, file_name), 0o444)
+    os.chmod(cache_dir, 0o555)
+
+    # Permissions aren't enforced for root, so also make utime fail.
+    def read_only_utime(*args, **kwargs):
+        raise PermissionError("Read-only file system")
+
+    monkeypatch.setattr(os, "utime", read_only_utime)
+
+    try:
+        cached_vector = AnalyticRandomVector(components,
+                                             correlation_matrix(0.5),
+                                             cache=calibration_cache)
+    finally:
+        os.chmod(cache_dir, 0o755)
+
+    assert calibration_cache.hits == 1
+    assert np.array_equal(random_vector._gaussian_corr,
+                          cached_vector._gaussian_corr)
+
+
+def test_cache_disabled(monkeypatch, calibration_cache, components):
+
+    monkeypatch.setattr(CalibrationCache, "_default_cache", calibration_cache)
+
+    AnalyticRandomVector(components, correlation_matrix(0.5), cache=False)
+    assert not os.path.isdir(calibration_cache.cache_dir)
+    assert calibration_cache.misses == 0
+
+    # Default cache is opt-in through SROMPY_CACHE_DIR.
+    monkeypatch.delenv("SROMPY_CACHE_DIR", raising=False)
+    AnalyticRandomVector(components, correlation_matrix(0.5))
+    assert not os.path.isdir(calibration_cache.cache_dir)
+
+    monkeypatch.setenv("SROMPY_CACHE_DIR", os.path.dirname(
+        calibration_cache.cache_dir))
+    AnalyticRandomVector(components, correlation_matrix(0.5))
+    assert len(os.listdir(calibration_cache.cache_dir)) == 1
+
+    AnalyticRandomVector(components, correlation_matrix(0.5), cache=True)
+    assert calibration_cache.hits == 1
+
+    with pytest.raises(TypeError):
+        AnalyticRandomVector(components, correlation_matrix(0.5),
+                             cache="cache")
+
+
+def test_invalid_max_entries_raises_value_error(tmp_path):
+
+    with pytest.raises(ValueError):
+        CalibrationCache(str(tmp_path), max_entries=0)
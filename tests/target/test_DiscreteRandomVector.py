@@ -125,3 +125,22 @@ def test_raise_value_error_for_bad_samples_1d():
         
 
 
+
+def test_compute_cdfs_match_indicator_definition():
+
+    np.random.seed(0)
+
+    # Repeated sample values & grid pts falling exactly on samples.
+    samples = np.round(np.random.rand(200, 3), 1)
+    probabilities = np.random.rand(200)
+    probabilities /= np.sum(probabilities)
+    discrete_rv = DiscreteRandomVector(samples, probabilities)
+
+    x_grid = np.linspace(-0.1, 1.1, 13)
+    cdf_vals = discrete_rv.compute_cdf(x_grid)
+
+    true_cdf_vals = np.zeros((13, 3))
+    for k in range(200):
+        true_cdf_vals += probabilities[k] * (x_grid[:, None] >= samples[k])
+
+    assert np.allclose(cdf_vals, true_cdf_vals)
@@ -0,0 +1,74 @@
+# Copyright 2018 United States Government as represented by the Administrator of
+# the National Aeronautics and Space Administration. No copyright is claimed in
+# the United States under Title 17, U.S. Code. All Other Rights Reserved.
+
+# The Stochastic Reduced Order Models with Python (SROMPy) platform is licensed
+# under the Apache License, Version 2.0 (the "License"); you may not use this
+# file except in compliance with the License. You may obtain a copy of the
+# License at http://www.apache.org/licenses/LICENSE-2.0.
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import numpy as np
+import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.target import BetaRandomVariable, GammaRandomVariable, \
+    NatafCalibration, NormalRandomVariable, UniformRandomVariable
+
+
+@pytest.fixture
+def calibration():
+    return NatafCalibration([NormalRandomVariable(1., 0.5),
+                             NormalRandomVariable(),
+                             GammaRandomVariable(0.5, 0., 1.),
+                             BetaRandomVariable(2., 5.),
+                             UniformRandomVariable(0., 2.)])
+
+
+def test_gaussian_components_keep_correlation(calibration):
+
+    for rho in [-0.5, 0., 0.3, 0.9]:
+        assert np.isclose(calibration.compute_correlation(0, 1, rho), rho)
+
+
+def test_solve_gaussian_correlation(calibration):
+
+    for (k, j) in [(0, 2), (2, 3), (3, 4)]:
+        rho = calibration.solve_gaussian_correlation(k, j, 0.4)
+        assert np.isclose(calibration.compute_correlation(k, j, rho), 0.4)
+
+    # Gamma(0.5) component is too skewed to be this correlated with a normal.
+    with pytest.raises(ValueError):
+        calibration.solve_gaussian_correlation(0, 2, 0.95)
+
+
+def test_parallel_pairs_match_sequential(calibration):
+
+    correlation_matrix = np.full((5, 5), 0.3)
+    np.fill_diagonal(correlation_matrix, 1.)
+
+    gaussian_correlation = \
+        calibration.compute_gaussian_correlation_matrix(correlation_matrix)
+
+    assert np.allclose(np.diag(gaussian_correlation), 1.)
+    assert np.allclose(gaussian_correlation, gaussian_correlation.T)
+    assert np.allclose(gaussian_correlation,
+                       calibration.compute_gaussian_correlation_matrix(
+                           correlation_matrix, n_jobs=2))
+
+    with pytest.raises(ValueError):
+        calibration.compute_gaussian_correlation_matrix(correlation_matrix,
+                                                        n_jobs=0)
@@ -14,9 +14,20 @@
 # under the License.
 
 import pytest
+import numpy as np
+
+from SROMPy.target import NormalRandomVariable
 
 
 def test_1():
     pass
 
 
+
+
+def test_draw_random_sample_with_generator():
+
+    random_variable = NormalRandomVariable(1., 2.)
+
+    sample = random_variable.draw_random_sample(5, np.random.default_rng(2))
+    assert np.allclose(sample, random_variable.draw_random_sample(5, rng=2))
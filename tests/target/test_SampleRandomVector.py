@@ -13,10 +13,286 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import numpy as np
 import pytest
+import os
+import sys
+
+if 'PYTHONPATH' not in os.environ:
+
+    base_path = os.path.abspath('.')
+
+    sys.path.insert(0, base_path)
+
+from SROMPy.target import SampleRandomVector
+
+
+@pytest.fixture
+def samples():
+    np.random.seed(1)
+    return np.random.gamma(2., 1., (1001, 3))
 
 
 def test_1():
     pass
 
 
+def test_draw_random_sample_with_generator(samples):
+
+    random_vector = SampleRandomVector(samples)
+
+    for qmc_engine in [None, 'Sobol']:
+        sample = random_vector.draw_random_sample(
+            8, qmc_engine, rng=np.random.default_rng(3))
+        assert np.array_equal(sample, random_vector.draw_random_sample(
+            8, qmc_engine, rng=np.random.default_rng(3)))
+
+    # Without a generator, draws follow numpy's global random state.
+    samples_drawn = []
+    for _ in range(2):
+        np.random.seed(3)
+        samples_drawn.append(random_vector.draw_random_sample(8))
+    assert np.array_equal(samples_drawn[0], samples_drawn[1])
+
+
+def test_moments_and_correlation_match_reference(samples):
+
+    random_vector = SampleRandomVector(samples, max_moment=5, chunk_size=100)
+
+    expected_moments = np.array([np.mean(samples ** (q + 1), axis=0)
+                                 for q in range(5)])
+    assert np.allclose(random_vector.compute_moments(5), expected_moments)
+
+    expected_correlation = samples.T.dot(samples) / samples.shape[0]
+    assert np.allclose(random_vector.compute_correlation_matrix(),
+                       expected_correlation)
+
+
+def test_statistics_independent_of_chunk_size(samples):
+
+    chunked = SampleRandomVector(samples, chunk_size=7)
+    unchunked = SampleRandomVector(samples)
+
+    assert np.allclose(chunked.compute_moments(10),
+                       unchunked.compute_moments(10))
+    assert np.allclose(chunked.compute_correlation_matrix(),
+                       unchunked.compute_correlation_matrix())
+
+
+def test_invalid_chunk_size_raises_value_error(samples):
+
+    with pytest.raises(ValueError):
+        SampleRandomVector(samples, chunk_size=0)
+
+
+def assert_same_statistics(random_vector, expected_random_vector):
+
+    assert random_vector.num_samples == expected_random_vector.num_samples
+    assert np.allclose(random_vector.compute_moments(10),
+                       expected_random_vector.compute_moments(10))
+    assert np.allclose(random_vector.compute_correlation_matrix(),
+                       expected_random_vector.compute_correlation_matrix())
+    assert np.allclose(random_vector.mins, expected_random_vector.mins)
+    assert np.allclose(random_vector.maxs, expected_random_vector.maxs)
+
+    x_grid = np.linspace(0., 5., 20)
+    assert np.allclose(random_vector.compute_cdf(x_grid),
+                       expected_random_vector.compute_cdf(x_grid))
+
+
+def test_memory_mapped_samples(samples, tmp_path):
+
+    file_name = str(tmp_path / "samples.npy")
+    np.save(file_name, samples)
+
+    expected_random_vector = SampleRandomVector(samples)
+
+    for memory_mapped_samples in [file_name,
+                                  np.load(file_name, mmap_mode="r")]:
+
+        random_vector = SampleRandomVector(memory_mapped_samples,
+                                           chunk_size=128)
+        assert_same_statistics(random_vector, expected_random_vector)
+
+        drawn_samples = random_vector.draw_random_sample(10)
+        assert drawn_samples.shape == (10, 3)
+        assert np.all(np.isin(drawn_samples, samples))
+
+
+@pytest.mark.parametrize("extension, delimiter", [(".txt", " "),
+                                                  (".csv", ",")])
+def test_samples_from_text_file(samples, tmp_path, extension, delimiter):
+
+    file_name = str(tmp_path / ("samples" + extension))
+    np.savetxt(file_name, samples, delimiter=delimiter, fmt="%.17g",
+               header="sample file")
+
+    random_vector = SampleRandomVector(file_name, chunk_size=100)
+
+    assert np.array_equal(random_vector.samples, samples)
+    assert_same_statistics(random_vector, SampleRandomVector(samples))
+
+
+def test_empty_text_file_raises_value_error(tmp_path):
+
+    file_name = str(tmp_path / "samples.txt")
+    open(file_name, "w").close()
+
+    with pytest.raises(ValueError):
+        SampleRandomVector(file_name)
+
+
+def test_compact_cdf_within_error_bound():
+
+    np.random.seed(2)
+    samples = np.random.normal(size=(20000, 2))
+
+    compact_random_vector = SampleRandomVector(samples, num_cdf_points=64)
+    exact_random_vector = SampleRandomVector(samples, num_cdf_points=None)
+
+    assert exact_random_vector.cdf_error_bound == 0.
+    error_bound = compact_random_vector.cdf_error_bound
+    assert 0. < error_bound <= np.ceil(19999. / 63.) / 20000.
+
+    x_grid = np.linspace(-5., 5., 1001)
+    error = np.abs(compact_random_vector.compute_cdf(x_grid) -
+                   exact_random_vector.compute_cdf(x_grid))
+    assert np.max(error) <= error_bound + 1e-12
+
+    # CDF is exact at the sample min/max & saturates outside of them.
+    cdf_values = compact_random_vector.compute_cdf(np.array([-10., 10.]))
+    assert np.allclose(cdf_values, [[1. / 20000.] * 2, [1.] * 2])
+
+
+def test_invalid_num_cdf_points_raises_value_error(samples):
+
+    with pytest.raises(ValueError):
+        SampleRandomVector(samples, num_cdf_points=1)
+
+
+def test_update_matches_rebuilt_random_vector(samples):
+
+    random_vector = SampleRandomVector(samples[:400])
+    random_vector.update(samples[400:700])
+    random_vector.update(samples[700:])
+
+    assert np.array_equal(random_vector.samples, samples)
+    assert_same_statistics(random_vector, SampleRandomVector(samples))
+    assert random_vector.cdf_error_bound == 0.
+
+    drawn_samples = random_vector.draw_random_sample(50)
+    assert drawn_samples.shape == (50, 3)
+    assert np.all(np.isin(drawn_samples, samples))
+
+
+def test_merge_compact_cdfs_within_error_bound():
+
+    np.random.seed(3)
+    samples = np.vstack((np.random.normal(size=(30000, 2)),
+                         np.random.normal(1., 2., size=(20000, 2))))
+
+    random_vector = SampleRandomVector(samples[:30000], num_cdf_points=256)
+    random_vector.merge(SampleRandomVector(samples[30000:],
+                                           num_cdf_points=256))
+
+    exact_random_vector = SampleRandomVector(samples, num_cdf_points=None)
+
+    assert random_vector.num_samples == 50000
+    assert np.allclose(random_vector.compute_moments(10),
+                       exact_random_vector.compute_moments(10))
+    assert np.allclose(random_vector.compute_correlation_matrix(),
+                       exact_random_vector.compute_correlation_matrix())
+    assert np.allclose(random_vector.mins, exact_random_vector.mins)
+    assert np.allclose(random_vector.maxs, exact_random_vector.maxs)
+
+    error_bound = random_vector.cdf_error_bound
+    assert error_bound < 0.01
+
+    x_grid = np.linspace(-6., 8., 2001)
+    error = np.abs(random_vector.compute_cdf(x_grid) -
+                   exact_random_vector.compute_cdf(x_grid))
+    assert np.max(error) <= error_bound
+
+
+def test_invalid_update_and_merge_raise_errors(samples):
+
+    random_vector = SampleRandomVector(samples)
+
+    with pytest.raises(ValueError):
+        random_vector.update(np.ones((5, 2)))
+
+    with pytest.raises(ValueError):
+        random_vector.merge(SampleRandomVector(samples[:, :2]))
+
+    with pytest.raises(ValueError):
+        random_vector.merge(SampleRandomVector(samples, max_moment=5))
+
+    with pytest.raises(TypeError):
+        random_vector.merge(samples)
+
+
+def test_streamed_compact_cdf_within_error_bound():
+
+    np.random.seed(4)
+    samples = np.random.gamma(2., 1., size=(20000, 2))
+
+    # 40 blocks, so the per-block CDF tables go through ~6 levels of merging.
+    streamed_random_vector = SampleRandomVector(samples, chunk_size=500,
+                                                num_cdf_points=256)
+    exact_random_vector = SampleRandomVector(samples, num_cdf_points=None)
+
+    assert np.allclose(streamed_random_vector.mins, exact_random_vector.mins)
+    assert np.allclose(streamed_random_vector.maxs, exact_random_vector.maxs)
+
+    error_bound = streamed_random_vector.cdf_error_bound
+    assert error_bound < 9. / 255.
+
+    x_grid = np.linspace(0., 20., 2001)
+    error = np.abs(streamed_random_vector.compute_cdf(x_grid) -
+                   exact_random_vector.compute_cdf(x_grid))
+    assert np.max(error) <= error_bound
+
+
+def test_merge_and_update_with_exact_cdfs():
+
+    np.random.seed(5)
+    samples = np.random.normal(size=(10100, 2))
+    exact_random_vector = SampleRandomVector(samples, num_cdf_points=None)
+    x_grid = np.linspace(-5., 5., 1001)
+
+    # Exact CDF receiving a compact one stays exact.
+    random_vector = SampleRandomVector(samples[:100], num_cdf_points=None)
+    random_vector.merge(SampleRandomVector(samples[100:], num_cdf_points=64))
+
+    assert random_vector.cdf_error_bound == 0.
+    assert_same_statistics(random_vector, exact_random_vector)
+
+    random_vector.update(samples[:50])
+    assert random_vector.cdf_error_bound == 0.
+    assert np.allclose(random_vector.compute_cdf(x_grid),
+                       SampleRandomVector(np.vstack((samples, samples[:50])),
+                                          num_cdf_points=None).
+                       compute_cdf(x_grid))
+
+    # Compact CDF receiving an exact one stays within its error bound.
+    random_vector = SampleRandomVector(samples[:100], num_cdf_points=64)
+    random_vector.merge(SampleRandomVector(samples[100:],
+                                           num_cdf_points=None))
+
+    assert random_vector.num_samples == 10100
+    error = np.abs(random_vector.compute_cdf(x_grid) -
+                   exact_random_vector.compute_cdf(x_grid))
+    assert np.max(error) <= random_vector.cdf_error_bound
+
+
+def test_sample_blocks_do_not_join_sample_sets(samples):
+
+    random_vector = SampleRandomVector(samples[:600])
+    random_vector.update(samples[600:])
+
+    blocks = list(random_vector.get_sample_blocks(256))
+
+    assert [len(block) for block in blocks] == [256, 256, 88, 256, 145]
+    assert np.array_equal(np.vstack(blocks), samples)
+    assert np.array_equal(random_vector.samples, samples)
+    assert len(list(random_vector.get_sample_blocks())) == 2
@@ -26,3 +26,8 @@ def test_raises_exception_for_invalid_variable_range():
     with pytest.raises(ValueError):
         UniformRandomVariable(minimum_value, maximum_value)
 
+
+
+def test_dimension_is_scalar():
+
+    assert UniformRandomVariable(0., 1.).dim == 1